@@ -0,0 +1,274 @@
+import argparse
+import os
+import struct
+import sys
+import zlib
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BAR_DTYPE, MARKET_TZ, frame_to_records, records_to_frame, to_utc_ns
+from csv_loader import read_bar_csv
+
+
+MAGIC = b"LBAR"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHqqqq")
+FOOTER = struct.Struct("<qq4s")
+BLOCK_HEADER = struct.Struct("<I6I")
+
+INDEX_DTYPE = np.dtype([
+    ("first_time", "<i8"),
+    ("last_time", "<i8"),
+    ("offset", "<i8"),
+    ("length", "<i8"),
+    ("rows", "<i8")
+])
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+TIME_SCALES = (86_400 * 10**9, 10**9, 10**6, 10**3, 1)
+
+NAN_SENTINEL = np.iinfo(np.int64).min // 4
+
+DEFAULT_BLOCK_ROWS = 8192
+
+DEFAULT_PRICE_DECIMALS = 4
+
+
+def zigzag_encode(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def zigzag_decode(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return ((values >> np.uint64(1)).view(np.int64)) ^ -(values & np.uint64(1)).view(np.int64)
+
+
+def varint_encode(values: np.ndarray) -> bytes:
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b""
+
+    groups = np.empty((len(values), 10), dtype=np.uint8)
+    lengths = np.ones(len(values), dtype=np.int64)
+    remaining = values.copy()
+    for k in range(10):
+        groups[:, k] = (remaining & np.uint64(0x7F)).astype(np.uint8)
+        remaining >>= np.uint64(7)
+        if k < 9:
+            lengths += remaining > 0
+
+    columns = np.arange(10)
+    groups[columns < (lengths - 1)[:, None]] |= 0x80
+    return groups[columns < lengths[:, None]].tobytes()
+
+
+def varint_decode(data: Union[bytes, memoryview, np.ndarray], count: int) -> np.ndarray:
+    buf = np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data
+    if count == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    ends = np.flatnonzero(buf < 0x80)
+    if len(ends) != count:
+        raise ValueError(f"变长整数数量不匹配: 期望 {count}, 实际 {len(ends)}")
+    starts = np.empty(count, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+
+    positions = np.arange(len(buf), dtype=np.int64) - np.repeat(starts, ends - starts + 1)
+    parts = (buf & 0x7F).astype(np.uint64) << (positions.astype(np.uint64) * np.uint64(7))
+    return np.bitwise_or.reduceat(parts, starts)
+
+
+def _delta(values: np.ndarray) -> np.ndarray:
+    out = np.empty(len(values), dtype=np.int64)
+    if len(values):
+        out[0] = values[0]
+        np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def _scale_prices(values: np.ndarray, scale: int) -> np.ndarray:
+    scaled = np.round(values * scale)
+    missing = ~np.isfinite(scaled)
+    scaled[missing] = 0
+    scaled = scaled.astype(np.int64)
+    scaled[missing] = NAN_SENTINEL
+    return scaled
+
+
+def _unscale_prices(values: np.ndarray, scale: int) -> np.ndarray:
+    prices = values / scale
+    prices[values == NAN_SENTINEL] = np.nan
+    return prices
+
+
+def encode_block(records: np.ndarray, time_scale: int, price_scale: int, level: int) -> bytes:
+    streams = [varint_encode(zigzag_encode(_delta(records["time"] // time_scale)))]
+    for field in PRICE_FIELDS:
+        streams.append(varint_encode(zigzag_encode(_delta(_scale_prices(records[field], price_scale)))))
+    streams.append(varint_encode(zigzag_encode(records["volume"])))
+
+    payload = BLOCK_HEADER.pack(len(records), *(len(stream) for stream in streams)) + b"".join(streams)
+    return zlib.compress(payload, level)
+
+
+def decode_block(data: bytes, time_scale: int, price_scale: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    payload = zlib.decompress(data)
+    header = BLOCK_HEADER.unpack_from(payload)
+    rows, lengths = header[0], header[1:]
+    buf = np.frombuffer(payload, dtype=np.uint8, offset=BLOCK_HEADER.size)
+
+    streams = []
+    offset = 0
+    for length in lengths:
+        streams.append(zigzag_decode(varint_decode(buf[offset:offset + length], rows)))
+        offset += length
+
+    records = np.empty(rows, dtype=BAR_DTYPE) if out is None else out
+    records["time"] = np.cumsum(streams[0]) * time_scale
+    for field, stream in zip(PRICE_FIELDS, streams[1:5]):
+        records[field] = _unscale_prices(np.cumsum(stream), price_scale)
+    records["volume"] = streams[5]
+    return records
+
+
+def choose_time_scale(times: np.ndarray) -> int:
+    for scale in TIME_SCALES:
+        if len(times) == 0 or not np.any(times % scale):
+            return scale
+    return 1
+
+
+def write_bar_file(path: str, data: Union[np.ndarray, pd.DataFrame], price_decimals: int = DEFAULT_PRICE_DECIMALS,
+                   block_rows: int = DEFAULT_BLOCK_ROWS, level: int = 6) -> int:
+    records = frame_to_records(data) if isinstance(data, pd.DataFrame) else np.asarray(data, dtype=BAR_DTYPE)
+    time_scale = choose_time_scale(records["time"])
+    price_scale = 10 ** price_decimals
+
+    index = np.zeros((len(records) + block_rows - 1) // block_rows, dtype=INDEX_DTYPE)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, price_decimals, time_scale, len(records), block_rows, len(index)))
+
+        for i in range(len(index)):
+            block = records[i * block_rows:(i + 1) * block_rows]
+            encoded = encode_block(block, time_scale, price_scale, level)
+            index[i] = (block["time"][0], block["time"][-1], f.tell(), len(encoded), len(block))
+            f.write(encoded)
+
+        index_offset = f.tell()
+        f.write(index.tobytes())
+        f.write(FOOTER.pack(index_offset, len(index), MAGIC))
+        return f.tell()
+
+
+class BarFile:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+
+        magic, version, self.price_decimals, self.time_scale, self.rows, self.block_rows, blocks = \
+            HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} 不是K线数据文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的K线文件版本: {version}")
+
+        self._file.seek(-FOOTER.size, 2)
+        index_offset, index_blocks, _ = FOOTER.unpack(self._file.read(FOOTER.size))
+        self._file.seek(index_offset)
+        self.index = np.frombuffer(self._file.read(index_blocks * INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)
+        self.price_scale = 10 ** self.price_decimals
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def first_time(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(int(self.index["first_time"][0]), unit="ns", tz="UTC") if len(self.index) else None
+
+    @property
+    def last_time(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(int(self.index["last_time"][-1]), unit="ns", tz="UTC") if len(self.index) else None
+
+    def read_block(self, i: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        entry = self.index[i]
+        self._file.seek(int(entry["offset"]))
+        return decode_block(self._file.read(int(entry["length"])), self.time_scale, self.price_scale, out)
+
+    def read(self, start=None, end=None) -> np.ndarray:
+        start_ns, end_ns = to_utc_ns(start), to_utc_ns(end)
+        first = 0 if start_ns is None else int(np.searchsorted(self.index["last_time"], start_ns, side="left"))
+        last = len(self.index) if end_ns is None else int(np.searchsorted(self.index["first_time"], end_ns, side="right"))
+        if first >= last:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        bounds = np.concatenate(([0], np.cumsum(self.index["rows"][first:last])))
+        records = np.empty(int(bounds[-1]), dtype=BAR_DTYPE)
+        for i in range(first, last):
+            self.read_block(i, records[bounds[i - first]:bounds[i - first + 1]])
+        lo = 0 if start_ns is None else int(np.searchsorted(records["time"], start_ns, side="left"))
+        hi = len(records) if end_ns is None else int(np.searchsorted(records["time"], end_ns, side="right"))
+        return records[lo:hi]
+
+    def read_frame(self, start=None, end=None, tz: str = MARKET_TZ) -> pd.DataFrame:
+        return records_to_frame(self.read(start, end), tz)
+
+    def close(self):
+        self._file.close()
+
+
+def read_bar_file(path: str, start=None, end=None) -> np.ndarray:
+    with BarFile(path) as bar_file:
+        return bar_file.read(start, end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - K线数据文件转换与查看")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="将CSV文件转换为K线数据文件")
+    convert.add_argument("input", help="输入CSV文件")
+    convert.add_argument("output", help="输出文件 (.lbar)")
+    convert.add_argument("--decimals", type=int, default=DEFAULT_PRICE_DECIMALS, help="价格保留的小数位数")
+    convert.add_argument("--block-rows", type=int, default=DEFAULT_BLOCK_ROWS, help="每个压缩块的行数")
+
+    export = subparsers.add_parser("export", help="将K线数据文件导出为CSV")
+    export.add_argument("input", help="输入文件 (.lbar)")
+    export.add_argument("output", help="输出CSV文件")
+    export.add_argument("--start", help="开始时间")
+    export.add_argument("--end", help="结束时间")
+
+    info = subparsers.add_parser("info", help="查看K线数据文件信息")
+    info.add_argument("input", help="输入文件 (.lbar)")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        size = write_bar_file(args.output, read_bar_csv(args.input), args.decimals, args.block_rows)
+        original = os.path.getsize(args.input)
+        print(f"✓ {args.input} ({original:,} 字节) -> {args.output} ({size:,} 字节), 压缩比 {original / size:.1f}x")
+    elif args.command == "export":
+        with BarFile(args.input) as bar_file:
+            bar_file.read_frame(args.start, args.end).to_csv(args.output)
+        print(f"✓ 已导出到 {args.output}")
+    else:
+        with BarFile(args.input) as bar_file:
+            print(f"行数: {bar_file.rows:,}")
+            print(f"块数: {len(bar_file.index)} (每块 {bar_file.block_rows} 行)")
+            print(f"时间范围: {bar_file.first_time} ~ {bar_file.last_time}")
+            print(f"价格精度: {bar_file.price_decimals} 位小数")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
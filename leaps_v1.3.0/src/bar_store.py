@@ -0,0 +1,296 @@
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from range_index import RangeSet, Span, plan_backfill
+
+
+BAR_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8")
+])
+
+FRAME_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+MARKET_TZ = "America/New_York"
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), ".leaps", "bars")
+
+RECENT_WINDOW = timedelta(days=1)
+
+RAW_INTERVALS = ("1d",)
+
+
+def frame_to_records(frame: pd.DataFrame) -> np.ndarray:
+    index = frame.index
+    if index.tz is None:
+        index = index.tz_localize(MARKET_TZ, ambiguous=np.zeros(len(index), dtype=bool), nonexistent="shift_forward")
+
+    records = np.empty(len(frame), dtype=BAR_DTYPE)
+    records["time"] = index.tz_convert("UTC").as_unit("ns").asi8
+    for field, column in FRAME_COLUMNS.items():
+        values = frame[column].to_numpy()
+        records[field] = np.nan_to_num(values, nan=0).astype(np.int64) if field == "volume" else values
+
+    order = np.argsort(records["time"], kind="stable")
+    records = records[order]
+    keep = np.ones(len(records), dtype=bool)
+    keep[:-1] = records["time"][1:] != records["time"][:-1]
+    return records[keep]
+
+
+def to_utc_ns(value) -> Optional[int]:
+    if value is None or isinstance(value, (int, np.integer)):
+        return value if value is None else int(value)
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize(MARKET_TZ)
+    return int(stamp.tz_convert("UTC").as_unit("ns").value)
+
+
+def records_to_frame(records: np.ndarray, tz: str = MARKET_TZ) -> pd.DataFrame:
+    index = pd.DatetimeIndex(pd.to_datetime(records["time"], unit="ns", utc=True).tz_convert(tz), name="Date")
+    return pd.DataFrame({column: np.asarray(records[field]) for field, column in FRAME_COLUMNS.items()}, index=index)
+
+
+class BarStore:
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._maps = {}
+
+    def path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, f"{symbol.upper()}.npy")
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        key = (symbol.upper(), interval)
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def exists(self, symbol: str, interval: str) -> bool:
+        return os.path.exists(self.path(symbol, interval))
+
+    def symbols(self, interval: str) -> List[str]:
+        directory = os.path.join(self.root, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".npy"))
+
+    def read(self, symbol: str, interval: str, mmap: bool = True) -> Optional[np.ndarray]:
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r" if mmap else None)
+
+    def mapped(self, symbol: str, interval: str) -> Optional[np.ndarray]:
+        path = self.path(symbol, interval)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        key = (symbol.upper(), interval)
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._maps.get(key)
+        if cached is None or cached[0] != version:
+            cached = self._maps[key] = (version, np.load(path, mmap_mode="r"))
+        return cached[1]
+
+    def query(self, symbol: str, interval: str, start=None, end=None) -> Optional[np.ndarray]:
+        records = self.mapped(symbol, interval)
+        if records is None:
+            return None
+
+        times = records["time"].view(np.ndarray)
+        lo = 0 if start is None else bisect_left(times, to_utc_ns(start))
+        hi = len(records) if end is None else bisect_right(times, to_utc_ns(end))
+        return records[lo:max(lo, hi)]
+
+    def query_frame(self, symbol: str, interval: str, start=None, end=None, tz: str = MARKET_TZ) -> Optional[pd.DataFrame]:
+        records = self.query(symbol, interval, start, end)
+        return None if records is None else records_to_frame(records, tz)
+
+    def last_time(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        records = self.read(symbol, interval)
+        if records is None or len(records) == 0:
+            return None
+        return pd.Timestamp(int(records["time"][-1]), unit="ns", tz="UTC")
+
+    def load_frame(self, symbol: str, interval: str, tz: str = MARKET_TZ) -> Optional[pd.DataFrame]:
+        records = self.read(symbol, interval)
+        return None if records is None else records_to_frame(records, tz)
+
+    def write(self, symbol: str, interval: str, records: np.ndarray):
+        path = self.path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(records, dtype=BAR_DTYPE))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def append(self, symbol: str, interval: str, frame: pd.DataFrame) -> int:
+        new = frame_to_records(frame)
+        if len(new) == 0:
+            return 0
+
+        with self._lock(symbol, interval):
+            existing = self.read(symbol, interval, mmap=False)
+            if existing is not None and len(existing):
+                times = existing["time"]
+                merged = np.concatenate((existing[times < new["time"][0]], new, existing[times > new["time"][-1]]))
+            else:
+                merged = new
+            self.write(symbol, interval, merged)
+
+        return len(new)
+
+    def actions_path(self, symbol: str) -> str:
+        return os.path.join(self.root, "actions", f"{symbol.upper()}.npy")
+
+    def actions(self, symbol: str) -> np.ndarray:
+        from corporate_actions import ACTION_DTYPE
+
+        path = self.actions_path(symbol)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=ACTION_DTYPE)
+        return np.load(path)
+
+    def _write_actions(self, symbol: str, actions: np.ndarray):
+        path = self.actions_path(symbol)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, actions)
+        os.replace(tmp_path, path)
+
+    def update_actions(self, symbol: str, frame: pd.DataFrame) -> np.ndarray:
+        from corporate_actions import actions_from_frame, unadjust_dividends
+
+        with self._lock(symbol, "actions"):
+            actions = unadjust_dividends(actions_from_frame(frame), self.actions(symbol))
+            self._write_actions(symbol, actions)
+        return actions
+
+    def append_raw(self, symbol: str, interval: str, frame: pd.DataFrame) -> int:
+        from corporate_actions import to_raw
+
+        with self._lock(symbol, "actions"):
+            raw, actions = to_raw(frame, self.actions(symbol))
+            self._write_actions(symbol, actions)
+        return self.append(symbol, interval, raw)
+
+    def query_adjusted(self, symbol: str, interval: str, start=None, end=None, mode: str = "all") -> Optional[np.ndarray]:
+        from corporate_actions import adjust_records
+
+        records = self.query(symbol, interval, start, end)
+        if records is None:
+            return None
+        if interval not in RAW_INTERVALS:
+            mode = "none"
+        return adjust_records(records, self.actions(symbol), self.mapped(symbol, "1d"), mode)
+
+    def query_adjusted_frame(self, symbol: str, interval: str, start=None, end=None, mode: str = "all",
+                             tz: str = MARKET_TZ) -> Optional[pd.DataFrame]:
+        records = self.query_adjusted(symbol, interval, start, end, mode)
+        return None if records is None else records_to_frame(records, tz)
+
+    def coverage_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, f"{symbol.upper()}.ranges.json")
+
+    def coverage(self, symbol: str, interval: str) -> RangeSet:
+        path = self.coverage_path(symbol, interval)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return RangeSet.from_list(json.load(f))
+
+        records = self.read(symbol, interval)
+        if records is None or len(records) == 0:
+            return RangeSet()
+        return RangeSet([(int(records["time"][0]), int(records["time"][-1]))])
+
+    def mark_covered(self, symbol: str, interval: str, start: int, end: int):
+        with self._lock(symbol, interval):
+            coverage = self.coverage(symbol, interval)
+            coverage.add(start, end)
+
+            path = self.coverage_path(symbol, interval)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(coverage.to_list(), f)
+            os.replace(tmp_path, path)
+
+    def backfill(self, fetcher, symbol: str, interval: str, start, end=None) -> Tuple[List[Span], List[str]]:
+        now = pd.Timestamp.now(tz="UTC").value
+        start_ns = to_utc_ns(start)
+        end_ns = now if end is None else min(to_utc_ns(end), now)
+
+        requests = plan_backfill(self.coverage(symbol, interval), start_ns, end_ns, interval)
+        errors = []
+
+        # 日线按未复权价格存储，先更新分红拆股记录，读取时再复权
+        raw = interval in RAW_INTERVALS and hasattr(fetcher, "get_corporate_actions")
+        if raw and requests:
+            actions = fetcher.get_corporate_actions(symbol)
+            if isinstance(actions, dict):
+                return requests, [actions.get("error", "未知错误")]
+            self.update_actions(symbol, actions)
+
+        for gap_start, gap_end in requests:
+            # 上游的结束时间不包含在内，多请求1秒以包含区间末尾的K线
+            gap_range = (pd.Timestamp(gap_start, tz="UTC").to_pydatetime(),
+                         pd.Timestamp(gap_end + 10**9, tz="UTC").to_pydatetime())
+            if raw:
+                data = fetcher.get_bars_range(symbol, *gap_range, interval, auto_adjust=False)
+            else:
+                data = fetcher.get_bars_range(symbol, *gap_range, interval)
+            if isinstance(data, dict):
+                errors.append(data.get("error", "未知错误"))
+                continue
+
+            last_ns = gap_start
+            if isinstance(data, pd.DataFrame) and not data.empty:
+                if raw:
+                    self.append_raw(symbol, interval, data)
+                else:
+                    self.append(symbol, interval, data)
+                last_ns = to_utc_ns(data.index[-1])
+
+            # 最近一天内还会产生新的K线，只记录到已获取的最后一根
+            if gap_end > now - int(RECENT_WINDOW.total_seconds() * 10**9):
+                gap_end = max(gap_start, last_ns)
+            self.mark_covered(symbol, interval, gap_start, gap_end)
+
+        return requests, errors
+
+    def load_range(self, fetcher, symbol: str, interval: str, start, end=None, adjust: str = "all") -> Optional[pd.DataFrame]:
+        _, errors = self.backfill(fetcher, symbol, interval, start, end)
+        frame = self.query_adjusted_frame(symbol, interval, start, end, adjust)
+        if (frame is None or frame.empty) and errors:
+            return None
+        return frame
+
+    def delete(self, symbol: str, interval: str):
+        self._maps.pop((symbol.upper(), interval), None)
+        paths = [self.path(symbol, interval), self.coverage_path(symbol, interval)]
+        if interval in RAW_INTERVALS:
+            paths.append(self.actions_path(symbol))
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,180 @@
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bar_store import DEFAULT_STORE_DIR, BarStore, frame_to_records
+
+
+FLAG_NAN = 1
+FLAG_HIGH_LOW = 2
+FLAG_OPEN_RANGE = 4
+FLAG_CLOSE_RANGE = 8
+FLAG_NON_POSITIVE = 16
+FLAG_ZERO_VOLUME = 32
+FLAG_DUPLICATE = 64
+FLAG_OUT_OF_ORDER = 128
+FLAG_JUMP = 256
+
+FLAG_NAMES = {
+    FLAG_NAN: "nan",
+    FLAG_HIGH_LOW: "high_below_low",
+    FLAG_OPEN_RANGE: "open_out_of_range",
+    FLAG_CLOSE_RANGE: "close_out_of_range",
+    FLAG_NON_POSITIVE: "non_positive",
+    FLAG_ZERO_VOLUME: "zero_volume",
+    FLAG_DUPLICATE: "duplicate",
+    FLAG_OUT_OF_ORDER: "out_of_order",
+    FLAG_JUMP: "jump"
+}
+
+POLICIES = ("repair", "flag", "drop")
+
+# 修复时能改正的问题；零成交量和异常跳变只记录（跳变可能是真实的暴涨暴跌），其余问题的K线直接删除
+REPAIRABLE_FLAGS = FLAG_NAN | FLAG_HIGH_LOW | FLAG_OPEN_RANGE | FLAG_CLOSE_RANGE | FLAG_OUT_OF_ORDER
+
+DROP_FLAGS = {
+    "repair": FLAG_NON_POSITIVE | FLAG_DUPLICATE,
+    "drop": FLAG_NAN | FLAG_HIGH_LOW | FLAG_OPEN_RANGE | FLAG_CLOSE_RANGE | FLAG_NON_POSITIVE | FLAG_DUPLICATE | FLAG_JUMP
+}
+
+DEFAULT_JUMP_THRESHOLD = 0.2
+
+
+def check_bars(times: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray,
+               volumes: np.ndarray, jump_threshold: float = DEFAULT_JUMP_THRESHOLD) -> Tuple[np.ndarray, np.ndarray]:
+    flags = np.zeros(len(times), dtype=np.uint16)
+
+    with np.errstate(invalid="ignore"):
+        flags[np.isnan(opens) | np.isnan(highs) | np.isnan(lows) | np.isnan(closes) | np.isnan(volumes)] |= FLAG_NAN
+        flags[highs < lows] |= FLAG_HIGH_LOW
+        flags[(opens > highs) | (opens < lows)] |= FLAG_OPEN_RANGE
+        flags[(closes > highs) | (closes < lows)] |= FLAG_CLOSE_RANGE
+        flags[(opens <= 0) | (highs <= 0) | (lows <= 0) | (closes <= 0)] |= FLAG_NON_POSITIVE
+        flags[volumes == 0] |= FLAG_ZERO_VOLUME
+
+    backwards = times[1:] < times[:-1]
+    if backwards.any():
+        flags[1:][backwards] |= FLAG_OUT_OF_ORDER
+        order = np.argsort(times, kind="stable")
+        sorted_times = times[order]
+    else:
+        order = np.arange(len(times))
+        sorted_times = times
+
+    # 相同时间的K线保留最后一根，与 frame_to_records 一致
+    duplicate = np.zeros(len(times), dtype=bool)
+    duplicate[:-1] = sorted_times[1:] == sorted_times[:-1]
+    flags[order[duplicate]] |= FLAG_DUPLICATE
+
+    # 只把冲高后立即回落（或反之）的孤立跳变视为异常，单向跳空不算
+    valid = order[~duplicate & (closes[order] > 0)]
+    if len(valid) > 2:
+        returns = np.diff(np.log(closes[valid]))
+        spike = (np.abs(returns[:-1]) > jump_threshold) & (np.abs(returns[1:]) > jump_threshold) & \
+                (np.sign(returns[:-1]) != np.sign(returns[1:]))
+        flags[valid[1:-1][spike]] |= FLAG_JUMP
+
+    return flags, order
+
+
+def quality_report(flags: np.ndarray, symbol: Optional[str] = None) -> Dict:
+    counts = {name: int(np.count_nonzero(flags & bit)) for bit, name in FLAG_NAMES.items()}
+    return {
+        "symbol": symbol,
+        "bars": len(flags),
+        "clean": int(np.count_nonzero(flags == 0)),
+        "issues": {name: count for name, count in counts.items() if count}
+    }
+
+
+def _repair(frame: pd.DataFrame):
+    closes = frame["Close"].to_numpy(dtype=float)
+    prices = [np.where(np.isnan(values), closes, values)
+              for values in (frame[column].to_numpy(dtype=float) for column in ("Open", "High", "Low"))]
+
+    frame["Open"] = prices[0]
+    frame["High"] = np.fmax(np.fmax(prices[0], prices[1]), np.fmax(prices[2], closes))
+    frame["Low"] = np.fmin(np.fmin(prices[0], prices[1]), np.fmin(prices[2], closes))
+    frame["Volume"] = frame["Volume"].fillna(0)
+
+
+def validate_frame(frame: pd.DataFrame, policy: str = "repair", symbol: Optional[str] = None,
+                   jump_threshold: float = DEFAULT_JUMP_THRESHOLD) -> Tuple[pd.DataFrame, Dict]:
+    if policy not in POLICIES:
+        raise ValueError(f"未知的校验策略: {policy}")
+
+    closes = frame["Close"].to_numpy(dtype=float)
+    flags, order = check_bars(frame.index.asi8, frame["Open"].to_numpy(dtype=float), frame["High"].to_numpy(dtype=float),
+                              frame["Low"].to_numpy(dtype=float), closes, frame["Volume"].to_numpy(dtype=float),
+                              jump_threshold)
+    report = quality_report(flags, symbol)
+
+    if policy == "flag":
+        result = frame.copy()
+        result["Flags"] = flags
+        report.update(kept=len(result), repaired=0, dropped=0)
+        return result, report
+
+    keep = order[(flags[order] & DROP_FLAGS[policy]) == 0]
+    if policy == "repair":
+        keep = keep[~np.isnan(closes[keep])]
+
+    repaired = 0
+    if len(keep) == len(frame) and not np.any(flags & FLAG_OUT_OF_ORDER):
+        result = frame
+    else:
+        result = frame.iloc[keep]
+
+    if policy == "repair":
+        repaired = int(np.count_nonzero(flags[keep] & (REPAIRABLE_FLAGS & ~FLAG_OUT_OF_ORDER)))
+        if repaired:
+            result = result.copy()
+            _repair(result)
+
+    report.update(kept=len(result), repaired=repaired, dropped=len(frame) - len(result))
+    return result, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 检查本地存储的K线数据质量")
+    parser.add_argument("symbols", nargs="*", help="股票代码 (默认: 存储中的所有股票)")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="数据存储目录")
+    parser.add_argument("--interval", default="1d", help="数据间隔")
+    parser.add_argument("--jump-threshold", type=float, default=DEFAULT_JUMP_THRESHOLD, help="异常跳变的对数收益率阈值")
+    parser.add_argument("--repair", action="store_true", help="修复并写回存储")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出报告")
+    args = parser.parse_args(argv)
+
+    store = BarStore(args.store)
+    symbols = [symbol.upper() for symbol in args.symbols] or store.symbols(args.interval)
+    if not symbols:
+        parser.error("没有可检查的数据")
+
+    reports: List[Dict] = []
+    for symbol in symbols:
+        frame = store.load_frame(symbol, args.interval)
+        if frame is None:
+            print(f"  ✗ {symbol}: 没有 {args.interval} 数据")
+            continue
+
+        repaired, report = validate_frame(frame, "repair" if args.repair else "flag", symbol, args.jump_threshold)
+        if args.repair and (report["repaired"] or report["dropped"]):
+            store.write(symbol, args.interval, frame_to_records(repaired))
+        reports.append(report)
+
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        for report in reports:
+            issues = ", ".join(f"{name}={count}" for name, count in report["issues"].items()) or "无问题"
+            print(f"  {report['symbol']}: {report['clean']}/{report['bars']} 根正常 ({issues})")
+
+    return 1 if any(report["issues"] for report in reports) and not args.repair else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import pandas as pd
+
+import chart_renderer
+from bar_store import records_to_frame
+from indicators import SIGNAL_PERIODS, compute_indicators, signal_window
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+from shared_bar_cache import SharedBarCache
+from trading_calendar import recent_bar_times
+
+
+_worker = {}
+
+
+def _init_worker(options: dict):
+    figure = Figure(figsize=options["figsize"], dpi=options["dpi"])
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(211)
+    macd_ax = figure.add_subplot(212)
+    figure.subplots_adjust(left=0.08, right=0.97, top=0.94, bottom=0.06, hspace=0.3)
+
+    _worker.clear()
+    _worker.update(options)
+    _worker["figure"] = figure
+    _worker["ax"] = ax
+    _worker["macd_ax"] = macd_ax
+    _worker["fetcher"] = NasdaqStockFetcher()
+
+
+def shared_cache_key(interval: str, period: str, now=None) -> str:
+    # 键中带上最新一根K线的时间，新的交易日或新K线出现后不再读到旧数据，旧条目由缓存按最久未使用淘汰
+    latest = recent_bar_times(1, interval, now)
+    asof = latest[-1].strftime("%Y%m%d%H%M") if len(latest) else ""
+    return f"{interval}:{period}:{asof}"
+
+
+def _load_history(symbol: str):
+    fetcher, cache = _worker["fetcher"], _worker["cache"]
+    if cache is None:
+        return fetcher.get_historical_data(symbol, _worker["period"], _worker["interval"])
+
+    # 同一周期的数据在所有工作进程之间共享，只下载一次
+    key = _worker["cache_key"]
+    records = cache.get(symbol, key)
+    if records is None:
+        hist = fetcher.get_historical_data(symbol, _worker["period"], _worker["interval"])
+        if not isinstance(hist, pd.DataFrame) or hist.empty:
+            return hist
+        records = cache.put(symbol, key, hist)
+    return records_to_frame(records)
+
+
+def render_symbol(symbol: str) -> Tuple[str, Optional[str], Optional[str]]:
+    try:
+        hist = _load_history(symbol)
+
+        if isinstance(hist, dict) and "error" in hist:
+            return symbol, None, hist["error"]
+        if not isinstance(hist, pd.DataFrame) or hist.empty:
+            return symbol, None, f"无法获取股票 {symbol} 的历史数据"
+
+        indicators = compute_indicators(hist, _worker["signal_window"])
+        chart_renderer.render_chart(_worker["ax"], _worker["macd_ax"], hist, symbol, indicators,
+                                    chart_type=_worker["chart_type"],
+                                    show_bollinger=_worker["show_bollinger"])
+
+        path = os.path.join(_worker["output_dir"], f"{symbol}.{_worker['format']}")
+        _worker["figure"].savefig(path, format=_worker["format"])
+        return symbol, path, None
+
+    except Exception as e:
+        return symbol, None, f"渲染图表时出错: {str(e)}"
+
+
+def render_charts(symbols: List[str], output_dir: str, period: str = "1y", interval: str = "1d",
+                  fmt: str = "png", dpi: int = 100, figsize=(10, 8), chart_type: str = "line",
+                  signal_period: str = "1mo", show_bollinger: bool = False,
+                  workers: Optional[int] = None,
+                  cache: Optional[SharedBarCache] = None) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    os.makedirs(output_dir, exist_ok=True)
+
+    options = {
+        "cache": cache,
+        "cache_key": shared_cache_key(interval, period) if cache is not None else None,
+        "output_dir": output_dir,
+        "period": period,
+        "interval": interval,
+        "format": fmt,
+        "dpi": dpi,
+        "figsize": figsize,
+        "chart_type": chart_type,
+        "signal_window": signal_window(signal_period),
+        "show_bollinger": show_bollinger
+    }
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(symbols) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as executor:
+        return list(executor.map(render_symbol, symbols, chunksize=chunksize))
+
+
+def read_symbols(symbols: List[str], symbols_file: Optional[str]) -> List[str]:
+    result = [s.upper() for s in symbols]
+
+    if symbols_file:
+        with open(symbols_file, "r", encoding="utf-8") as f:
+            for line in f:
+                symbol = line.split("#", 1)[0].strip().upper()
+                if symbol:
+                    result.append(symbol)
+
+    return list(dict.fromkeys(result))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 批量生成股票图表 (无界面)")
+    parser.add_argument("symbols", nargs="*", help="股票代码")
+    parser.add_argument("--symbols-file", help="股票代码列表文件，每行一个代码")
+    parser.add_argument("-o", "--output", default="charts", help="输出目录")
+    parser.add_argument("--period", default="1y", help="时间周期")
+    parser.add_argument("--interval", default="1d", help="数据间隔")
+    parser.add_argument("--format", default="png", choices=("png", "svg"), help="输出格式")
+    parser.add_argument("--dpi", type=int, default=100, help="图片分辨率")
+    parser.add_argument("--chart-type", default="line", choices=("line", "candlestick", "volume"), help="图表类型")
+    parser.add_argument("--signal-period", default="1mo", choices=SIGNAL_PERIODS, help="信号周期")
+    parser.add_argument("--bollinger", action="store_true", help="显示布林带")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="并行进程数 (默认: CPU核数)")
+    parser.add_argument("--shared-cache", metavar="NAME", help="共享内存K线缓存名称，多个进程和多次运行共用一份数据")
+    args = parser.parse_args(argv)
+
+    symbols = read_symbols(args.symbols, args.symbols_file)
+    if not symbols:
+        parser.error("请提供至少一个股票代码")
+
+    start = time.time()
+    cache = SharedBarCache(args.shared_cache) if args.shared_cache else None
+    try:
+        results = render_charts(symbols, args.output, period=args.period, interval=args.interval,
+                                fmt=args.format, dpi=args.dpi, chart_type=args.chart_type,
+                                signal_period=args.signal_period, show_bollinger=args.bollinger,
+                                workers=args.workers, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.time() - start
+
+    failures = [(symbol, error) for symbol, path, error in results if error]
+    for symbol, error in failures:
+        print(f"✗ {symbol}: {error}")
+
+    print(f"完成: {len(results) - len(failures)}/{len(results)} 张图表, 用时 {elapsed:.1f} 秒, 输出目录: {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from bar_store import DEFAULT_STORE_DIR, RAW_INTERVALS, BarStore, to_utc_ns
+from bar_validation import POLICIES, validate_frame
+from fetcher_metrics import is_rate_limited
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+from rate_limiter import TokenBucket
+from trading_calendar import busday_count
+
+
+FULL_PERIODS = {
+    "1d": "max",
+    "1h": "730d",
+    "30m": "60d",
+    "15m": "60d",
+    "5m": "60d",
+    "1m": "7d"
+}
+
+GAP_BUSINESS_DAYS = 3
+
+
+def load_universe(path: str) -> List[str]:
+    symbols = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            if "|" in line:
+                fields = line.split("|")
+                if fields[0] in ("Symbol", "Nasdaq Traded") or line.startswith("File Creation Time"):
+                    continue
+                symbol = fields[1] if fields[0] in ("Y", "N") and len(fields) > 1 else fields[0]
+                if len(fields) > 5 and fields[0] in ("Y", "N") and fields[5] == "Y":
+                    continue
+            else:
+                symbol = line.split(",")[0]
+            symbol = symbol.strip().upper()
+            if symbol:
+                symbols.append(symbol)
+    return list(dict.fromkeys(symbols))
+
+
+def find_gaps(index: pd.DatetimeIndex, min_business_days: int = GAP_BUSINESS_DAYS) -> List[Dict]:
+    if len(index) < 2:
+        return []
+    days = index.tz_localize(None).normalize().unique().values.astype("datetime64[D]")
+    missing = busday_count(days[:-1] + 1, days[1:])
+    return [
+        {"after": str(days[i]), "before": str(days[i + 1]), "business_days": int(missing[i])}
+        for i in np.flatnonzero(missing >= min_business_days)
+    ]
+
+
+class Checkpoint:
+    def __init__(self, path: str, run_id: str, fresh: bool = False):
+        self.path = path
+        self.run_id = run_id
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = 0
+
+        if not fresh and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("run_id") == run_id:
+                self.entries = data.get("entries", {})
+
+    @staticmethod
+    def key(symbol: str, interval: str) -> str:
+        return f"{symbol}:{interval}"
+
+    def is_done(self, symbol: str, interval: str) -> bool:
+        with self._lock:
+            return self.entries.get(self.key(symbol, interval), {}).get("status") == "done"
+
+    def record(self, symbol: str, interval: str, entry: Dict, flush_every: int = 25):
+        with self._lock:
+            self.entries[self.key(symbol, interval)] = entry
+            self._dirty += 1
+            if self._dirty >= flush_every:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"run_id": self.run_id, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = 0
+
+
+class IngestJob:
+    def __init__(self, fetcher: NasdaqStockFetcher, store: BarStore, checkpoint: Checkpoint,
+                 intervals=("1d",), workers: int = 8, max_rps: float = 2.0, burst: float = 5,
+                 max_retries: int = 4, backoff: float = 5.0, full_periods: Optional[Dict[str, str]] = None,
+                 progress: Optional[Callable[[Dict], None]] = None, validation: Optional[str] = "repair"):
+        self.fetcher = fetcher
+        self.store = store
+        self.checkpoint = checkpoint
+        self.intervals = tuple(intervals)
+        self.workers = workers
+        self.limiter = TokenBucket(max_rps, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.full_periods = dict(FULL_PERIODS, **(full_periods or {}))
+        self.progress = progress
+        self.validation = validation
+        self.stop_event = threading.Event()
+
+    def fetch(self, symbol: str, interval: str, since: Optional[pd.Timestamp]):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            options = {"auto_adjust": False} if interval in RAW_INTERVALS else {}
+            if since is not None:
+                result = self.fetcher.get_bars_since(symbol, since.to_pydatetime(), interval, **options)
+            else:
+                result = self.fetcher.get_historical_data(symbol, self.full_periods.get(interval, "max"), interval, **options)
+
+            error = result.get("error") if isinstance(result, dict) else None
+            if error is None or not is_rate_limited(error) or attempt == self.max_retries:
+                return result
+            if self.stop_event.wait(self.backoff * (2 ** attempt)):
+                return result
+        return result
+
+    def ingest_one(self, symbol: str, interval: str) -> Dict:
+        started = time.time()
+        last = self.store.last_time(symbol, interval)
+        since = None if last is None else last - timedelta(days=3 if interval == "1d" else 1)
+        period = self.full_periods.get(interval, "max")
+        if since is not None and period.endswith("d") and since < pd.Timestamp.now(tz="UTC") - timedelta(days=int(period[:-1]) - 1):
+            since = None
+
+        result = self.fetch(symbol, interval, since)
+        entry = {"status": "done", "mode": "tail" if since is not None else "full", "rows": 0, "gaps": []}
+
+        if isinstance(result, dict):
+            entry.update(status="failed", error=result.get("error", "未知错误"))
+        elif not isinstance(result, pd.DataFrame) or result.empty:
+            if since is None:
+                entry.update(status="failed", error=f"无法获取股票 {symbol} 的历史数据")
+        else:
+            bars = result
+            if self.validation is not None:
+                bars, report = validate_frame(result, self.validation, symbol)
+                if report["issues"]:
+                    entry["quality"] = dict(report["issues"], repaired=report["repaired"], dropped=report["dropped"])
+
+            if interval in RAW_INTERVALS:
+                entry["rows"] = self.store.append_raw(symbol, interval, bars)
+            else:
+                entry["rows"] = self.store.append(symbol, interval, bars)
+            first = to_utc_ns(result.index[0]) if since is None else since.value
+            self.store.mark_covered(symbol, interval, first, to_utc_ns(result.index[-1]))
+            if interval == "1d":
+                entry["gaps"] = find_gaps(result.index)
+
+        entry["seconds"] = round(time.time() - started, 2)
+        return entry
+
+    def run(self, symbols: List[str]) -> Dict:
+        work = queue.Queue()
+        skipped = 0
+        for symbol in symbols:
+            for interval in self.intervals:
+                if self.checkpoint.is_done(symbol, interval):
+                    skipped += 1
+                else:
+                    work.put((symbol, interval))
+
+        total = work.qsize()
+        done_count = [0]
+        lock = threading.Lock()
+
+        def worker():
+            while not self.stop_event.is_set():
+                try:
+                    symbol, interval = work.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    entry = self.ingest_one(symbol, interval)
+                except Exception as e:
+                    entry = {"status": "failed", "error": f"导入时出错: {str(e)}", "rows": 0, "gaps": []}
+                self.checkpoint.record(symbol, interval, entry)
+
+                with lock:
+                    done_count[0] += 1
+                    if self.progress is not None:
+                        self.progress({"symbol": symbol, "interval": interval, "done": done_count[0], "total": total, **entry})
+
+        started = time.time()
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, self.workers))]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            self.checkpoint.flush()
+
+        return self.summary(symbols, skipped, time.time() - started)
+
+    def summary(self, symbols: List[str], skipped: int, elapsed: float) -> Dict:
+        entries = self.checkpoint.entries
+        keys = [Checkpoint.key(symbol, interval) for symbol in symbols for interval in self.intervals]
+        present = [(key, entries[key]) for key in keys if key in entries]
+
+        return {
+            "run_id": self.checkpoint.run_id,
+            "elapsed_seconds": round(elapsed, 1),
+            "tasks": len(keys),
+            "done": sum(1 for _, entry in present if entry["status"] == "done"),
+            "failed": sum(1 for _, entry in present if entry["status"] == "failed"),
+            "pending": len(keys) - len(present),
+            "resumed_skipped": skipped,
+            "rows": sum(entry.get("rows", 0) for _, entry in present),
+            "failures": {key: entry.get("error") for key, entry in present if entry["status"] == "failed"},
+            "gaps": {key: entry["gaps"] for key, entry in present if entry.get("gaps")},
+            "quality": {key: entry["quality"] for key, entry in present if entry.get("quality")},
+            "interrupted": self.stop_event.is_set()
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 收盘后批量导入全市场K线数据 (可断点续传)")
+    parser.add_argument("symbols", nargs="*", help="股票代码")
+    parser.add_argument("--universe", help="股票列表文件 (每行一个代码，或 nasdaqtraded.txt 格式)")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="数据存储目录")
+    parser.add_argument("--intervals", default="1d", help="数据间隔，逗号分隔，例如 1d,1h,5m")
+    parser.add_argument("-j", "--workers", type=int, default=8, help="并行线程数")
+    parser.add_argument("--max-rps", type=float, default=2.0, help="对上游的最大请求速率 (请求/秒)")
+    parser.add_argument("--burst", type=float, default=5, help="限流突发容量")
+    parser.add_argument("--retries", type=int, default=4, help="遇到限流时的最大重试次数")
+    parser.add_argument("--run-id", default=None, help="运行标识，相同标识可断点续传 (默认: 当天日期)")
+    parser.add_argument("--checkpoint", default=None, help="断点文件路径 (默认: <存储目录>/ingest_checkpoint.json)")
+    parser.add_argument("--fresh", action="store_true", help="忽略已有断点，重新开始")
+    parser.add_argument("--validation", choices=POLICIES + ("none",), default="repair",
+                        help="数据校验策略: repair 修复, flag 只记录, drop 删除问题K线, none 不校验")
+    parser.add_argument("--report", help="将汇总报告写入JSON文件")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不打印每只股票的进度")
+    args = parser.parse_args(argv)
+
+    symbols = [s.upper() for s in args.symbols]
+    if args.universe:
+        symbols += load_universe(args.universe)
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        parser.error("请提供股票代码或 --universe 列表文件")
+
+    intervals = [interval.strip() for interval in args.intervals.split(",") if interval.strip()]
+    run_id = args.run_id or date.today().isoformat()
+    checkpoint = Checkpoint(args.checkpoint or os.path.join(args.store, "ingest_checkpoint.json"), run_id, args.fresh)
+
+    def progress(item):
+        if args.quiet:
+            return
+        status = "✓" if item["status"] == "done" else "✗"
+        detail = f"{item['rows']} 行 ({item['mode']})" if item["status"] == "done" else item.get("error", "")
+        print(f"[{item['done']}/{item['total']}] {status} {item['symbol']} {item['interval']}: {detail}", flush=True)
+
+    job = IngestJob(NasdaqStockFetcher(), BarStore(args.store), checkpoint, intervals, args.workers,
+                    args.max_rps, args.burst, args.retries, progress=progress,
+                    validation=None if args.validation == "none" else args.validation)
+
+    print(f"开始导入: {len(symbols)} 只股票 x {len(intervals)} 种间隔, 运行标识 {run_id}")
+    summary = job.run(symbols)
+
+    print(f"\n完成 {summary['done']}/{summary['tasks']}, 失败 {summary['failed']}, 未完成 {summary['pending']}, "
+          f"断点跳过 {summary['resumed_skipped']}, 写入 {summary['rows']} 行, 用时 {summary['elapsed_seconds']} 秒")
+    for key, error in list(summary["failures"].items())[:20]:
+        print(f"  ✗ {key}: {error}")
+    if summary["gaps"]:
+        print(f"  {len(summary['gaps'])} 个序列存在超过 {GAP_BUSINESS_DAYS} 个交易日的缺口")
+    if summary["quality"]:
+        print(f"  {len(summary['quality'])} 个序列存在数据质量问题 (详见 --report)")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    return 1 if summary["failed"] or summary["pending"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
+from typing import Dict
+
+from indicators import compute_indicators
+
+
+MAX_PLOT_POINTS = 4000
+
+
+def bucket_size(n: int, max_points: int = MAX_PLOT_POINTS) -> int:
+    return max(1, int(np.ceil(n / max(1, max_points // 2))))
+
+
+def downsample_minmax(x, y, size: int):
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if size <= 1 or n <= size:
+        return x, y
+
+    buckets = -(-n // size)
+    padded = np.concatenate((y, np.full(buckets * size - n, np.nan))).reshape(buckets, size)
+    missing = np.isnan(padded)
+    low = np.argmin(np.where(missing, np.inf, padded), axis=1)
+    high = np.argmax(np.where(missing, -np.inf, padded), axis=1)
+
+    base = np.arange(buckets) * size
+    idx = np.unique(np.column_stack((base + np.minimum(low, high), base + np.maximum(low, high))).ravel())
+    idx = idx[idx < n]
+    return x[idx], y[idx]
+
+
+def bucket_extremes(x, values, size: int):
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if size <= 1 or n <= size:
+        return x, values
+
+    starts = np.arange(0, n, size)
+    buckets = len(starts)
+    padded = np.concatenate((values, np.zeros(buckets * size - n))).reshape(buckets, size)
+    pick = np.argmax(np.abs(padded), axis=1)
+    centers = (x[starts] + x[np.minimum(starts + size, n) - 1]) / 2
+    return centers, padded[np.arange(buckets), pick]
+
+
+def add_bar_collections(ax, x, heights, up, width, alpha=0.7, label=None):
+    left = x - width / 2
+    right = x + width / 2
+    bottom = np.zeros_like(heights)
+
+    verts = np.stack((
+        np.column_stack((left, bottom)),
+        np.column_stack((left, heights)),
+        np.column_stack((right, heights)),
+        np.column_stack((right, bottom))
+    ), axis=1)
+
+    for mask, color, collection_label in ((up, 'green', label), (~up, 'red', None)):
+        if mask.any():
+            ax.add_collection(PolyCollection(verts[mask], facecolors=color, edgecolors='none',
+                                             alpha=alpha, label=collection_label))
+
+    ax.xaxis_date()
+    ax.autoscale_view()
+
+
+def plot_line_chart(ax, hist, max_points: int = MAX_PLOT_POINTS):
+    x, close = downsample_minmax(hist.index, hist['Close'], bucket_size(len(hist), max_points))
+    ax.plot(x, close, label='收盘价', linewidth=1.5, color='blue')
+    ax.legend(loc='upper left')
+
+
+def plot_candlestick_chart(ax, hist):
+    x = mdates.date2num(hist.index)
+    spacing = np.median(np.diff(x)) if len(x) > 1 else 1.0
+    width = spacing * 0.6
+
+    opens = hist['Open'].to_numpy()
+    closes = hist['Close'].to_numpy()
+    highs = hist['High'].to_numpy()
+    lows = hist['Low'].to_numpy()
+    up = closes >= opens
+
+    for mask, color in ((up, 'green'), (~up, 'red')):
+        ax.vlines(x[mask], lows[mask], highs[mask], color=color, linewidth=0.5)
+        ax.bar(x[mask], np.abs(closes - opens)[mask], width, bottom=np.minimum(opens, closes)[mask],
+               color=color, edgecolor=color)
+
+    ax.xaxis_date()
+
+
+def plot_volume_chart(ax, hist, max_points: int = MAX_PLOT_POINTS, fontsize=10):
+    n = len(hist)
+    if n == 0:
+        return
+
+    x = mdates.date2num(hist.index)
+    opens = hist['Open'].to_numpy(dtype=float)
+    closes = hist['Close'].to_numpy(dtype=float)
+    volumes = np.nan_to_num(hist['Volume'].to_numpy(dtype=float))
+
+    size = bucket_size(n, max_points)
+    starts = np.arange(0, n, size)
+    ends = np.minimum(starts + size, n) - 1
+
+    heights = np.add.reduceat(volumes, starts)
+    up = closes[ends] >= opens[starts]
+    centers = (x[starts] + x[ends]) / 2
+    spacing = np.median(np.diff(x)) if n > 1 else 1.0
+
+    add_bar_collections(ax, centers, heights, up, spacing * size * 0.8)
+    ax.set_ylabel("成交量", fontsize=fontsize)
+
+
+def plot_volume_panel(volume_ax, hist, max_points: int = MAX_PLOT_POINTS):
+    plot_volume_chart(volume_ax, hist, max_points, fontsize=9)
+    volume_ax.grid(True, alpha=0.3)
+    volume_ax.tick_params(axis='x', labelbottom=False)
+    volume_ax.tick_params(axis='y', labelsize=8)
+
+
+def plot_series(ax, series, max_points: int = MAX_PLOT_POINTS, **kwargs):
+    x, y = downsample_minmax(series.index, series, bucket_size(len(series), max_points))
+    ax.plot(x, y, **kwargs)
+
+
+def plot_moving_averages(ax, moving_averages: Dict, max_points: int = MAX_PLOT_POINTS):
+    ma20 = moving_averages[20]
+    ma50 = moving_averages[50]
+    ma200 = moving_averages[200]
+
+    if len(ma20.dropna()) > 0:
+        plot_series(ax, ma20, max_points, label='MA20', linewidth=1, alpha=0.7, color='orange')
+    if len(ma50.dropna()) > 0:
+        plot_series(ax, ma50, max_points, label='MA50', linewidth=1, alpha=0.7, color='purple')
+    if len(ma200.dropna()) > 0:
+        plot_series(ax, ma200, max_points, label='MA200', linewidth=1, alpha=0.7, color='brown')
+
+    ax.legend(loc='upper left')
+
+
+def plot_bollinger_bands(ax, bollinger):
+    ma, upper_band, lower_band = bollinger
+    ax.fill_between(ma.index, upper_band, lower_band, alpha=0.2, color='gray', label='布林带')
+    ax.legend(loc='upper left')
+
+
+def plot_buy_sell_signals(ax, signals):
+    buy_signals, sell_signals = signals
+
+    if buy_signals:
+        buy_dates, buy_prices = zip(*buy_signals)
+        ax.scatter(buy_dates, buy_prices, marker='^', color='green',
+                   s=100, label='买入 (B)', zorder=5)
+
+        for date, price in buy_signals:
+            ax.annotate('B', xy=(date, price), xytext=(0, 10),
+                        textcoords='offset points', fontsize=10, fontweight='bold',
+                        color='green', ha='center', va='bottom')
+
+    if sell_signals:
+        sell_dates, sell_prices = zip(*sell_signals)
+        ax.scatter(sell_dates, sell_prices, marker='v', color='red',
+                   s=100, label='卖出 (S)', zorder=5)
+
+        for date, price in sell_signals:
+            ax.annotate('S', xy=(date, price), xytext=(0, -15),
+                        textcoords='offset points', fontsize=10, fontweight='bold',
+                        color='red', ha='center', va='top')
+
+    if buy_signals or sell_signals:
+        ax.legend(loc='upper left')
+
+
+def plot_macd(macd_ax, macd, max_points: int = MAX_PLOT_POINTS):
+    macd_line, signal_line, histogram = macd
+
+    plot_series(macd_ax, macd_line, max_points, label='MACD',
+                linewidth=1.5, color='blue')
+    plot_series(macd_ax, signal_line, max_points, label='信号线',
+                linewidth=1.5, color='orange')
+
+    x = mdates.date2num(histogram.index)
+    size = bucket_size(len(x), max_points)
+    spacing = np.median(np.diff(x)) if len(x) > 1 else 1.0
+    x, values = bucket_extremes(x, np.nan_to_num(histogram.to_numpy(dtype=float)), size)
+    add_bar_collections(macd_ax, x, values, values > 0, spacing * size * 0.8, alpha=0.6, label='柱状图')
+
+    macd_ax.axhline(y=0, color='black', linestyle='--', linewidth=0.5, alpha=0.5)
+
+    macd_ax.set_title('MACD指标', fontsize=12, fontweight='bold')
+    macd_ax.set_xlabel('日期', fontsize=9)
+    macd_ax.set_ylabel('MACD值', fontsize=9)
+    macd_ax.grid(True, alpha=0.3)
+    macd_ax.legend(loc='upper left', fontsize=8)
+
+    macd_ax.tick_params(axis='x', labelsize=8)
+    macd_ax.tick_params(axis='y', labelsize=8)
+
+
+def decorate_price_axes(ax, symbol):
+    ax.set_title(f"{symbol} 股票价格曲线", fontsize=14, fontweight='bold')
+    ax.set_xlabel("日期", fontsize=10)
+    ax.set_ylabel("价格 ($)", fontsize=10)
+    ax.grid(True, alpha=0.3)
+
+
+def render_chart(ax, macd_ax, hist, symbol, indicators=None, chart_type="line",
+                 show_ma=True, show_bollinger=False, show_signals=True, show_macd=True):
+    if indicators is None:
+        indicators = compute_indicators(hist)
+
+    ax.clear()
+    macd_ax.clear()
+
+    if chart_type == "line":
+        plot_line_chart(ax, hist)
+    elif chart_type == "candlestick":
+        plot_candlestick_chart(ax, hist)
+    elif chart_type == "volume":
+        plot_volume_chart(ax, hist)
+
+    if show_ma:
+        plot_moving_averages(ax, indicators["moving_averages"])
+
+    if show_bollinger:
+        plot_bollinger_bands(ax, indicators["bollinger"])
+
+    if show_signals:
+        plot_buy_sell_signals(ax, indicators["signals"])
+
+    if show_macd:
+        plot_macd(macd_ax, indicators["macd"])
+
+    decorate_price_axes(ax, symbol)
@@ -0,0 +1,125 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BAR_DTYPE, MARKET_TZ
+
+
+ACTION_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("dividend", "<f8"),
+    ("split", "<f8")
+])
+
+ADJUST_MODES = ("none", "split", "all")
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+
+def actions_from_frame(frame: pd.DataFrame) -> np.ndarray:
+    if frame is None or frame.empty:
+        return np.empty(0, dtype=ACTION_DTYPE)
+
+    dividends = frame["Dividends"].fillna(0).to_numpy(dtype=float) if "Dividends" in frame else np.zeros(len(frame))
+    splits = frame["Stock Splits"].fillna(0).to_numpy(dtype=float) if "Stock Splits" in frame else np.zeros(len(frame))
+    splits = np.where(splits > 0, splits, 1.0)
+    mask = (dividends != 0) | (splits != 1.0)
+
+    index = frame.index[mask]
+    if index.tz is None:
+        index = index.tz_localize(MARKET_TZ)
+
+    actions = np.empty(int(mask.sum()), dtype=ACTION_DTYPE)
+    actions["time"] = index.tz_convert("UTC").as_unit("ns").asi8
+    actions["dividend"] = dividends[mask]
+    actions["split"] = splits[mask]
+    return actions
+
+
+def merge_actions(existing: np.ndarray, new: np.ndarray) -> np.ndarray:
+    merged = np.concatenate((new, existing))
+    _, first = np.unique(merged["time"], return_index=True)
+    return merged[first]
+
+
+def cumulative_factor(times: np.ndarray, action_times: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    after = np.ones(len(factors) + 1)
+    after[:-1] = np.cumprod(factors[::-1])[::-1]
+    return after[np.searchsorted(action_times, times, side="right")]
+
+
+def split_factor_after(times: np.ndarray, actions: np.ndarray) -> np.ndarray:
+    return cumulative_factor(times, actions["time"], actions["split"])
+
+
+def unadjust_dividends(new: np.ndarray, known: np.ndarray) -> np.ndarray:
+    # Yahoo 返回的股息已按之后的拆股调整，换算回除息日当时的每股金额
+    splits = merge_actions(known, new)
+    new = new.copy()
+    new["dividend"] *= split_factor_after(new["time"], splits)
+    return merge_actions(known, new)
+
+
+def to_raw(frame: pd.DataFrame, known_actions: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray]:
+    actions = unadjust_dividends(actions_from_frame(frame), known_actions)
+
+    index = frame.index if frame.index.tz is not None else frame.index.tz_localize(MARKET_TZ)
+    factor = split_factor_after(index.tz_convert("UTC").as_unit("ns").asi8, actions)
+
+    raw = frame.copy()
+    for column in ("Open", "High", "Low", "Close"):
+        raw[column] = frame[column].to_numpy() * factor
+    raw["Volume"] = np.round(frame["Volume"].to_numpy() / factor)
+    return raw, actions
+
+
+def remove_dividend_adjustment(frame: pd.DataFrame) -> pd.DataFrame:
+    # 已复权的导出数据: 从最近的除息日往前逐个还原，得到只按拆股调整的价格
+    dividends = frame["Dividends"].fillna(0).to_numpy(dtype=float)
+    close = frame["Close"].to_numpy(dtype=float)
+    positions = np.flatnonzero(dividends > 0)
+    factors = np.ones(len(positions))
+
+    later = 1.0
+    for k in range(len(positions) - 1, -1, -1):
+        i = positions[k]
+        if i == 0:
+            continue
+        previous = close[i - 1] / later + dividends[i]
+        factors[k] = 1.0 - dividends[i] / previous
+        later *= factors[k]
+
+    factor = cumulative_factor(np.arange(len(frame)), positions, factors)
+    result = frame.copy()
+    for column in ("Open", "High", "Low", "Close"):
+        result[column] = frame[column].to_numpy() / factor
+    return result
+
+
+def action_factors(actions: np.ndarray, daily: Optional[np.ndarray], mode: str) -> Tuple[np.ndarray, np.ndarray]:
+    price = 1.0 / actions["split"]
+    volume = actions["split"].copy()
+    if mode == "all" and daily is not None and len(daily):
+        times = np.asarray(daily["time"])
+        before = np.searchsorted(times, actions["time"], side="left") - 1
+        previous = np.where(before >= 0, np.asarray(daily["close"])[np.maximum(before, 0)], np.nan)
+        valid = (actions["dividend"] > 0) & (previous > actions["dividend"])
+        price = price * np.where(valid, 1.0 - actions["dividend"] / np.where(valid, previous, 1.0), 1.0)
+    return price, volume
+
+
+def adjust_records(records: np.ndarray, actions: np.ndarray, daily: Optional[np.ndarray] = None,
+                   mode: str = "all") -> np.ndarray:
+    if mode not in ADJUST_MODES:
+        raise ValueError(f"未知的复权方式: {mode}")
+    adjusted = np.array(records, dtype=BAR_DTYPE)
+    if mode == "none" or len(actions) == 0 or len(adjusted) == 0:
+        return adjusted
+
+    price, volume = action_factors(actions, daily if daily is not None else records, mode)
+    price_factor = cumulative_factor(adjusted["time"], actions["time"], price)
+    for field in PRICE_FIELDS:
+        adjusted[field] *= price_factor
+    adjusted["volume"] = np.round(adjusted["volume"] * cumulative_factor(adjusted["time"], actions["time"], volume))
+    return adjusted
@@ -0,0 +1,218 @@
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bar_store import DEFAULT_STORE_DIR, MARKET_TZ, RAW_INTERVALS, BarStore
+from bar_validation import POLICIES, validate_frame
+
+
+COLUMN_DTYPES = {
+    "Open": "float64",
+    "High": "float64",
+    "Low": "float64",
+    "Close": "float64",
+    "Adj Close": "float64",
+    "Volume": "int64",
+    "Dividends": "float64",
+    "Stock Splits": "float64",
+    "Capital Gains": "float64"
+}
+
+TIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S.%f%z",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+    "%m/%d/%Y"
+)
+
+
+def arrow_csv_available() -> bool:
+    try:
+        import pyarrow.csv
+    except ImportError:
+        return False
+    return True
+
+
+_format_cache: Dict[str, Optional[str]] = {}
+
+
+def sniff_time_format(sample: str) -> Optional[str]:
+    sample = sample.strip()
+    shape = re.sub(r"\d", "0", sample)
+    if shape not in _format_cache:
+        _format_cache[shape] = None
+        for fmt in TIME_FORMATS:
+            try:
+                datetime.strptime(sample, fmt)
+            except ValueError:
+                continue
+            _format_cache[shape] = fmt
+            break
+    return _format_cache[shape]
+
+
+def _read_header(path: str) -> Tuple[List[str], str]:
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline().rstrip("\r\n").split(",")
+        first = f.readline().split(",", 1)[0]
+    return header, first
+
+
+def _finish(frame: pd.DataFrame, index_name: str) -> pd.DataFrame:
+    index = frame.index
+    if index.tz is not None:
+        index = index.tz_convert(MARKET_TZ)
+    frame.index = pd.DatetimeIndex(index, name=index_name or "Date")
+    return frame
+
+
+def _read_arrow(path: str, columns: List[str], has_offset: bool) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    column_types = {columns[0]: pa.timestamp("ns", tz="UTC") if has_offset else pa.timestamp("ns")}
+    for column in columns[1:]:
+        column_types[column] = pa.int64() if COLUMN_DTYPES.get(column) == "int64" else pa.float64()
+
+    table = pv.read_csv(path, read_options=pv.ReadOptions(use_threads=True),
+                        convert_options=pv.ConvertOptions(column_types=column_types))
+    frame = table.to_pandas()
+    return frame.set_index(frame.columns[0])
+
+
+def _read_pandas(path: str, columns: List[str], time_format: Optional[str]) -> pd.DataFrame:
+    dtype = {column: COLUMN_DTYPES.get(column, "float64") for column in columns[1:]}
+    iso = time_format is not None and time_format.startswith("%Y-%m-%d")
+    frame = pd.read_csv(path, dtype=dtype, index_col=0, parse_dates=[0], engine="c",
+                        date_format="ISO8601" if iso else time_format)
+
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        frame.index = pd.to_datetime(frame.index, format=time_format, utc=True)
+    return frame
+
+
+def read_bar_csv(path: str, engine: Optional[str] = None) -> pd.DataFrame:
+    columns, first = _read_header(path)
+    time_format = sniff_time_format(first)
+    has_offset = time_format is not None and time_format.endswith("%z")
+
+    if engine is None:
+        engine = "pyarrow" if arrow_csv_available() and time_format is not None else "c"
+
+    if engine == "pyarrow":
+        try:
+            frame = _read_arrow(path, columns, has_offset)
+        except Exception:
+            frame = _read_pandas(path, columns, time_format)
+    else:
+        try:
+            frame = _read_pandas(path, columns, time_format)
+        except (ValueError, OverflowError):
+            frame = pd.read_csv(path, index_col=0)
+            frame.index = pd.to_datetime(frame.index, utc=has_offset)
+
+    if "Volume" in frame.columns and frame["Volume"].dtype != np.int64:
+        frame["Volume"] = frame["Volume"].fillna(0).astype(np.int64)
+    return _finish(frame, columns[0])
+
+
+def symbol_from_path(path: str) -> str:
+    name = os.path.splitext(os.path.basename(path))[0]
+    return re.split(r"[_\s.]", name, maxsplit=1)[0].upper()
+
+
+def _store_frame(store: BarStore, symbol: str, interval: str, frame: pd.DataFrame, raw_prices: bool) -> int:
+    if interval not in RAW_INTERVALS or raw_prices:
+        return store.append(symbol, interval, frame)
+
+    # 日线按未复权价格存储: 有 Adj Close 列的是 auto_adjust=False 的导出，否则价格已按分红拆股复权
+    if "Dividends" in frame.columns or "Stock Splits" in frame.columns:
+        if "Adj Close" not in frame.columns and "Dividends" in frame.columns:
+            from corporate_actions import remove_dividend_adjustment
+
+            frame = remove_dividend_adjustment(frame)
+        return store.append_raw(symbol, interval, frame)
+
+    raise ValueError("缺少 Dividends/Stock Splits 列，无法判断价格是否已复权 (未复权数据请使用 --raw-prices)")
+
+
+def _import_file(args: Tuple[str, str, str, Optional[str], Optional[str], bool]) -> Tuple[str, str, int, Optional[str]]:
+    path, root, interval, engine, validation, raw_prices = args
+    symbol = symbol_from_path(path)
+    try:
+        frame = read_bar_csv(path, engine)
+        if validation is not None:
+            frame, _ = validate_frame(frame, validation, symbol)
+        return path, symbol, _store_frame(BarStore(root), symbol, interval, frame, raw_prices), None
+    except Exception as e:
+        return path, symbol, 0, f"导入CSV时出错: {str(e)}"
+
+
+def collect_csv_files(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*.csv"), recursive=True)))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def import_csv_files(paths: List[str], root: str = DEFAULT_STORE_DIR, interval: str = "1d",
+                     workers: Optional[int] = None, engine: Optional[str] = None,
+                     validation: Optional[str] = "repair",
+                     raw_prices: bool = False) -> List[Tuple[str, str, int, Optional[str]]]:
+    tasks = [(path, root, interval, engine, validation, raw_prices) for path in collect_csv_files(paths)]
+    workers = min(workers or os.cpu_count() or 1, max(1, len(tasks)))
+    if workers == 1:
+        return [_import_file(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_import_file, tasks))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 将CSV格式的K线数据批量导入本地存储")
+    parser.add_argument("paths", nargs="+", help="CSV文件或目录 (目录下所有 .csv 文件)")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="数据存储目录")
+    parser.add_argument("--interval", default="1d", help="数据间隔")
+    parser.add_argument("--engine", choices=("pyarrow", "c"), default=None, help="CSV解析引擎 (默认: 安装了 pyarrow 时使用 pyarrow)")
+    parser.add_argument("--validation", choices=POLICIES + ("none",), default="repair",
+                        help="数据校验策略: repair 修复, flag 只记录, drop 删除问题K线, none 不校验")
+    parser.add_argument("--raw-prices", action="store_true", help="CSV中是未复权价格 (没有 Dividends/Stock Splits 列的日线数据需要指定)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="并行进程数 (默认: CPU核数)")
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    results = import_csv_files(args.paths, args.store, args.interval, args.workers, args.engine,
+                               None if args.validation == "none" else args.validation, args.raw_prices)
+    if not results:
+        parser.error("没有找到CSV文件")
+
+    failures = [(path, error) for path, _, _, error in results if error]
+    rows = sum(count for _, _, count, _ in results)
+    for path, symbol, count, error in results:
+        print(f"  ✓ {symbol}: {count} 行 ({path})" if error is None else f"  ✗ {path}: {error}")
+    print(f"\n完成 {len(results) - len(failures)}/{len(results)} 个文件, 共 {rows} 行, 用时 {time.time() - start:.1f} 秒")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
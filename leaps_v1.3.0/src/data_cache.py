@@ -0,0 +1,130 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def estimate_bytes(value, seen: Optional[set] = None) -> int:
+    # 指标序列与K线共用同一个索引对象，索引只计一次
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if hasattr(value, "memory_usage") and hasattr(value, "index") and hasattr(value.index, "memory_usage"):
+        usage = value.memory_usage(index=False, deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage) + estimate_bytes(value.index, seen)
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True))
+    if isinstance(getattr(value, "nbytes", None), int):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k, seen) + estimate_bytes(v, seen) for k, v in value.items())
+    if isinstance(value, list) and value:
+        # 买卖信号列表的元素结构相同，按第一项估算
+        return sys.getsizeof(value) + len(value) * estimate_bytes(value[0], set())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(item, seen) for item in value)
+    return sys.getsizeof(value)
+
+
+class BarCache:
+    def __init__(self, max_age: Optional[float] = 900, metrics=None, max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        self.max_age = max_age
+        self.metrics = metrics
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(symbol: str, period: str, interval: str) -> Tuple[str, str, str]:
+        return (symbol.upper(), period, interval)
+
+    def get(self, symbol: str, period: str, interval: str, record: bool = True) -> Optional[Dict]:
+        key = self.make_key(symbol, period, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.max_age is not None and time.time() - entry["fetched_at"] > self.max_age:
+                self._remove_locked(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        # 只在一次查询的入口 (FetchScheduler.request) 计入命中率，内部的查看不重复计数
+        if record and self.metrics is not None:
+            self.metrics.record_cache(entry is not None)
+        return entry
+
+    def put(self, symbol: str, period: str, interval: str, data, indicators: Optional[Dict] = None) -> Dict:
+        key = self.make_key(symbol, period, interval)
+        entry = {
+            "symbol": key[0],
+            "period": period,
+            "interval": interval,
+            "data": data,
+            "indicators": indicators,
+            "fetched_at": time.time()
+        }
+        entry["bytes"] = estimate_bytes((data, indicators))
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = entry
+            self.used_bytes += entry["bytes"]
+            self._evict_locked()
+        return entry
+
+    def set_indicators(self, symbol: str, period: str, interval: str, data, indicators: Optional[Dict]) -> bool:
+        key = self.make_key(symbol, period, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["data"] is not data:
+                return False
+            entry["indicators"] = indicators
+            size = estimate_bytes((data, indicators))
+            self.used_bytes += size - entry["bytes"]
+            entry["bytes"] = size
+            self._evict_locked()
+            return True
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.used_bytes -= entry["bytes"]
+
+    def _evict_locked(self):
+        # 按最近最少使用淘汰，最新的一项即使超出预算也保留
+        while self.max_bytes is not None and self.used_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove_locked(next(iter(self._entries)))
+            self.evictions += 1
+
+    def resize(self, max_bytes: Optional[int]):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict_locked()
+
+    def contains(self, symbol: str, period: str, interval: str) -> bool:
+        return self.get(symbol, period, interval, record=False) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "used_bytes": self.used_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
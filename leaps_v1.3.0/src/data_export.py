@@ -0,0 +1,118 @@
+import os
+import threading
+import pandas as pd
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".xlsx": "excel"
+}
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+Frames = Union[pd.DataFrame, Iterable[Tuple[str, pd.DataFrame]]]
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def detect_format(path: str) -> str:
+    return EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError:
+        raise ImportError("导出 Parquet/Feather 格式需要安装 pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def iter_chunks(frames: Frames, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    if isinstance(frames, pd.DataFrame):
+        for start in range(0, len(frames), chunk_rows):
+            yield frames.iloc[start:start + chunk_rows]
+        return
+
+    for symbol, frame in frames:
+        for start in range(0, len(frame), chunk_rows):
+            chunk = frame.iloc[start:start + chunk_rows]
+            yield chunk.assign(Symbol=symbol)[["Symbol"] + list(frame.columns)]
+
+
+class _CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self.file, header=self.header)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class _ArrowWriter:
+    def __init__(self, path, fmt):
+        self.pa = _require_pyarrow()
+        self.path = path
+        self.fmt = fmt
+        self.schema = None
+        self.writer = None
+
+    def write(self, chunk):
+        table = self.pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=True)
+        if self.writer is None:
+            self.schema = table.schema
+            if self.fmt == "parquet":
+                self.writer = self.pa.parquet.ParquetWriter(self.path, self.schema)
+            else:
+                self.writer = self.pa.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def export_frames(frames: Frames, path: str, fmt: Optional[str] = None,
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS, total_rows: Optional[int] = None,
+                  progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                  cancel_event: Optional[threading.Event] = None) -> int:
+    fmt = fmt or detect_format(path)
+    if total_rows is None and isinstance(frames, pd.DataFrame):
+        total_rows = len(frames)
+
+    if fmt == "excel":
+        frame = frames if isinstance(frames, pd.DataFrame) else pd.concat(list(iter_chunks(frames, chunk_rows)))
+        frame.to_excel(path)
+        if progress is not None:
+            progress(len(frame), len(frame))
+        return len(frame)
+
+    writer = _CsvWriter(path) if fmt == "csv" else _ArrowWriter(path, fmt)
+    rows = 0
+    try:
+        for chunk in iter_chunks(frames, chunk_rows):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            writer.write(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows, total_rows)
+    except BaseException:
+        writer.close()
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    writer.close()
+    return rows
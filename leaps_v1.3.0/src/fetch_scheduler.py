@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict
+
+
+class FetchScheduler:
+    def __init__(self, fetcher, cache, max_workers: int = 4):
+        self.fetcher = fetcher
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="leaps-fetch")
+        self._in_flight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def request(self, symbol: str, period: str, interval: str, signal_window: int = 20,
+                force: bool = False) -> Future:
+        key = self.cache.make_key(symbol, period, interval)
+
+        if not force:
+            entry = self.cache.get(symbol, period, interval)
+            if entry is not None:
+                future = Future()
+                future.set_result(entry)
+                return future
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._executor.submit(self._fetch, key, signal_window)
+                self._in_flight[key] = future
+            return future
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch(self, key: tuple, signal_window: int) -> Dict:
+        import pandas as pd
+        from indicators import compute_indicators
+
+        symbol, period, interval = key
+        try:
+            data = self.fetcher.get_historical_data(symbol, period, interval)
+
+            if isinstance(data, dict) and "error" in data:
+                return data
+            if not isinstance(data, pd.DataFrame) or data.empty:
+                return {"error": f"无法获取股票 {symbol} 的历史数据"}
+
+            indicators = compute_indicators(data, signal_window)
+            return self.cache.put(symbol, period, interval, data, indicators)
+
+        except Exception as e:
+            return {"error": f"获取历史数据时出错: {str(e)}"}
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
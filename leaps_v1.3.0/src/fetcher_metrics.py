@@ -0,0 +1,291 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+INSTRUMENTED_METHODS = (
+    "get_stock_info",
+    "get_realtime_price",
+    "get_historical_data",
+    "get_bars_since",
+    "get_bars_range",
+    "get_corporate_actions",
+    "get_financial_data",
+    "get_stock_news",
+    "search_stocks",
+    "validate_symbol",
+    "get_stock_summary"
+)
+
+RATE_LIMIT_MARKERS = ("429", "too many requests", "rate limit")
+
+
+def is_error_result(result) -> Optional[str]:
+    if isinstance(result, dict) and "error" in result:
+        return str(result["error"])
+    if isinstance(result, list) and result and isinstance(result[0], dict) and "error" in result[0]:
+        return str(result[0]["error"])
+    return None
+
+
+def is_rate_limited(message: str) -> bool:
+    message = message.lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def estimate_result_bytes(result) -> int:
+    if hasattr(result, "dtypes") and hasattr(result, "index"):
+        return len(result) * (8 + sum(dtype.itemsize for dtype in result.dtypes))
+    if isinstance(result, (dict, list)):
+        return len(repr(result).encode("utf-8"))
+    return 0
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> List[int]:
+        result = []
+        seen = 0
+        for count in self.counts:
+            seen += count
+            result.append(seen)
+        return result
+
+
+class FetcherMetrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._depth = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency: Dict[str, LatencyHistogram] = {}
+            self.calls: Dict[str, int] = {}
+            self.errors: Dict[str, int] = {}
+            self.rate_limited: Dict[str, int] = {}
+            self.bytes: Dict[str, int] = {}
+            self.totals = {"calls": 0, "errors": 0, "rate_limited": 0, "bytes": 0}
+            self.upstream_calls = 0
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.started_at = time.time()
+
+    def observe(self, method: str, seconds: float, result_bytes: int = 0, error: Optional[str] = None,
+                nested: bool = False):
+        limited = error is not None and is_rate_limited(error)
+        with self._lock:
+            histogram = self.latency.get(method)
+            if histogram is None:
+                histogram = self.latency[method] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self.bytes[method] = self.bytes.get(method, 0) + result_bytes
+            if error is not None:
+                self.errors[method] = self.errors.get(method, 0) + 1
+                if limited:
+                    self.rate_limited[method] = self.rate_limited.get(method, 0) + 1
+
+            # get_stock_summary 等方法内部调用的其他方法只计入各自的统计，不重复计入总数
+            if not nested:
+                self.totals["calls"] += 1
+                self.totals["bytes"] += result_bytes
+                self.totals["errors"] += error is not None
+                self.totals["rate_limited"] += limited
+
+    def record_upstream(self):
+        with self._lock:
+            self.upstream_calls += 1
+
+    def record_cache(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def wrap(self, method: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def instrumented(*args, **kwargs):
+            depth = getattr(self._depth, "value", 0)
+            self._depth.value = depth + 1
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.observe(method, time.perf_counter() - start, error=str(e), nested=depth > 0)
+                raise
+            finally:
+                self._depth.value = depth
+            self.observe(method, time.perf_counter() - start, estimate_result_bytes(result), is_error_result(result),
+                         nested=depth > 0)
+            return result
+
+        return instrumented
+
+    def instrument(self, fetcher):
+        for name in INSTRUMENTED_METHODS:
+            if hasattr(fetcher, name):
+                setattr(fetcher, name, self.wrap(name, getattr(fetcher, name)))
+
+        ticker = fetcher._ticker
+
+        @functools.wraps(ticker)
+        def counted_ticker(symbol):
+            self.record_upstream()
+            return ticker(symbol)
+
+        fetcher._ticker = counted_ticker
+        return fetcher
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            methods = {}
+            for name, histogram in self.latency.items():
+                methods[name] = {
+                    "calls": self.calls.get(name, 0),
+                    "errors": self.errors.get(name, 0),
+                    "rate_limited": self.rate_limited.get(name, 0),
+                    "bytes": self.bytes.get(name, 0),
+                    "mean_ms": round(histogram.total / histogram.count * 1000, 2) if histogram.count else None,
+                    "p50_ms": self._bound_ms(histogram.quantile(0.5)),
+                    "p95_ms": self._bound_ms(histogram.quantile(0.95)),
+                    "p99_ms": self._bound_ms(histogram.quantile(0.99))
+                }
+
+            return {
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "upstream_calls": self.upstream_calls,
+                "calls": self.totals["calls"],
+                "errors": self.totals["errors"],
+                "rate_limited": self.totals["rate_limited"],
+                "bytes": self.totals["bytes"],
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "cache_hit_ratio": round(self.cache_hits / lookups, 4) if lookups else None,
+                "methods": methods
+            }
+
+    @staticmethod
+    def _bound_ms(seconds: Optional[float]):
+        if seconds is None:
+            return None
+        return seconds * 1000 if seconds != float("inf") else "inf"
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append("# HELP leaps_fetch_duration_seconds Fetcher method latency.")
+            lines.append("# TYPE leaps_fetch_duration_seconds histogram")
+            for name, histogram in sorted(self.latency.items()):
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.cumulative()):
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'leaps_fetch_duration_seconds_bucket{{method="{name}",le="{le}"}} {count}')
+                lines.append(f'leaps_fetch_duration_seconds_sum{{method="{name}"}} {histogram.total:.6f}')
+                lines.append(f'leaps_fetch_duration_seconds_count{{method="{name}"}} {histogram.count}')
+
+            for metric, help_text, values in (
+                ("leaps_fetch_errors_total", "Fetcher calls that returned an error.", self.errors),
+                ("leaps_fetch_rate_limited_total", "Fetcher calls rejected by upstream rate limiting.", self.rate_limited),
+                ("leaps_fetch_bytes_total", "Approximate bytes returned by fetcher calls.", self.bytes)
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name in sorted(self.latency):
+                    lines.append(f'{metric}{{method="{name}"}} {values.get(name, 0)}')
+
+            for metric, help_text, value in (
+                ("leaps_upstream_calls_total", "Ticker objects created for upstream requests.", self.upstream_calls),
+                ("leaps_cache_hits_total", "Bar cache lookups served from memory.", self.cache_hits),
+                ("leaps_cache_misses_total", "Bar cache lookups that missed.", self.cache_misses)
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def start_file_exporter(self, path: str, interval: float = 15) -> threading.Event:
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.write_prometheus(path)
+                except OSError:
+                    pass
+
+        threading.Thread(target=run, daemon=True).start()
+        return stop
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def metrics_from_env(environ=os.environ) -> Optional[FetcherMetrics]:
+    path = environ.get("LEAPS_METRICS_FILE")
+    port = environ.get("LEAPS_METRICS_PORT")
+    if not path and not port and environ.get("LEAPS_METRICS") != "1":
+        return None
+
+    metrics = FetcherMetrics()
+    if path:
+        metrics.start_file_exporter(path)
+    if port:
+        metrics.serve(int(port))
+    return metrics
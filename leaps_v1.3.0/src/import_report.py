@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENTRY_POINTS = ["stock_viewer_gui", "simple_chart", "nasdaq_stock_fetcher"]
+
+DEFAULT_BUDGET_MS = 150
+
+
+def measure_imports(module: str, python: str = sys.executable) -> List[Dict]:
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=SRC_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr.strip()}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue
+
+        name = parts[2].rstrip()
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_us": self_us,
+            "cumulative_us": cumulative_us
+        })
+
+    return rows
+
+
+def summarize(module: str, rows: List[Dict], top: int = 10) -> Dict:
+    total_us = next((row["cumulative_us"] for row in rows if row["module"] == module and row["depth"] == 0), 0)
+
+    packages = defaultdict(int)
+    for row in rows:
+        packages[row["module"].split(".")[0]] += row["self_us"]
+
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "modules_loaded": len(rows),
+        "top_packages": [
+            {"package": name, "self_ms": round(us / 1000, 1)}
+            for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ]
+    }
+
+
+def build_report(modules: List[str], repeat: int = 3, top: int = 10) -> List[Dict]:
+    report = []
+    for module in modules:
+        runs = [summarize(module, measure_imports(module), top) for _ in range(repeat)]
+        report.append(min(runs, key=lambda run: run["total_ms"]))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 启动导入耗时报告")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="要测量的模块 (默认: 各入口模块)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="每个模块的导入耗时预算 (毫秒)")
+    parser.add_argument("--repeat", type=int, default=3, help="重复测量次数，取最小值")
+    parser.add_argument("--top", type=int, default=10, help="显示耗时最多的前N个包")
+    parser.add_argument("--json", dest="json_path", help="将报告写入JSON文件")
+    args = parser.parse_args(argv)
+
+    report = build_report(args.modules, args.repeat, args.top)
+    over_budget = False
+
+    for entry in report:
+        status = "✓" if entry["total_ms"] <= args.budget_ms else "✗ 超出预算"
+        over_budget |= entry["total_ms"] > args.budget_ms
+
+        print(f"\n{entry['module']}: {entry['total_ms']:.1f} ms "
+              f"(预算 {args.budget_ms:.0f} ms, {entry['modules_loaded']} 个模块) {status}")
+        for package in entry["top_packages"]:
+            print(f"  {package['package']:<30} {package['self_ms']:>8.1f} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": args.budget_ms, "entries": report}, f, indent=2, ensure_ascii=False)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
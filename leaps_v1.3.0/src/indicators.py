@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+
+SIGNAL_PERIODS = ('1mo', '3mo', '6mo', '1y')
+
+MA_WINDOWS = (20, 50, 200)
+
+
+def signal_window(period: str, end=None) -> int:
+    from trading_calendar import period_bars
+
+    return period_bars(period if period in SIGNAL_PERIODS else '1mo', '1d', end)
+
+
+def compute_moving_averages(close: pd.Series, windows=MA_WINDOWS) -> Dict[int, pd.Series]:
+    return {window: close.rolling(window=window).mean() for window in windows}
+
+
+def compute_bollinger_bands(close: pd.Series, window: int = 20, num_std: float = 2) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    ma = close.rolling(window=window).mean()
+    std = close.rolling(window=window).std()
+    return ma, ma + (std * num_std), ma - (std * num_std)
+
+
+def compute_emas(close: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    return close.ewm(span=12, adjust=False).mean(), close.ewm(span=26, adjust=False).mean()
+
+
+def compute_macd(close: pd.Series, emas: Optional[Tuple[pd.Series, pd.Series]] = None) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    ema12, ema26 = emas if emas is not None else compute_emas(close)
+    macd_line = ema12 - ema26
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    histogram = macd_line - signal_line
+    return macd_line, signal_line, histogram
+
+
+def detect_signals(hist: pd.DataFrame, window: int, macd_line: Optional[pd.Series] = None) -> Tuple[list, list]:
+    if len(hist) < window:
+        return [], []
+
+    if macd_line is None:
+        macd_line = compute_macd(hist['Close'])[0]
+
+    prev_rolling_high = hist['High'].rolling(window=window).max().shift(1)
+    prev_rolling_low = hist['Low'].rolling(window=window).min().shift(1)
+
+    buy_mask = ((hist['High'] > prev_rolling_high) & (macd_line > 0)).to_numpy(copy=True)
+    sell_mask = ((hist['Low'] < prev_rolling_low) & (macd_line < 0)).to_numpy(copy=True)
+    buy_mask[:window] = False
+    sell_mask[:window] = False
+
+    buy_signals = list(zip(hist.index[buy_mask], hist['High'].to_numpy()[buy_mask]))
+    sell_signals = list(zip(hist.index[sell_mask], hist['Low'].to_numpy()[sell_mask]))
+    return buy_signals, sell_signals
+
+
+def compute_indicators(hist: pd.DataFrame, signal_window: int = 20) -> Dict:
+    close = hist['Close']
+    emas = compute_emas(close)
+    macd_line, signal_line, histogram = compute_macd(close, emas)
+    buy_signals, sell_signals = detect_signals(hist, signal_window, macd_line)
+
+    return {
+        "moving_averages": compute_moving_averages(close),
+        "bollinger": compute_bollinger_bands(close),
+        "ema": emas,
+        "macd": (macd_line, signal_line, histogram),
+        "signal_window": signal_window,
+        "signals": (buy_signals, sell_signals)
+    }
+
+
+def compute_summary_stats(hist: pd.DataFrame) -> Dict:
+    close = hist['Close']
+    volume = hist['Volume']
+    daily_returns = close.pct_change()
+
+    return {
+        "start": hist.index[0],
+        "end": hist.index[-1],
+        "bars": len(hist),
+        "last_close": close.iloc[-1],
+        "high": hist['High'].max(),
+        "low": hist['Low'].min(),
+        "change_pct": (close.iloc[-1] - close.iloc[0]) / close.iloc[0] * 100,
+        "avg_volume": volume.mean(),
+        "max_volume": volume.max(),
+        "mean_return_pct": daily_returns.mean() * 100,
+        "max_return_pct": daily_returns.max() * 100,
+        "min_return_pct": daily_returns.min() * 100,
+        "annual_volatility_pct": daily_returns.std() * (252 ** 0.5) * 100
+    }
+
+
+def _continue_ema(previous: float, values: np.ndarray, span: int) -> np.ndarray:
+    seeded = np.concatenate(([previous], values))
+    return pd.Series(seeded).ewm(span=span, adjust=False).mean().to_numpy()[1:]
+
+
+def _splice(old: pd.Series, index: pd.Index, start_pos: int, tail) -> pd.Series:
+    values = np.concatenate((old.to_numpy()[:start_pos], np.asarray(tail, dtype=float)))
+    return pd.Series(values, index=index, name=old.name)
+
+
+def _rolling_tail(close: pd.Series, start_pos: int, window: int, how: str) -> np.ndarray:
+    context = close.iloc[max(0, start_pos - window + 1):]
+    rolled = getattr(context.rolling(window=window), how)()
+    return rolled.to_numpy()[len(context) - (len(close) - start_pos):]
+
+
+def update_indicators(indicators: Optional[Dict], hist: pd.DataFrame, start_pos: int,
+                      signal_window: int = 20) -> Dict:
+    if (indicators is None or "ema" not in indicators or start_pos <= 0
+            or start_pos > len(indicators["ema"][0]) or start_pos - signal_window < 0):
+        return compute_indicators(hist, signal_window)
+
+    close = hist['Close']
+    index = hist.index
+    new_close = close.to_numpy()[start_pos:]
+
+    old_ema12, old_ema26 = indicators["ema"]
+    ema12 = _splice(old_ema12, index, start_pos, _continue_ema(old_ema12.iloc[start_pos - 1], new_close, 12))
+    ema26 = _splice(old_ema26, index, start_pos, _continue_ema(old_ema26.iloc[start_pos - 1], new_close, 26))
+
+    old_macd, old_signal, old_histogram = indicators["macd"]
+    macd_line = ema12 - ema26
+    signal_tail = _continue_ema(old_signal.iloc[start_pos - 1], macd_line.to_numpy()[start_pos:], 9)
+    signal_line = _splice(old_signal, index, start_pos, signal_tail)
+    histogram = macd_line - signal_line
+
+    moving_averages = {
+        window: _splice(ma, index, start_pos, _rolling_tail(close, start_pos, window, "mean"))
+        for window, ma in indicators["moving_averages"].items()
+    }
+
+    old_ma, old_upper, old_lower = indicators["bollinger"]
+    window = 20
+    ma_tail = _rolling_tail(close, start_pos, window, "mean")
+    std_tail = _rolling_tail(close, start_pos, window, "std")
+    bollinger = (
+        _splice(old_ma, index, start_pos, ma_tail),
+        _splice(old_upper, index, start_pos, ma_tail + std_tail * 2),
+        _splice(old_lower, index, start_pos, ma_tail - std_tail * 2)
+    )
+
+    if indicators.get("signal_window") == signal_window:
+        first_changed = index[start_pos]
+        context = start_pos - signal_window
+        new_buy, new_sell = detect_signals(hist.iloc[context:], signal_window, macd_line.iloc[context:])
+        old_buy, old_sell = indicators["signals"]
+        signals = (
+            [s for s in old_buy if s[0] < first_changed] + new_buy,
+            [s for s in old_sell if s[0] < first_changed] + new_sell
+        )
+    else:
+        signals = detect_signals(hist, signal_window, macd_line)
+
+    return {
+        "moving_averages": moving_averages,
+        "bollinger": bollinger,
+        "ema": (ema12, ema26),
+        "macd": (macd_line, signal_line, histogram),
+        "signal_window": signal_window,
+        "signals": signals
+    }
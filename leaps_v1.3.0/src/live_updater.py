@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    # 节假日休市，提前收盘日13:00收盘
+    from trading_calendar import is_market_open as calendar_market_open
+
+    return calendar_market_open(now)
+
+
+def append_bars(hist: pd.DataFrame, new_bars: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[int]]:
+    import pandas as pd
+
+    if new_bars is None or new_bars.empty:
+        return hist, None
+
+    new_bars = new_bars[new_bars.index >= hist.index[-1]]
+    if new_bars.empty:
+        return hist, None
+
+    new_bars = new_bars[~new_bars.index.duplicated(keep='last')].reindex(columns=hist.columns)
+    start_pos = int(hist.index.searchsorted(new_bars.index[0]))
+
+    if start_pos == len(hist) - 1 and len(new_bars) == 1 and new_bars.iloc[0].equals(hist.iloc[-1]):
+        return hist, None
+
+    return pd.concat([hist.iloc[:start_pos], new_bars]), start_pos
+
+
+class LiveUpdater:
+    def __init__(self, fetcher, refresh_seconds: float = 60, closed_backoff_max: float = 1800):
+        self.fetcher = fetcher
+        self.refresh_seconds = refresh_seconds
+        self.closed_backoff_max = closed_backoff_max
+        self._backoff = refresh_seconds
+
+    def next_delay(self, now: Optional[datetime] = None) -> float:
+        if is_market_open(now):
+            self._backoff = self.refresh_seconds
+            return self.refresh_seconds
+
+        self._backoff = min(self._backoff * 2, self.closed_backoff_max)
+        return self._backoff
+
+    def poll(self, symbol: str, interval: str, hist: pd.DataFrame, indicators: Optional[Dict],
+             signal_window: int = 20) -> Tuple[pd.DataFrame, Optional[Dict], bool]:
+        from indicators import update_indicators
+
+        new_bars = self.fetcher.get_bars_since(symbol, hist.index[-1].to_pydatetime(), interval)
+
+        if isinstance(new_bars, dict):
+            return hist, indicators, False
+
+        merged, start_pos = append_bars(hist, new_bars)
+        if start_pos is None:
+            return hist, indicators, False
+
+        return merged, update_indicators(indicators, merged, start_pos, signal_window), True
@@ -0,0 +1,131 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from data_cache import BarCache
+from fetch_scheduler import FetchScheduler
+from fetcher_metrics import FetcherMetrics, is_rate_limited
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+from yahoo_stub_server import StubConfig, server_url, start_stub_server
+
+
+DEFAULT_SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "AMD", "NFLX", "ADBE"]
+
+
+def run_load(base_url: str, symbols: List[str], concurrency: int = 8, duration: float = 10,
+             period: str = "1mo", interval: str = "1d", mode: str = "direct",
+             cache_seconds: float = 5, seed: Optional[int] = None) -> Dict:
+    metrics = FetcherMetrics()
+    fetcher = NasdaqStockFetcher(base_url=base_url, metrics=metrics)
+    scheduler = None
+    if mode == "scheduler":
+        scheduler = FetchScheduler(fetcher, BarCache(max_age=cache_seconds, metrics=metrics), max_workers=concurrency)
+
+    latencies = [[] for _ in range(concurrency)]
+    failures = [{"errors": 0, "rate_limited": 0} for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+
+    def worker(slot: int):
+        rng = random.Random(None if seed is None else seed + slot)
+        while time.perf_counter() < deadline:
+            symbol = rng.choice(symbols)
+            start = time.perf_counter()
+            if scheduler is not None:
+                result = scheduler.request(symbol, period, interval).result()
+            else:
+                result = fetcher.get_historical_data(symbol, period, interval)
+            latencies[slot].append(time.perf_counter() - start)
+
+            if isinstance(result, dict) and "error" in result:
+                failures[slot]["errors"] += 1
+                if is_rate_limited(result["error"]):
+                    failures[slot]["rate_limited"] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if scheduler is not None:
+        scheduler.shutdown()
+
+    samples = np.concatenate([np.asarray(values) for values in latencies]) * 1000 if any(latencies) else np.zeros(0)
+    stats = metrics.get_stats()
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) if len(samples) else (0, 0, 0)
+
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "duration_seconds": round(elapsed, 2),
+        "requests": int(len(samples)),
+        "requests_per_sec": round(len(samples) / elapsed, 1) if elapsed > 0 else 0,
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(samples.max()), 2) if len(samples) else 0,
+        "errors": sum(item["errors"] for item in failures),
+        "rate_limited": sum(item["rate_limited"] for item in failures),
+        "upstream_calls": stats["upstream_calls"],
+        "cache_hit_ratio": stats["cache_hit_ratio"]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 数据获取压力测试")
+    parser.add_argument("--base-url", help="行情服务地址 (默认: 启动内置模拟服务)")
+    parser.add_argument("--symbols", default=",".join(DEFAULT_SYMBOLS), help="股票代码，逗号分隔")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="并发线程数")
+    parser.add_argument("-d", "--duration", type=float, default=10, help="持续时间 (秒)")
+    parser.add_argument("--period", default="1mo", help="时间周期")
+    parser.add_argument("--interval", default="1d", help="数据间隔")
+    parser.add_argument("--mode", default="direct", choices=("direct", "scheduler"),
+                        help="direct: 直接调用获取器; scheduler: 经过缓存与请求合并")
+    parser.add_argument("--cache-seconds", type=float, default=5, help="scheduler 模式下的缓存有效期")
+    parser.add_argument("--latency-ms", type=float, default=20, help="内置模拟服务的平均延迟")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="内置模拟服务的延迟抖动")
+    parser.add_argument("--error-rate", type=float, default=0, help="内置模拟服务的500错误率")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="内置模拟服务随机返回429的概率")
+    parser.add_argument("--max-rps", type=float, default=None, help="内置模拟服务的限流阈值 (请求/秒)")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    parser.add_argument("--json", dest="json_path", help="将结果写入JSON文件")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate, args.max_rps, args.seed)
+        server = start_stub_server(config=config)
+        base_url = server_url(server)
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    try:
+        result = run_load(base_url, symbols, args.concurrency, args.duration, args.period, args.interval,
+                          args.mode, args.cache_seconds, args.seed)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print(f"目标: {base_url}  模式: {result['mode']}  并发: {result['concurrency']}")
+    print(f"请求数: {result['requests']}  吞吐: {result['requests_per_sec']} 请求/秒")
+    print(f"延迟: p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  最大 {result['max_ms']} ms")
+    print(f"错误: {result['errors']} (其中限流 {result['rate_limited']})  上游请求: {result['upstream_calls']}  "
+          f"缓存命中率: {result['cache_hit_ratio'] if result['cache_hit_ratio'] is not None else 'N/A'}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
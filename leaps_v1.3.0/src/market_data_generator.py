@@ -0,0 +1,206 @@
+import argparse
+import os
+import sys
+import time
+import zlib
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from trading_calendar import INTRADAY_MINUTES, MARKET_TZ, SESSION_MINUTES, recent_bar_times
+
+
+TRADING_DAYS = 252
+
+INTERVAL_DAYS = {"1d": 1, "5d": 5, "1wk": 5, "1mo": 21, "3mo": 63}
+
+BASE_PRICES = {
+    "AAPL": 180.0, "GOOGL": 140.0, "MSFT": 380.0, "AMZN": 170.0,
+    "TSLA": 240.0, "META": 480.0, "NVDA": 880.0, "NFLX": 550.0,
+    "ADBE": 550.0, "INTC": 45.0
+}
+
+DEFAULT_DRIFT = 0.12
+
+DEFAULT_VOLATILITY = 0.3
+
+DEFAULT_DAILY_VOLUME = 3_000_000
+
+BLOCK_BARS = 1 << 18
+
+# 牛市、震荡、熊市三种状态的年化收益率和波动率
+MARKET_REGIMES = ((0.25, 0.18), (0.0, 0.25), (-0.3, 0.45))
+
+
+def symbol_seed(symbol: str) -> int:
+    return zlib.crc32(symbol.upper().encode("utf-8"))
+
+
+def base_price(symbol: str) -> float:
+    return BASE_PRICES.get(symbol.upper(), float(20 + symbol_seed(symbol) % 480))
+
+
+def interval_years(interval: str) -> float:
+    if interval in INTRADAY_MINUTES:
+        return INTRADAY_MINUTES[interval] / (SESSION_MINUTES * TRADING_DAYS)
+    return INTERVAL_DAYS.get(interval, 1) / TRADING_DAYS
+
+
+def _regime_states(rng: np.random.Generator, bars: int, count: int, regime_length: float) -> np.ndarray:
+    switches = rng.random(bars) < 1.0 / regime_length
+    steps = np.where(switches, rng.integers(1, max(count, 2), bars), 0)
+    steps[0] = rng.integers(count)
+    return np.cumsum(steps) % count
+
+
+def _scaled_exp(values: np.ndarray, scale) -> np.ndarray:
+    values = np.multiply(values, scale, dtype=np.float64)
+    return np.exp(values, out=values)
+
+
+def _simulate_block(seeds: Sequence[int], starts: np.ndarray, prices: np.ndarray, volume: np.ndarray, dt: float, drift: float,
+                    volatility: float, regimes: Optional[Sequence[Tuple[float, float]]], regime_length: float,
+                    daily_volume: float):
+    paths, _, bars = prices.shape
+
+    # 每条路径用各自的种子生成随机数，结果与同批生成的其他股票无关
+    noise = np.empty((paths, 5, bars), dtype=np.float32)
+    mu = np.full((paths, bars), drift) if regimes else drift
+    sigma = np.full((paths, bars), volatility) if regimes else volatility
+    for i, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        rng.standard_normal((5, bars), dtype=np.float32, out=noise[i])
+        if regimes:
+            states = _regime_states(rng, bars, len(regimes), regime_length)
+            mu[i] = np.asarray([r[0] for r in regimes])[states]
+            sigma[i] = np.asarray([r[1] for r in regimes])[states]
+
+    scale = np.sqrt(dt) * sigma
+    returns = noise[:, 0].astype(np.float64)
+    returns *= scale
+    returns += (mu - 0.5 * sigma ** 2) * dt
+
+    opens, high, low, close = prices[:, 0], prices[:, 1], prices[:, 2], prices[:, 3]
+    np.exp(returns, out=close)
+    np.cumprod(close, axis=1, out=close)
+    close *= starts[:, None]
+
+    opens[:, :1] = starts[:, None]
+    opens[:, 1:] = close[:, :-1]
+    opens *= _scaled_exp(noise[:, 1], 0.1 * scale)
+
+    np.maximum(opens, close, out=high)
+    high *= _scaled_exp(np.abs(noise[:, 2]), 0.5 * scale)
+    np.minimum(opens, close, out=low)
+    low *= _scaled_exp(np.abs(noise[:, 3]), -0.5 * scale)
+
+    # 波动大的K线成交量也大，除以两个随机因子的期望使平均成交量等于 daily_volume
+    np.abs(returns, out=returns)
+    returns /= scale
+    returns += 1
+    returns *= _scaled_exp(noise[:, 4], 0.4)
+    returns *= daily_volume * dt * TRADING_DAYS / ((1 + np.sqrt(2 / np.pi)) * np.exp(0.08))
+    volume[:] = returns
+
+
+def simulate(bars: int, seeds: Sequence[int], interval: str = "1d", drift: float = DEFAULT_DRIFT,
+             volatility: float = DEFAULT_VOLATILITY, start_prices: Union[float, Sequence[float]] = 100.0,
+             regimes: Optional[Sequence[Tuple[float, float]]] = None, regime_length: float = 120,
+             daily_volume: float = DEFAULT_DAILY_VOLUME) -> Dict[str, np.ndarray]:
+    paths = len(seeds)
+    prices = np.empty((paths, 4, bars))
+    volume = np.empty((paths, bars), dtype=np.int64)
+    starts = np.broadcast_to(np.asarray(start_prices, dtype=float), (paths,))
+
+    # 按块生成，让临时数组留在缓存里；千万根K线时内存分配和缺页是主要开销
+    rows = max(1, BLOCK_BARS // max(bars, 1))
+    for first in range(0, paths, rows):
+        block = slice(first, first + rows)
+        _simulate_block(seeds[block], starts[block], prices[block], volume[block], interval_years(interval), drift, volatility,
+                        regimes, regime_length, daily_volume)
+
+    return {"open": prices[:, 0], "high": prices[:, 1], "low": prices[:, 2], "close": prices[:, 3],
+            "volume": volume, "prices": prices}
+
+
+def _frame(data: Dict[str, np.ndarray], row: int, times: pd.DatetimeIndex) -> pd.DataFrame:
+    frame = pd.DataFrame(data["prices"][row].T, index=times, columns=["Open", "High", "Low", "Close"], copy=False)
+    frame["Volume"] = data["volume"][row]
+    return frame
+
+
+def _localize(times: pd.DatetimeIndex, tz: Optional[str]) -> pd.DatetimeIndex:
+    if times.tz is None:
+        return times if tz is None else times.tz_localize(tz)
+    return times.tz_convert(MARKET_TZ).tz_localize(None) if tz is None else times.tz_convert(tz)
+
+
+def generate_frame(times: pd.DatetimeIndex, seed: int, interval: str = "1d", start_price: float = 100.0,
+                   **kwargs) -> pd.DataFrame:
+    data = simulate(len(times), [seed], interval, start_prices=start_price, **kwargs)
+    return _frame(data, 0, times)
+
+
+def generate_universe(symbols: Iterable[str], bars: int = TRADING_DAYS, interval: str = "1d", end=None,
+                      tz: Optional[str] = MARKET_TZ, seed: Optional[int] = None, **kwargs) -> Dict[str, pd.DataFrame]:
+    symbols = [symbol.upper() for symbol in symbols]
+    times = _localize(recent_bar_times(bars, interval, end), tz)
+    seeds = [symbol_seed(symbol) if seed is None else seed + i for i, symbol in enumerate(symbols)]
+    kwargs.setdefault("start_prices", [base_price(symbol) for symbol in symbols])
+
+    data = simulate(len(times), seeds, interval, **kwargs)
+    return {symbol: _frame(data, i, times) for i, symbol in enumerate(symbols)}
+
+
+def generate_ohlcv(symbol: str = "AAPL", bars: int = TRADING_DAYS, interval: str = "1d", end=None,
+                   tz: Optional[str] = MARKET_TZ, seed: Optional[int] = None, start_price: Optional[float] = None,
+                   **kwargs) -> pd.DataFrame:
+    if start_price is not None:
+        kwargs["start_prices"] = start_price
+    return generate_universe([symbol], bars, interval, end, tz, seed, **kwargs)[symbol.upper()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 生成模拟K线数据 (用于测试、演示和压力测试)")
+    parser.add_argument("symbols", nargs="*", help="股票代码 (默认: 按 --count 生成 SYN0001 ...)")
+    parser.add_argument("--count", type=int, default=10, help="未指定股票代码时生成的股票数量")
+    parser.add_argument("--bars", type=int, default=TRADING_DAYS, help="每只股票的K线数量")
+    parser.add_argument("--interval", default="1d", help="数据间隔，例如 1d, 5m, 1m")
+    parser.add_argument("--drift", type=float, default=DEFAULT_DRIFT, help="年化收益率")
+    parser.add_argument("--volatility", type=float, default=DEFAULT_VOLATILITY, help="年化波动率")
+    parser.add_argument("--regimes", action="store_true", help="在牛市、震荡、熊市之间随机切换")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子 (默认: 由股票代码决定)")
+    parser.add_argument("--store", help="写入本地K线存储目录")
+    parser.add_argument("--csv-dir", help="写入CSV文件的目录")
+    args = parser.parse_args(argv)
+
+    symbols = [symbol.upper() for symbol in args.symbols] or [f"SYN{i:04d}" for i in range(1, args.count + 1)]
+    options = {"drift": args.drift, "volatility": args.volatility}
+    if args.regimes:
+        options["regimes"] = MARKET_REGIMES
+
+    start = time.time()
+    frames = generate_universe(symbols, args.bars, args.interval, seed=args.seed, **options)
+    rows = sum(len(frame) for frame in frames.values())
+    print(f"✓ 生成 {len(frames)} 只股票共 {rows:,} 根K线, 用时 {time.time() - start:.2f} 秒")
+
+    if args.store:
+        from bar_store import BarStore
+
+        store = BarStore(args.store)
+        for symbol, frame in frames.items():
+            store.append(symbol, args.interval, frame)
+        print(f"✓ 已写入 {args.store}")
+
+    if args.csv_dir:
+        os.makedirs(args.csv_dir, exist_ok=True)
+        for symbol, frame in frames.items():
+            frame.to_csv(os.path.join(args.csv_dir, f"{symbol}.csv"))
+        print(f"✓ 已写入 {args.csv_dir}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
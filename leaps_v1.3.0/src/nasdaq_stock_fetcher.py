@@ -1,16 +1,48 @@
-import yfinance as yf
-import pandas as pd
-from typing import Dict, List, Optional, Union
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from datetime import datetime, timedelta
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SEARCH_BASE_URL = "https://query1.finance.yahoo.com"
+
 
 class NasdaqStockFetcher:
-    def __init__(self):
-        pass
+    def __init__(self, ticker_factory=None, metrics=None, base_url: Optional[str] = None,
+                 service_url: Optional[str] = None):
+        self.base_url = base_url or os.environ.get("LEAPS_YAHOO_BASE_URL") or None
+        if ticker_factory is None and self.base_url:
+            from yahoo_http_client import http_ticker_factory
+            ticker_factory = http_ticker_factory(self.base_url)
+        
+        self.ticker_factory = ticker_factory
+        self.service_url = os.environ.get("LEAPS_SERVICE_URL") if service_url is None else service_url
+        self.service_client = None
+        if self.service_url:
+            from quote_client import bind_client
+            self.service_client = bind_client(self, self.service_url)
+        
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.instrument(self)
+
+    def _ticker(self, symbol: str):
+        if self.ticker_factory is not None:
+            return self.ticker_factory(symbol)
+        
+        import yfinance as yf
+        return yf.Ticker(symbol)
+
+    def get_stats(self) -> Dict:
+        return self.metrics.get_stats() if self.metrics is not None else {}
 
     def get_stock_info(self, symbol: str) -> Dict:
         try:
-            stock = yf.Ticker(symbol)
+            stock = self._ticker(symbol)
             info = stock.info
             
             if not info:
@@ -46,7 +78,7 @@ class NasdaqStockFetcher:
 
     def get_realtime_price(self, symbol: str) -> Dict:
         try:
-            stock = yf.Ticker(symbol)
+            stock = self._ticker(symbol)
             hist = stock.history(period="1d", interval="1m")
             
             if hist.empty:
@@ -66,10 +98,11 @@ class NasdaqStockFetcher:
         except Exception as e:
             return {"error": f"获取实时价格时出错: {str(e)}"}
 
-    def get_historical_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> Union[pd.DataFrame, Dict]:
+    def get_historical_data(self, symbol: str, period: str = "1y", interval: str = "1d",
+                            auto_adjust: bool = True) -> Union[pd.DataFrame, Dict]:
         try:
-            stock = yf.Ticker(symbol)
-            hist = stock.history(period=period, interval=interval)
+            stock = self._ticker(symbol)
+            hist = stock.history(period=period, interval=interval, auto_adjust=auto_adjust)
             
             if hist.empty:
                 return {"error": f"无法获取股票 {symbol} 的历史数据"}
@@ -79,9 +112,40 @@ class NasdaqStockFetcher:
         except Exception as e:
             return {"error": f"获取历史数据时出错: {str(e)}"}
 
+    def get_bars_since(self, symbol: str, start: datetime, interval: str = "1d",
+                       auto_adjust: bool = True) -> Union[pd.DataFrame, Dict]:
+        try:
+            stock = self._ticker(symbol)
+            return stock.history(start=start, interval=interval, auto_adjust=auto_adjust)
+            
+        except Exception as e:
+            return {"error": f"获取最新数据时出错: {str(e)}"}
+
+    def get_bars_range(self, symbol: str, start: datetime, end: datetime, interval: str = "1d",
+                       auto_adjust: bool = True) -> Union[pd.DataFrame, Dict]:
+        try:
+            stock = self._ticker(symbol)
+            return stock.history(start=start, end=end, interval=interval, auto_adjust=auto_adjust)
+            
+        except Exception as e:
+            return {"error": f"获取区间数据时出错: {str(e)}"}
+
+    def get_corporate_actions(self, symbol: str) -> Union[pd.DataFrame, Dict]:
+        import pandas as pd
+
+        try:
+            stock = self._ticker(symbol)
+            actions = stock.actions
+            if actions is None:
+                return pd.DataFrame({"Dividends": [], "Stock Splits": []}, index=pd.DatetimeIndex([], name="Date"))
+            return actions
+            
+        except Exception as e:
+            return {"error": f"获取分红拆股数据时出错: {str(e)}"}
+
     def get_financial_data(self, symbol: str) -> Dict:
         try:
-            stock = yf.Ticker(symbol)
+            stock = self._ticker(symbol)
             
             income_stmt = stock.income_stmt
             balance_sheet = stock.balance_sheet
@@ -101,7 +165,7 @@ class NasdaqStockFetcher:
 
     def get_stock_news(self, symbol: str, limit: int = 5) -> List[Dict]:
         try:
-            stock = yf.Ticker(symbol)
+            stock = self._ticker(symbol)
             news = stock.news
             
             if not news:
@@ -131,8 +195,8 @@ class NasdaqStockFetcher:
         try:
             import requests
             
-            url = f"https://query1.finance.yahoo.com/v1/finance/search?q={query}"
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+            url = f"{(self.base_url or SEARCH_BASE_URL).rstrip('/')}/v1/finance/search"
+            response = requests.get(url, params={'q': query}, headers={'User-Agent': 'Mozilla/5.0'})
             
             if response.status_code != 200:
                 return [{"error": "搜索失败"}]
@@ -157,7 +221,7 @@ class NasdaqStockFetcher:
 
     def validate_symbol(self, symbol: str) -> bool:
         try:
-            stock = yf.Ticker(symbol)
+            stock = self._ticker(symbol)
             info = stock.info
             return bool(info and info.get('symbol'))
         except:
@@ -165,7 +229,7 @@ class NasdaqStockFetcher:
 
     def get_stock_summary(self, symbol: str) -> Dict:
         try:
-            stock = yf.Ticker(symbol)
+            import pandas as pd
             
             price_info = self.get_realtime_price(symbol)
             basic_info = self.get_stock_info(symbol)
@@ -0,0 +1,282 @@
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bar_store import DEFAULT_STORE_DIR, MARKET_TZ, RAW_INTERVALS, BarStore, to_utc_ns
+from corporate_actions import ADJUST_MODES
+from data_export import export_frames
+from market_data_generator import interval_years
+from shared_bar_cache import SharedBarCache
+from trading_calendar import resolve_period
+
+
+DEFAULT_PERIOD = "5y"
+
+RECENT_BARS = 30
+
+REPORT_COLUMNS = [
+    "Start", "End", "Bars", "First", "Last", "High", "Low", "ChangePct", "Volume", "AvgVolume",
+    "MaxVolume", "MinVolume", "MeanReturnPct", "MaxReturnPct", "MinReturnPct", "VolatilityPct"
+]
+
+_worker = {}
+
+
+def _aggregate(frame: pd.DataFrame, codes: np.ndarray, labels: List[str], annualize: float) -> pd.DataFrame:
+    periods = pd.Categorical.from_codes(codes, categories=labels)
+    grouped = frame.assign(Period=periods).groupby(["Symbol", "Period"], sort=False, observed=True)
+    report = grouped.agg(
+        Start=("Time", "first"), End=("Time", "last"), Bars=("Close", "size"),
+        First=("Close", "first"), Last=("Close", "last"), High=("Close", "max"), Low=("Close", "min"),
+        Volume=("Volume", "sum"), AvgVolume=("Volume", "mean"), MaxVolume=("Volume", "max"), MinVolume=("Volume", "min"),
+        MeanReturnPct=("Return", "mean"), MaxReturnPct=("Return", "max"), MinReturnPct=("Return", "min"),
+        VolatilityPct=("Return", "std")
+    )
+    report["ChangePct"] = (report["Last"] - report["First"]) / report["First"] * 100
+    report[["MeanReturnPct", "MaxReturnPct", "MinReturnPct"]] *= 100
+    report["VolatilityPct"] *= annualize * 100
+    return report[REPORT_COLUMNS]
+
+
+def summarize_arrays(symbols: Sequence[str], lengths: np.ndarray, times: np.ndarray, close: np.ndarray,
+                     volume: np.ndarray, interval: str = "1d", period: str = DEFAULT_PERIOD,
+                     recent: int = RECENT_BARS) -> pd.DataFrame:
+    # 所有股票的K线首尾相接，按 (股票, 周期) 一次分组汇总
+    codes = np.repeat(np.arange(len(symbols)), lengths)
+    starts = np.cumsum(lengths) - lengths
+
+    returns = np.full(len(close), np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1
+    returns[starts[lengths > 0]] = np.nan
+
+    local = pd.DatetimeIndex(pd.to_datetime(times, unit="ns", utc=True)).tz_convert(MARKET_TZ).tz_localize(None)
+    frame = pd.DataFrame({
+        "Symbol": pd.Categorical.from_codes(codes, categories=list(symbols)),
+        "Time": local,
+        "Close": close,
+        "Volume": volume,
+        "Return": returns
+    })
+
+    annualize = math.sqrt(1 / interval_years(interval))
+    from_end = np.repeat(starts + lengths, lengths) - np.arange(len(close))
+    recent_rows = from_end <= recent
+
+    years = local.year.to_numpy()
+    first_year = int(years.min()) if len(years) else 0
+    parts = [
+        _aggregate(frame, np.zeros(len(frame), dtype=np.int8), [period], annualize),
+        _aggregate(frame[recent_rows], np.zeros(int(recent_rows.sum()), dtype=np.int8), [f"{recent}d"], annualize),
+        _aggregate(frame, years - first_year, [str(year) for year in range(first_year, int(years.max(initial=0)) + 1)], annualize)
+    ]
+    report = pd.concat(parts)
+    order = np.argsort(pd.Index(symbols).get_indexer(report.index.get_level_values("Symbol")), kind="stable")
+    return report.iloc[order]
+
+
+def summarize_frames(frames: Dict[str, pd.DataFrame], interval: str = "1d", period: str = DEFAULT_PERIOD,
+                     recent: int = RECENT_BARS) -> pd.DataFrame:
+    symbols = list(frames)
+    lengths = np.array([len(frames[symbol]) for symbol in symbols], dtype=np.int64)
+
+    def column(name):
+        return np.concatenate([frames[symbol][name].to_numpy(dtype=np.float64) for symbol in symbols]) if symbols else np.empty(0)
+
+    times = [frames[symbol].index for symbol in symbols]
+    times = [index.tz_localize(MARKET_TZ) if index.tz is None else index for index in times]
+    times = np.concatenate([index.tz_convert("UTC").as_unit("ns").asi8 for index in times]) if symbols else np.empty(0, np.int64)
+    return summarize_arrays(symbols, lengths, times, column("Close"), column("Volume"), interval, period, recent)
+
+
+def _init_worker(options: dict):
+    _worker.clear()
+    _worker.update(options)
+    _worker["store"] = BarStore(options["store"])
+
+
+def _load_bars(symbol: str) -> Optional[np.ndarray]:
+    store, cache, interval = _worker["store"], _worker["cache"], _worker["interval"]
+    if cache is None:
+        return store.query_adjusted(symbol, interval, _worker["start"], _worker["end"], _worker["adjust"])
+
+    raw = store.mapped(symbol, interval)
+    if raw is None:
+        return None
+
+    # 共享缓存保存复权后的全部K线，各进程只切片；本地数据更新后重新加载
+    mode = _worker["adjust"] if interval in RAW_INTERVALS else "none"
+    key = f"{interval}:{mode}"
+    if mode != "none":
+        # 新的分红拆股只改动 actions 文件而不改变K线，按文件修改时间区分缓存条目
+        try:
+            key += f":{os.stat(store.actions_path(symbol)).st_mtime_ns}"
+        except FileNotFoundError:
+            pass
+    bars = cache.get(symbol, key)
+    if bars is None or len(bars) != len(raw) or (len(raw) and bars["time"][-1] != raw["time"][-1]):
+        bars = cache.put(symbol, key, store.query_adjusted(symbol, interval, mode=_worker["adjust"]))
+
+    times = bars["time"]
+    lo = 0 if _worker["start"] is None else int(np.searchsorted(times, to_utc_ns(_worker["start"]), "left"))
+    hi = len(bars) if _worker["end"] is None else int(np.searchsorted(times, to_utc_ns(_worker["end"]), "right"))
+    return bars[lo:max(lo, hi)]
+
+
+def summarize_chunk(symbols: List[str]) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    loaded, records, errors = [], [], {}
+    for symbol in symbols:
+        try:
+            bars = _load_bars(symbol)
+        except Exception as e:
+            errors[symbol] = f"读取本地数据时出错: {str(e)}"
+            continue
+        if bars is None or len(bars) == 0:
+            errors[symbol] = "没有本地数据"
+            continue
+        loaded.append(symbol)
+        records.append(bars)
+
+    if not records:
+        return pd.DataFrame(columns=REPORT_COLUMNS), errors
+
+    merged = np.concatenate(records)
+    lengths = np.array([len(bars) for bars in records], dtype=np.int64)
+    report = summarize_arrays(loaded, lengths, merged["time"], merged["close"], merged["volume"].astype(np.float64),
+                              _worker["interval"], _worker["period"], _worker["recent"])
+    return report, errors
+
+
+def build_report(symbols: List[str], store_dir: str = DEFAULT_STORE_DIR, interval: str = "1d",
+                 period: str = DEFAULT_PERIOD, recent: int = RECENT_BARS, adjust: str = "all",
+                 workers: Optional[int] = None, cache: Optional[SharedBarCache] = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    start, end = (None, None) if period == "max" else resolve_period(period, interval)[:2]
+    options = {
+        "store": store_dir,
+        "cache": cache,
+        "interval": interval,
+        "period": period,
+        "recent": recent,
+        "adjust": adjust,
+        "start": start,
+        "end": end
+    }
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(symbols)))
+    size = max(1, math.ceil(len(symbols) / (workers * 4)))
+    chunks = [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+    if workers == 1:
+        _init_worker(options)
+        results = [summarize_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as executor:
+            results = list(executor.map(summarize_chunk, chunks))
+
+    errors = {}
+    for _, chunk_errors in results:
+        errors.update(chunk_errors)
+    reports = [report for report, _ in results if not report.empty]
+    return (pd.concat(reports) if reports else pd.DataFrame(columns=REPORT_COLUMNS)), errors
+
+
+def write_report(report: pd.DataFrame, path: str, title: str = "Leaps - 股票表现报告") -> int:
+    if os.path.splitext(path)[1].lower() in (".html", ".htm"):
+        table = report.to_html(float_format=lambda value: f"{value:,.2f}", border=0)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title></head>\n"
+                    f"<body><h1>{title}</h1>\n{table}\n</body></html>\n")
+        return len(report)
+    return export_frames(report, path)
+
+
+def print_symbol_report(hist: pd.DataFrame, symbol: str, period: str = DEFAULT_PERIOD, label: str = "5年"):
+    report = summarize_frames({symbol: hist}, period=period).loc[symbol]
+    total, recent = report.loc[period], report.loc[f"{RECENT_BARS}d"]
+
+    print(f"\n收盘价统计:")
+    print(f"  {label}最高价: ${total['High']:.2f}")
+    print(f"  {label}最低价: ${total['Low']:.2f}")
+    print(f"  当前价格: ${total['Last']:.2f}")
+    print(f"  {label}前价格: ${total['First']:.2f}")
+    print(f"  {label}涨幅: {total['ChangePct']:.2f}%")
+
+    print(f"\n成交量统计:")
+    print(f"  平均日成交量: {total['AvgVolume']:,.0f}")
+    print(f"  最高成交量: {total['MaxVolume']:,.0f}")
+    print(f"  最低成交量: {total['MinVolume']:,.0f}")
+
+    print(f"\n波动率统计:")
+    print(f"  平均日涨跌幅: {total['MeanReturnPct']:.3f}%")
+    print(f"  最大单日涨幅: {total['MaxReturnPct']:.2f}%")
+    print(f"  最大单日跌幅: {total['MinReturnPct']:.2f}%")
+    print(f"  年化波动率: {total['VolatilityPct']:.2f}%")
+    print(f"  近{RECENT_BARS}个交易日涨幅: {recent['ChangePct']:.2f}%")
+
+    print("\n" + "=" * 70)
+    print("年度表现")
+    print("=" * 70)
+
+    yearly = report.drop([period, f"{RECENT_BARS}d"])[["First", "Last", "High", "Low", "Volume", "ChangePct"]]
+    yearly.columns = ['年初价格', '年末价格', '最高价', '最低价', '总成交量', '年度涨幅']
+    print("\n" + yearly.round(2).to_string())
+
+    print("\n" + "=" * 70)
+    print(f"最近{RECENT_BARS}个交易日数据")
+    print("=" * 70)
+    print("\n" + hist.tail(RECENT_BARS)[['Open', 'High', 'Low', 'Close', 'Volume']].round(2).to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 多股票表现报告 (年度汇总、涨跌幅、波动率)")
+    parser.add_argument("symbols", nargs="*", help="股票代码 (默认: 本地存储中的全部股票)")
+    parser.add_argument("--universe", help="股票列表文件 (每行一个代码，或 nasdaqtraded.txt 格式)")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="数据存储目录")
+    parser.add_argument("--interval", default="1d", help="数据间隔")
+    parser.add_argument("--period", default=DEFAULT_PERIOD, help="统计周期，例如 1y, 5y, ytd, max")
+    parser.add_argument("--recent", type=int, default=RECENT_BARS, help="近期统计的K线数量")
+    parser.add_argument("--adjust", choices=ADJUST_MODES, default="all", help="复权方式")
+    parser.add_argument("-o", "--output", default="performance_report.html", help="报告文件 (.html, .csv, .parquet)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="并行进程数 (默认: CPU核数)")
+    parser.add_argument("--shared-cache", metavar="NAME", help="共享内存K线缓存名称，多个进程和多次运行共用一份数据")
+    args = parser.parse_args(argv)
+
+    symbols = [s.upper() for s in args.symbols]
+    if args.universe:
+        from bulk_ingest import load_universe
+
+        symbols += load_universe(args.universe)
+    symbols = list(dict.fromkeys(symbols)) or BarStore(args.store).symbols(args.interval)
+    if not symbols:
+        parser.error(f"本地存储中没有 {args.interval} 数据，请提供股票代码或先运行 bulk_ingest.py")
+
+    try:
+        resolve_period(args.period, args.interval)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.time()
+    cache = SharedBarCache(args.shared_cache) if args.shared_cache else None
+    try:
+        report, errors = build_report(symbols, args.store, args.interval, args.period, args.recent, args.adjust,
+                                      args.workers, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    rows = write_report(report, args.output)
+
+    for symbol, error in list(errors.items())[:20]:
+        print(f"✗ {symbol}: {error}")
+    print(f"完成: {len(symbols) - len(errors)}/{len(symbols)} 只股票, {rows} 行, 用时 {time.time() - start:.1f} 秒, "
+          f"报告: {args.output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+class PhaseProfiler:
+    def __init__(self, enabled: bool = False, max_events: int = 20000):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self.last: Dict[str, float] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._null = contextlib.nullcontext()
+
+    def phase(self, name: str, **args):
+        if not self.enabled:
+            return self._null
+        return self._record(name, args)
+
+    @contextlib.contextmanager
+    def _record(self, name: str, args: Dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident()
+            }
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            with self._lock:
+                self.events.append(event)
+                self.last[name] = (end - start) * 1000
+
+    def wrap(self, name: str, func):
+        @functools.wraps(func)
+        def profiled(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            with self._record(name, {}):
+                return func(*args, **kwargs)
+
+        return profiled
+
+    def instrument(self, obj, names: Iterable[str]):
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+        return obj
+
+    def last_timings(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        with self._lock:
+            if names is None:
+                return dict(self.last)
+            return {name: self.last[name] for name in names if name in self.last}
+
+    def summary(self) -> List[Dict]:
+        totals = {}
+        with self._lock:
+            for event in self.events:
+                stats = totals.setdefault(event["name"], {"name": event["name"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                duration = event["dur"] / 1000
+                stats["count"] += 1
+                stats["total_ms"] += duration
+                stats["max_ms"] = max(stats["max_ms"], duration)
+
+        for stats in totals.values():
+            stats["mean_ms"] = stats["total_ms"] / stats["count"]
+        return sorted(totals.values(), key=lambda stats: stats["total_ms"], reverse=True)
+
+    def forget(self, names: Iterable[str]):
+        with self._lock:
+            for name in names:
+                self.last.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.last.clear()
+
+    def write_chrome_trace(self, path: str) -> int:
+        with self._lock:
+            events = list(self.events)
+
+        thread_names = {threading.main_thread().ident: "MainThread"}
+        thread_names.update({thread.ident: thread.name for thread in threading.enumerate()})
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": thread_names[tid]}}
+            for tid in {event["tid"] for event in events} if tid in thread_names
+        ]
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return len(events)
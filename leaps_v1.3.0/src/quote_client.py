@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Union
+
+from yahoo_http_client import get_session
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+CLIENT_METHODS = (
+    "get_stock_info",
+    "get_realtime_price",
+    "get_historical_data",
+    "get_bars_since",
+    "get_bars_range",
+    "get_corporate_actions",
+    "get_financial_data",
+    "get_stock_news",
+    "search_stocks",
+    "validate_symbol"
+)
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        return False
+    return True
+
+
+def jsonable(value):
+    if isinstance(value, dict):
+        return {str(key): jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(item) for item in value]
+    if isinstance(value, float) and value != value:
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, "item"):
+        return jsonable(value.item())
+    return str(value)
+
+
+def encode_frame(frame: pd.DataFrame) -> Dict:
+    index = frame.index
+    return {
+        "index": index.as_unit("ns").asi8.tolist(),
+        "tz": str(index.tz) if index.tz is not None else None,
+        "name": index.name,
+        "columns": {
+            str(column): frame[column].astype(object).where(frame[column].notna(), None).tolist()
+            for column in frame.columns
+        }
+    }
+
+
+def decode_frame(payload: Dict) -> pd.DataFrame:
+    import pandas as pd
+
+    index = pd.to_datetime(payload["index"], unit="ns", utc=payload["tz"] is not None)
+    if payload["tz"] is not None:
+        index = index.tz_convert(payload["tz"])
+    frame = pd.DataFrame(payload["columns"], index=pd.DatetimeIndex(index, name=payload["name"]))
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
+
+
+def encode_arrow(frame: pd.DataFrame) -> bytes:
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_arrow(data: bytes) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_pandas()
+
+
+class QuoteServiceClient:
+    def __init__(self, service_url: str, timeout: float = 60, use_arrow: bool = None):
+        self.service_url = service_url.rstrip("/")
+        self.timeout = timeout
+        self.use_arrow = arrow_available() if use_arrow is None else use_arrow
+
+    def call(self, endpoint: str, **params):
+        params = {key: value.isoformat() if isinstance(value, datetime) else value
+                  for key, value in params.items() if value is not None}
+        headers = {"Accept": ARROW_MEDIA_TYPE} if self.use_arrow else {}
+        response = get_session().get(f"{self.service_url}/{endpoint}", params=params,
+                                     headers=headers, timeout=self.timeout)
+
+        if response.headers.get("Content-Type", "").startswith(ARROW_MEDIA_TYPE):
+            return decode_arrow(response.content)
+
+        payload = response.json()
+        if response.status_code != 200:
+            return {"error": payload.get("error", f"行情服务返回错误: HTTP {response.status_code}")}
+        if "frame" in payload:
+            return decode_frame(payload["frame"])
+        return payload["result"]
+
+    def _safe(self, endpoint: str, label: str, **params):
+        try:
+            return self.call(endpoint, **params)
+        except Exception as e:
+            return {"error": f"{label}时出错: {str(e)}"}
+
+    def get_stock_info(self, symbol: str) -> Dict:
+        return self._safe("info", "获取股票信息", symbol=symbol)
+
+    def get_realtime_price(self, symbol: str) -> Dict:
+        return self._safe("price", "获取实时价格", symbol=symbol)
+
+    def get_historical_data(self, symbol: str, period: str = "1y", interval: str = "1d",
+                            auto_adjust: bool = True) -> Union[pd.DataFrame, Dict]:
+        return self._safe("history", "获取历史数据", symbol=symbol, period=period, interval=interval,
+                          auto_adjust=auto_adjust)
+
+    def get_bars_since(self, symbol: str, start: datetime, interval: str = "1d",
+                       auto_adjust: bool = True) -> Union[pd.DataFrame, Dict]:
+        return self._safe("bars_since", "获取最新数据", symbol=symbol, start=start, interval=interval,
+                          auto_adjust=auto_adjust)
+
+    def get_bars_range(self, symbol: str, start: datetime, end: datetime, interval: str = "1d",
+                       auto_adjust: bool = True) -> Union[pd.DataFrame, Dict]:
+        return self._safe("bars_range", "获取区间数据", symbol=symbol, start=start, end=end, interval=interval,
+                          auto_adjust=auto_adjust)
+
+    def get_corporate_actions(self, symbol: str) -> Union[pd.DataFrame, Dict]:
+        return self._safe("actions", "获取分红拆股数据", symbol=symbol)
+
+    def get_financial_data(self, symbol: str) -> Dict:
+        return self._safe("financials", "获取财务数据", symbol=symbol)
+
+    def get_stock_news(self, symbol: str, limit: int = 5) -> List[Dict]:
+        result = self._safe("news", "获取新闻", symbol=symbol, limit=limit)
+        return [result] if isinstance(result, dict) else result
+
+    def search_stocks(self, query: str) -> List[Dict]:
+        result = self._safe("search", "搜索", query=query)
+        return [result] if isinstance(result, dict) else result
+
+    def validate_symbol(self, symbol: str) -> bool:
+        result = self._safe("validate", "验证股票代码", symbol=symbol)
+        return result is True
+
+    def get_stats(self) -> Dict:
+        return self._safe("stats", "获取服务统计")
+
+
+def bind_client(fetcher, service_url: str) -> QuoteServiceClient:
+    client = QuoteServiceClient(service_url)
+    for name in CLIENT_METHODS:
+        setattr(fetcher, name, getattr(client, name))
+    return client
+
+
+def dumps(payload) -> bytes:
+    return json.dumps(jsonable(payload), ensure_ascii=False).encode("utf-8")
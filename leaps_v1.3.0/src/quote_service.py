@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from fetcher_metrics import FetcherMetrics
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+from quote_client import ARROW_MEDIA_TYPE, arrow_available, dumps, encode_arrow, encode_frame
+from rate_limiter import TokenBucket
+
+
+ENDPOINTS = {
+    "history": ("get_historical_data", ("symbol", "period", "interval", "auto_adjust")),
+    "bars_since": ("get_bars_since", ("symbol", "start", "interval", "auto_adjust")),
+    "bars_range": ("get_bars_range", ("symbol", "start", "end", "interval", "auto_adjust")),
+    "actions": ("get_corporate_actions", ("symbol",)),
+    "info": ("get_stock_info", ("symbol",)),
+    "price": ("get_realtime_price", ("symbol",)),
+    "financials": ("get_financial_data", ("symbol",)),
+    "news": ("get_stock_news", ("symbol", "limit")),
+    "search": ("search_stocks", ("query",)),
+    "validate": ("validate_symbol", ("symbol",))
+}
+
+CACHE_TTL = {
+    "history": 900,
+    "bars_since": 30,
+    "bars_range": 900,
+    "actions": 3600,
+    "info": 3600,
+    "price": 15,
+    "financials": 86400,
+    "news": 600,
+    "search": 3600,
+    "validate": 86400
+}
+
+INTRADAY_TTL = 60
+
+MAX_REQUEST_LINE = 8192
+
+
+def cache_ttl(endpoint: str, params: Dict) -> float:
+    interval = params.get("interval", "1d")
+    if endpoint == "history" and interval[-1] in ("m", "h"):
+        return INTRADAY_TTL
+    return CACHE_TTL[endpoint]
+
+
+def parse_params(endpoint: str, query: Dict) -> Dict:
+    _, names = ENDPOINTS[endpoint]
+    params = {}
+    for name in names:
+        if name not in query:
+            continue
+        value = query[name]
+        if name == "symbol":
+            value = value.strip().upper()
+        elif name in ("start", "end"):
+            value = datetime.fromisoformat(value)
+        elif name == "limit":
+            value = int(value)
+        elif name == "auto_adjust":
+            value = value.lower() in ("1", "true", "yes")
+        params[name] = value
+
+    if "symbol" in names and not params.get("symbol"):
+        raise ValueError("缺少参数 symbol")
+    return params
+
+
+class QuoteService:
+    def __init__(self, fetcher: Optional[NasdaqStockFetcher] = None, max_rps: float = 2.0, burst: float = 5,
+                 max_workers: int = 8, max_entries: int = 2000):
+        self.metrics = FetcherMetrics()
+        if fetcher is None:
+            fetcher = NasdaqStockFetcher(metrics=self.metrics, service_url="")
+        elif fetcher.metrics is None:
+            self.metrics.instrument(fetcher)
+            fetcher.metrics = self.metrics
+        self.fetcher = fetcher
+        self.limiter = TokenBucket(max_rps, burst)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="leaps-service")
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple, Tuple[float, object]]" = OrderedDict()
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.started_at = time.time()
+
+    def _call_upstream(self, method: str, params: Dict):
+        self.limiter.acquire()
+        return getattr(self.fetcher, method)(**params)
+
+    def _cache_get(self, key: Tuple):
+        entry = self._cache.get(key)
+        if entry is None:
+            self.metrics.record_cache(False)
+            return None
+        expires_at, value = entry
+        if time.monotonic() > expires_at:
+            del self._cache[key]
+            self.metrics.record_cache(False)
+            return None
+        self._cache.move_to_end(key)
+        self.metrics.record_cache(True)
+        return entry
+
+    def _cache_put(self, key: Tuple, ttl: float, value):
+        self._cache[key] = (time.monotonic() + ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def fetch(self, endpoint: str, params: Dict):
+        self.requests += 1
+        key = (endpoint,) + tuple(sorted((name, str(value)) for name, value in params.items()))
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached[1]
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._call_upstream, ENDPOINTS[endpoint][0], params)
+        self._in_flight[key] = future
+        try:
+            value = await future
+        finally:
+            self._in_flight.pop(key, None)
+
+        failed = (isinstance(value, dict) and "error" in value) or (
+            isinstance(value, list) and value and isinstance(value[0], dict) and "error" in value[0])
+        if not failed:
+            self._cache_put(key, cache_ttl(endpoint, params), value)
+        return value
+
+    def stats(self) -> Dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "cache_entries": len(self._cache),
+            "in_flight": len(self._in_flight),
+            "fetcher": self.metrics.get_stats()
+        }
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, str, bytes]:
+        if method != "GET":
+            return 405, "application/json", dumps({"error": "只支持 GET 请求"})
+
+        url = urlparse(target)
+        endpoint = url.path.strip("/")
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if endpoint == "stats":
+            return 200, "application/json", dumps({"result": self.stats()})
+        if endpoint not in ENDPOINTS:
+            return 404, "application/json", dumps({"error": f"未知接口: {url.path}"})
+
+        try:
+            params = parse_params(endpoint, query)
+        except ValueError as e:
+            return 400, "application/json", dumps({"error": f"参数错误: {str(e)}"})
+
+        value = await self.fetch(endpoint, params)
+
+        if hasattr(value, "columns"):
+            if ARROW_MEDIA_TYPE in headers.get("accept", "") and arrow_available():
+                return 200, ARROW_MEDIA_TYPE, encode_arrow(value)
+            return 200, "application/json", dumps({"frame": encode_frame(value)})
+        if isinstance(value, dict) and "error" in value:
+            return 502, "application/json", dumps(value)
+        return 200, "application/json", dumps({"result": value})
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                if len(request_line) > MAX_REQUEST_LINE:
+                    break
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                try:
+                    status, content_type, body = await self.handle(method, target, headers)
+                except Exception as e:
+                    status, content_type, body = 500, "application/json", dumps({"error": f"服务内部错误: {str(e)}"})
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write((
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode("latin-1") + body)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8790, ready: Optional[asyncio.Event] = None):
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        self.address = server.sockets[0].getsockname()[:2]
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+
+def start_service_thread(service: QuoteService, host: str = "127.0.0.1", port: int = 0) -> str:
+    import threading
+
+    started = threading.Event()
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        ready = asyncio.Event()
+        task = asyncio.create_task(service.serve(host, port, ready))
+        await ready.wait()
+        started.set()
+        await task
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(run(),), daemon=True)
+    thread.start()
+    started.wait()
+    service.loop = loop
+    return f"http://{service.address[0]}:{service.address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 共享行情服务 (多客户端共享缓存与限流)")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8790, help="监听端口")
+    parser.add_argument("--max-rps", type=float, default=2.0, help="对上游的最大请求速率 (请求/秒)")
+    parser.add_argument("--burst", type=float, default=5, help="限流突发容量")
+    parser.add_argument("--workers", type=int, default=8, help="上游请求线程数")
+    parser.add_argument("--max-entries", type=int, default=2000, help="缓存最大条目数")
+    args = parser.parse_args(argv)
+
+    service = QuoteService(max_rps=args.max_rps, burst=args.burst, max_workers=args.workers,
+                           max_entries=args.max_entries)
+    print(f"行情服务已启动: http://{args.host}:{args.port}")
+    print(f"客户端使用方法: LEAPS_SERVICE_URL=http://{args.host}:{args.port} python stock_viewer_gui.py")
+
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+
+MERGE_GAPS = {
+    "1d": timedelta(days=7),
+    "5d": timedelta(days=30),
+    "1wk": timedelta(days=30),
+    "1mo": timedelta(days=92),
+    "3mo": timedelta(days=184)
+}
+
+DEFAULT_MERGE_GAP = timedelta(hours=6)
+
+Span = Tuple[int, int]
+
+
+class RangeSet:
+    def __init__(self, spans: Optional[Iterable[Span]] = None):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        for start, end in spans or ():
+            self.add(start, end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.ends))
+
+    def __eq__(self, other):
+        return isinstance(other, RangeSet) and self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return f"RangeSet({list(self)})"
+
+    def add(self, start: int, end: int):
+        if end < start:
+            return
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+    def covers(self, start: int, end: int) -> bool:
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and self.ends[i] >= end
+
+    def missing(self, start: int, end: int) -> List[Span]:
+        gaps = []
+        cursor = start
+        for i in range(max(0, bisect_right(self.starts, start) - 1), len(self.starts)):
+            if self.starts[i] > end:
+                break
+            if self.starts[i] > cursor:
+                gaps.append((cursor, self.starts[i]))
+            cursor = max(cursor, self.ends[i])
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def to_list(self) -> List[List[int]]:
+        return [[start, end] for start, end in self]
+
+    @classmethod
+    def from_list(cls, spans: Iterable[Iterable[int]]) -> "RangeSet":
+        return cls((int(start), int(end)) for start, end in spans)
+
+
+def merge_gaps(gaps: List[Span], max_distance: int) -> List[Span]:
+    merged: List[List[int]] = []
+    for start, end in gaps:
+        if merged and start - merged[-1][1] <= max_distance:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def plan_backfill(coverage: RangeSet, start: int, end: int, interval: str) -> List[Span]:
+    merge_gap = MERGE_GAPS.get(interval, DEFAULT_MERGE_GAP)
+    return merge_gaps(coverage.missing(start, end), int(merge_gap.total_seconds() * 10**9))
@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Callable, Dict, List, Optional
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
+
+import chart_renderer
+from bar_file import read_bar_file, write_bar_file
+from csv_loader import read_bar_csv
+from indicators import compute_indicators, compute_summary_stats, detect_signals
+from market_data_generator import generate_frame, simulate
+from fetcher_metrics import FetcherMetrics
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BASELINE = os.path.join(SRC_DIR, "..", "benchmarks", "baseline.json")
+
+DEFAULT_SIZES = "1k,10k,100k,1M"
+
+DEFAULT_TOLERANCE = 0.25
+
+MIN_REGRESSION_SECONDS = 0.005
+
+FETCH_CALLS = 20
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def synthetic_ohlcv(bars: int, seed: int = 0, freq: str = "min") -> pd.DataFrame:
+    times = pd.date_range("2000-01-03", periods=bars, freq=freq, name="Date")
+    return generate_frame(times, seed, "1m", drift=0.0, volatility=0.3)
+
+
+class StubTicker:
+    def __init__(self, symbol: str, hist: pd.DataFrame):
+        self.symbol = symbol
+        self.hist = hist
+        self.info = {"symbol": symbol, "currency": "USD"}
+
+    def history(self, period=None, interval=None, start=None, end=None, auto_adjust=True):
+        return self.hist.copy()
+
+
+class ChartBench:
+    def __init__(self, chart_type: str):
+        self.chart_type = chart_type
+        self.figure = Figure(figsize=(10, 8), dpi=100)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(211)
+        self.macd_ax = self.figure.add_subplot(212)
+
+    def __call__(self, hist: pd.DataFrame, indicators: Dict):
+        chart_renderer.render_chart(self.ax, self.macd_ax, hist, "BENCH", indicators,
+                                    chart_type=self.chart_type, show_signals=False)
+        self.canvas.draw()
+
+
+class FileLoadBench:
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, f"bench.{fmt}")
+        self.written = None
+
+    def __call__(self, hist: pd.DataFrame, indicators: Dict):
+        if self.written is not hist:
+            if self.fmt == "csv":
+                hist.to_csv(self.path)
+            else:
+                write_bar_file(self.path, hist)
+            self.written = hist
+        return read_bar_csv(self.path) if self.fmt == "csv" else read_bar_file(self.path)
+
+
+def _fetch(hist: pd.DataFrame, indicators: Dict, metrics: Optional[FetcherMetrics] = None):
+    fetcher = NasdaqStockFetcher(ticker_factory=lambda symbol: StubTicker(symbol, hist), metrics=metrics)
+    for _ in range(FETCH_CALLS):
+        fetcher.get_historical_data("BENCH", "max", "1m")
+
+
+BENCHMARKS: Dict[str, Dict] = {
+    "signals": {"run": lambda hist, indicators: detect_signals(hist, 20), "max_bars": None},
+    "indicators": {"run": lambda hist, indicators: compute_indicators(hist), "max_bars": None},
+    "summary_stats": {"run": lambda hist, indicators: compute_summary_stats(hist), "max_bars": None},
+    "generate_bars": {"run": lambda hist, indicators: simulate(len(hist), [0], "1m"), "max_bars": None},
+    "render_line": {"run": lambda: ChartBench("line"), "max_bars": 1_000_000, "factory": True},
+    "render_candlestick": {"run": lambda: ChartBench("candlestick"), "max_bars": 10_000, "factory": True},
+    "load_csv": {"run": lambda: FileLoadBench("csv"), "max_bars": 1_000_000, "factory": True},
+    "load_bar_file": {"run": lambda: FileLoadBench("lbar"), "max_bars": None, "factory": True},
+    "fetch_stub": {"run": _fetch, "max_bars": None},
+    "fetch_stub_metrics": {"run": lambda hist, indicators: _fetch(hist, indicators, FetcherMetrics()), "max_bars": None}
+}
+
+
+def time_call(func: Callable, hist: pd.DataFrame, indicators: Dict, repeat: int) -> Dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(hist, indicators)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(hist, indicators)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_mb": peak / 1024 / 1024}
+
+
+def run_benchmarks(names: List[str], sizes: List[int], repeat: int = 3,
+                   progress: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    results = []
+    for bars in sizes:
+        hist = synthetic_ohlcv(bars)
+        indicators = compute_indicators(hist)
+
+        for name in names:
+            spec = BENCHMARKS[name]
+            if spec["max_bars"] is not None and bars > spec["max_bars"]:
+                continue
+
+            func = spec["run"]() if spec.get("factory") else spec["run"]
+            measured = time_call(func, hist, indicators, repeat)
+            result = {
+                "benchmark": name,
+                "bars": bars,
+                "seconds": round(measured["seconds"], 6),
+                "bars_per_sec": round(bars / measured["seconds"]) if measured["seconds"] > 0 else None,
+                "peak_mb": round(measured["peak_mb"], 2)
+            }
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+    return results
+
+
+def result_key(result: Dict) -> str:
+    return f"{result['benchmark']}@{result['bars']}"
+
+
+def compare(results: List[Dict], baseline: Dict[str, Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    regressions = []
+    for result in results:
+        base = baseline.get(result_key(result))
+        if base is None:
+            continue
+
+        for field in ("seconds", "peak_mb"):
+            if field == "seconds" and result[field] - base[field] < MIN_REGRESSION_SECONDS:
+                continue
+            if base[field] > 0 and result[field] > base[field] * (1 + tolerance):
+                regressions.append({
+                    "key": result_key(result),
+                    "field": field,
+                    "baseline": base[field],
+                    "current": result[field],
+                    "ratio": round(result[field] / base[field], 2)
+                })
+
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path: str, results: List[Dict]):
+    merged = load_baseline(path)
+    merged.update({result_key(result): result for result in results})
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+            "results": merged
+        }, f, indent=2, ensure_ascii=False)
+
+
+def format_result(result: Dict, baseline: Dict[str, Dict]) -> str:
+    line = (f"{result['benchmark']:<20} {result['bars']:>10,} bars "
+            f"{result['seconds'] * 1000:>10.1f} ms "
+            f"{result['bars_per_sec'] or 0:>14,} bars/s "
+            f"{result['peak_mb']:>9.1f} MB")
+
+    base = baseline.get(result_key(result))
+    if base is not None and base["seconds"] > 0:
+        line += f"  (基线 x{result['seconds'] / base['seconds']:.2f})"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 性能基准测试 (合成数据)")
+    parser.add_argument("benchmarks", nargs="*", default=list(BENCHMARKS), help="要运行的基准 (默认: 全部)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="数据规模，逗号分隔，例如 1k,100k,10M")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最小值")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线结果JSON文件")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为基线")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="允许的回退比例 (默认0.25即25%%)")
+    parser.add_argument("--json", dest="json_path", help="将结果写入JSON文件")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"未知的基准: {', '.join(unknown)} (可选: {', '.join(BENCHMARKS)})")
+
+    warnings.filterwarnings("ignore", message="Glyph .* missing from font")
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+
+    results = run_benchmarks(args.benchmarks, sizes, args.repeat,
+                             progress=lambda result: print(format_result(result, baseline), flush=True))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\n基线已保存到: {os.path.normpath(args.baseline)}")
+        return 0
+
+    if not baseline:
+        print("\n未找到基线文件，使用 --save-baseline 生成")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for item in regressions:
+        print(f"✗ {item['key']} {item['field']}: {item['baseline']} -> {item['current']} (x{item['ratio']})")
+
+    print(f"\n共 {len(results)} 项, 回退 {len(regressions)} 项 (容差 {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
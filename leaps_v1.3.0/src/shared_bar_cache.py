@@ -0,0 +1,299 @@
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BAR_DTYPE, MARKET_TZ, frame_to_records, records_to_frame
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"),
+    ("capacity", "<u4"),
+    ("generation", "<u8"),
+    ("used_bytes", "<i8"),
+    ("max_bytes", "<i8"),
+    ("hits", "<u8"),
+    ("misses", "<u8"),
+    ("evictions", "<u8")
+])
+
+SLOT_DTYPE = np.dtype([
+    ("version", "<u8"),
+    ("key", "S40"),
+    ("generation", "<u8"),
+    ("rows", "<i8"),
+    ("last_used", "<f8")
+])
+
+MAGIC = 0x4C425331
+
+DEFAULT_CACHE_NAME = "leaps_bars"
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> SharedMemory:
+    shm = SharedMemory(name=name, create=create, size=size)
+    # 缓存段的生命周期由 SharedBarCache.destroy 管理，不能在进程退出时被 resource_tracker 删除
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _unlink_segment(shm: SharedMemory):
+    resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+
+def cache_key(symbol: str, interval: str) -> bytes:
+    return f"{symbol.upper()}:{interval}".encode("ascii")
+
+
+class SharedBarCache:
+    def __init__(self, name: str = DEFAULT_CACHE_NAME, capacity: int = 4096, max_bytes: int = 1 << 30,
+                 create: bool = True):
+        self.name = name
+        self._segments: Dict[str, SharedMemory] = {}
+        self._thread_lock = threading.Lock()
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_file = open(self._lock_path, "a+b")
+
+        index_size = HEADER_DTYPE.itemsize + capacity * SLOT_DTYPE.itemsize
+        with self._locked():
+            try:
+                self._index = _open_segment(f"{name}_index")
+            except FileNotFoundError:
+                if not create:
+                    raise
+                self._index = _open_segment(f"{name}_index", create=True, size=index_size)
+                header = np.ndarray(1, dtype=HEADER_DTYPE, buffer=self._index.buf)
+                header[0] = (MAGIC, capacity, 0, 0, max_bytes, 0, 0, 0)
+                del header
+
+        self._header = np.ndarray(1, dtype=HEADER_DTYPE, buffer=self._index.buf)
+        if self._header["magic"][0] != MAGIC:
+            raise ValueError(f"共享内存 {name}_index 不是有效的K线缓存")
+        self.capacity = int(self._header["capacity"][0])
+        self._slots = np.ndarray(self.capacity, dtype=SLOT_DTYPE, buffer=self._index.buf,
+                                 offset=HEADER_DTYPE.itemsize)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        return {"name": self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["name"], create=False)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _segment_name(self, generation: int) -> str:
+        return f"{self.name}_{generation}"
+
+    def _find(self, key: bytes) -> int:
+        matches = np.flatnonzero(self._slots["key"] == key)
+        return int(matches[0]) if len(matches) else -1
+
+    def _read_slot(self, slot: int):
+        entry = self._slots[slot:slot + 1]
+        while True:
+            version = int(entry["version"][0])
+            if version & 1:
+                time.sleep(0)
+                continue
+            key, generation, rows = bytes(entry["key"][0]), int(entry["generation"][0]), int(entry["rows"][0])
+            if int(entry["version"][0]) == version:
+                return key, generation, rows
+
+    def _attach(self, generation: int) -> SharedMemory:
+        name = self._segment_name(generation)
+        shm = self._segments.get(name)
+        if shm is None:
+            self._prune()
+            shm = self._segments[name] = _open_segment(name)
+        return shm
+
+    def _prune(self):
+        live = {self._segment_name(int(generation)) for generation in self._slots["generation"] if generation}
+        for name in [name for name in self._segments if name not in live]:
+            try:
+                self._segments[name].close()
+            except BufferError:
+                continue
+            del self._segments[name]
+
+    def get(self, symbol: str, interval: str) -> Optional[np.ndarray]:
+        key = cache_key(symbol, interval)
+        for _ in range(8):
+            slot = self._find(key)
+            if slot < 0:
+                break
+            slot_key, generation, rows = self._read_slot(slot)
+            if slot_key != key:
+                continue
+            try:
+                shm = self._attach(generation)
+            except FileNotFoundError:
+                continue
+            self._slots["last_used"][slot] = time.time()
+            self._count("hits")
+            records = np.ndarray(rows, dtype=BAR_DTYPE, buffer=shm.buf)
+            records.flags.writeable = False
+            return records
+
+        self._count("misses")
+        return None
+
+    def _count(self, field: str):
+        # 计数器在共享内存中，多个进程同时读写时需要加锁
+        with self._locked():
+            self._header[field] += 1
+
+    def get_frame(self, symbol: str, interval: str, tz: str = MARKET_TZ) -> Optional[pd.DataFrame]:
+        records = self.get(symbol, interval)
+        return None if records is None else records_to_frame(records, tz)
+
+    def put(self, symbol: str, interval: str, data: Union[np.ndarray, pd.DataFrame]) -> np.ndarray:
+        records = frame_to_records(data) if isinstance(data, pd.DataFrame) else np.asarray(data, dtype=BAR_DTYPE)
+        key = cache_key(symbol, interval)
+        nbytes = records.nbytes
+
+        with self._locked():
+            generation = int(self._header["generation"][0]) + 1
+            self._header["generation"] = generation
+            shm = _open_segment(self._segment_name(generation), create=True, size=max(nbytes, 1))
+            np.ndarray(len(records), dtype=BAR_DTYPE, buffer=shm.buf)[:] = records
+            self._segments[self._segment_name(generation)] = shm
+
+            slot = self._find(key)
+            if slot < 0:
+                self._evict_locked(nbytes, need_slot=True)
+                slot = self._find(b"")
+            else:
+                self._retire_locked(slot)
+                self._evict_locked(nbytes, need_slot=False)
+
+            self._write_slot(slot, key, generation, len(records))
+            self._header["used_bytes"] += nbytes
+
+        result = np.ndarray(len(records), dtype=BAR_DTYPE, buffer=shm.buf)
+        result.flags.writeable = False
+        return result
+
+    def get_or_load(self, symbol: str, interval: str,
+                    loader: Callable[[], Optional[Union[np.ndarray, pd.DataFrame]]]) -> Optional[np.ndarray]:
+        records = self.get(symbol, interval)
+        if records is not None:
+            return records
+        data = loader()
+        if data is None or (isinstance(data, dict) and "error" in data) or len(data) == 0:
+            return None
+        return self.put(symbol, interval, data)
+
+    def _write_slot(self, slot: int, key: bytes, generation: int, rows: int):
+        entry = self._slots[slot:slot + 1]
+        entry["version"] += 1
+        entry["key"] = key
+        entry["generation"] = generation
+        entry["rows"] = rows
+        entry["last_used"] = time.time()
+        entry["version"] += 1
+
+    def _retire_locked(self, slot: int):
+        _, generation, rows = self._read_slot(slot)
+        self._write_slot(slot, b"", 0, 0)
+        self._header["used_bytes"] -= rows * BAR_DTYPE.itemsize
+        # 已映射该段的读者不受影响，内核在最后一个映射关闭后才释放内存
+        name = self._segment_name(generation)
+        shm = self._segments.get(name)
+        try:
+            if shm is None:
+                shm = _open_segment(name)
+                shm.close()
+            _unlink_segment(shm)
+        except FileNotFoundError:
+            pass
+
+    def _evict_locked(self, nbytes: int, need_slot: bool):
+        max_bytes = int(self._header["max_bytes"][0])
+        while True:
+            occupied = np.flatnonzero(self._slots["key"] != b"")
+            over_budget = int(self._header["used_bytes"][0]) + nbytes > max_bytes
+            no_slot = need_slot and len(occupied) >= self.capacity
+            if not (over_budget or no_slot) or len(occupied) == 0:
+                return
+            self._retire_locked(int(occupied[np.argmin(self._slots["last_used"][occupied])]))
+            self._header["evictions"] += 1
+
+    def evict(self, symbol: str, interval: str):
+        with self._locked():
+            slot = self._find(cache_key(symbol, interval))
+            if slot >= 0:
+                self._retire_locked(slot)
+
+    def clear(self):
+        with self._locked():
+            for slot in np.flatnonzero(self._slots["key"] != b""):
+                self._retire_locked(int(slot))
+
+    def stats(self) -> Dict:
+        header = self._header[0]
+        hits, misses = int(header["hits"]), int(header["misses"])
+        return {
+            "entries": int(np.count_nonzero(self._slots["key"] != b"")),
+            "capacity": self.capacity,
+            "used_bytes": int(header["used_bytes"]),
+            "max_bytes": int(header["max_bytes"]),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": int(header["evictions"])
+        }
+
+    def release(self):
+        for name in list(self._segments):
+            try:
+                self._segments[name].close()
+            except BufferError:
+                continue
+            del self._segments[name]
+
+    def close(self):
+        self.release()
+        del self._header, self._slots
+        self._index.close()
+        self._lock_file.close()
+
+    def destroy(self):
+        self.clear()
+        self.release()
+        del self._header, self._slots
+        self._index.close()
+        _unlink_segment(self._index)
+        self._lock_file.close()
+        try:
+            os.remove(self._lock_path)
+        except FileNotFoundError:
+            pass
@@ -1,11 +1,5 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
 
 
 def create_simple_chart(symbol="AAPL", period="1y"):
@@ -16,33 +10,29 @@ def create_simple_chart(symbol="AAPL", period="1y"):
     main_frame = ttk.Frame(root, padding="10")
     main_frame.pack(fill=tk.BOTH, expand=True)
     
-    figure = Figure(figsize=(10, 8), dpi=100)
-    ax = figure.add_subplot(211)
-    macd_ax = figure.add_subplot(212)
-    
-    period_days = {
-        '1mo': 30, '3mo': 90, '6mo': 180, '1y': 365,
-        '2y': 730, '5y': 1825, '10y': 3650
-    }
+    placeholder = ttk.Label(main_frame, text="正在加载图表...")
+    placeholder.pack(expand=True)
     
-    days = period_days.get(period, 365)
-    start_date = datetime.now() - timedelta(days=days)
-    dates = pd.date_range(start=start_date, periods=int(days*0.7), freq='B')
-    
-    np.random.seed(hash(symbol) % 10000)
+    root.after(50, lambda: build_chart(main_frame, placeholder, symbol, period))
+    root.mainloop()
+
+
+def build_chart(main_frame, placeholder, symbol, period):
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    import pandas as pd
+    from market_data_generator import generate_ohlcv
+    from trading_calendar import period_bars
     
-    base_prices = {
-        'AAPL': 180.0, 'GOOGL': 140.0, 'MSFT': 380.0, 'AMZN': 170.0,
-        'TSLA': 240.0, 'META': 480.0, 'NVDA': 880.0, 'NFLX': 550.0,
-        'ADBE': 550.0, 'INTC': 45.0
-    }
+    placeholder.destroy()
     
-    initial_price = base_prices.get(symbol, 100.0)
-    returns = np.random.normal(0.0005, 0.02, len(dates))
+    figure = Figure(figsize=(10, 8), dpi=100)
+    ax = figure.add_subplot(211)
+    macd_ax = figure.add_subplot(212)
     
-    prices = [initial_price]
-    for ret in returns[1:]:
-        prices.append(prices[-1] * (1 + ret))
+    hist = generate_ohlcv(symbol, bars=period_bars(period), tz=None)
+    dates = hist.index
+    prices = hist['Close']
     
     ax.plot(dates, prices, label=f'{symbol} 收盘价', linewidth=1.5, color='blue')
     
@@ -56,12 +46,6 @@ def create_simple_chart(symbol="AAPL", period="1y"):
     
     signal_window = 20
     if len(prices) > signal_window:
-        hist = pd.DataFrame({
-            'Close': prices,
-            'High': [p * 1.01 for p in prices],
-            'Low': [p * 0.99 for p in prices]
-        }, index=dates)
-        
         rolling_high = hist['High'].rolling(window=signal_window).max()
         rolling_low = hist['Low'].rolling(window=signal_window).min()
         
@@ -156,8 +140,6 @@ def create_simple_chart(symbol="AAPL", period="1y"):
                              f"期间涨幅: {period_return:.2f}%  |  "
                              f"数据点数: {len(prices)}",
              font=('Arial', 10, 'bold')).pack()
-    
-    root.mainloop()
 
 
 if __name__ == "__main__":
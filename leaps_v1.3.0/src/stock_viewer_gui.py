@@ -1,25 +1,90 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter import filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import pandas as pd
+import importlib
 from nasdaq_stock_fetcher import NasdaqStockFetcher
+from data_cache import DEFAULT_MAX_BYTES, BarCache
+from fetch_scheduler import FetchScheduler
+from symbol_prefetcher import SymbolPrefetcher, load_recent_symbols, save_recent_symbols, remember_symbol
+from live_updater import LiveUpdater
+from viewport_loader import ViewportLoader
+from fetcher_metrics import metrics_from_env
+from phase_profiler import PhaseProfiler
 import threading
+import time
+import os
+
+
+POPULAR_STOCKS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA", "META", "NVDA", "NFLX", "ADBE", "INTC"]
+
+PRELOAD_MODULES = ["numpy", "pandas", "matplotlib.figure", "matplotlib.dates", "indicators", "chart_renderer", "yfinance"]
+
+
+def preload_modules(modules=PRELOAD_MODULES):
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
 
 
 class LeapsGUI:
-    def __init__(self, root):
+    PREFETCH_DELAY_MS = 1000
+    CHART_INIT_DELAY_MS = 50
+    VIEWPORT_DEBOUNCE_MS = 300
+    LIVE_MAX_FPS = 4
+    PROFILED_METHODS = (
+        'update_info_panel', 'refresh_chart', 'layout_axes',
+        'plot_line_chart', 'plot_candlestick_chart', 'plot_volume_chart', 'plot_volume_panel',
+        'plot_moving_averages', 'plot_bollinger_bands', 'plot_buy_sell_signals', 'plot_macd'
+    )
+    OVERLAY_PHASES = (
+        'fetch', 'update_info_panel', 'refresh_chart', 'indicators',
+        'plot_line_chart', 'plot_candlestick_chart', 'plot_volume_chart', 'plot_volume_panel',
+        'plot_moving_averages', 'plot_bollinger_bands', 'plot_buy_sell_signals', 'plot_macd',
+        'tight_layout', 'canvas_draw'
+    )
+    
+    def __init__(self, root, prefetch_budget=None, cache_bytes=DEFAULT_MAX_BYTES):
         self.root = root
         self.root.title("Leaps")
         self.root.geometry("1200x800")
         
-        self.fetcher = NasdaqStockFetcher()
+        self.metrics = metrics_from_env()
+        self.fetcher = NasdaqStockFetcher(metrics=self.metrics)
         self.current_data = None
         self.current_symbol = None
+        self.current_indicators = None
+        self.current_period = None
+        self.current_interval = None
+        self.figure = None
+        self.renderer = None
+        
+        self.data_cache = BarCache(metrics=self.metrics, max_bytes=cache_bytes)
+        self.scheduler = FetchScheduler(self.fetcher, self.data_cache)
+        self.recent_symbols = load_recent_symbols()
+        self.prefetcher = SymbolPrefetcher(self.scheduler, prefetch_budget)
+        self.watchlist_window = None
+        
+        self.live_updater = LiveUpdater(self.fetcher)
+        self._live_job = None
+        self._live_polling = False
+        self._redraw_job = None
+        self._last_redraw = 0.0
+        
+        self.viewport_loader = ViewportLoader(self.fetcher)
+        self._viewport_job = None
+        self.detail_line = None
+        
+        self.profiler = PhaseProfiler(enabled=os.environ.get("LEAPS_PROFILE") == "1")
+        self.profiler.instrument(self, self.PROFILED_METHODS)
+        self.profile_overlay = None
+        
+        threading.Thread(target=preload_modules, daemon=True).start()
         
         self.setup_ui()
+        self.root.after(self.CHART_INIT_DELAY_MS, self.init_chart_canvas)
+        self.root.after(self.PREFETCH_DELAY_MS, self.start_prefetch)
         
     def setup_ui(self):
         main_frame = ttk.Frame(self.root, padding="10")
@@ -91,11 +156,20 @@ class LeapsGUI:
         ttk.Button(button_frame, text="刷新图表", command=self.refresh_chart).grid(row=0, column=1, padx=5)
         ttk.Button(button_frame, text="保存图表", command=self.save_chart).grid(row=0, column=2, padx=5)
         ttk.Button(button_frame, text="导出数据", command=self.export_data).grid(row=0, column=3, padx=5)
+        ttk.Button(button_frame, text="自选股网格", command=self.open_watchlist).grid(row=1, column=0, columnspan=2, padx=5, pady=(5, 0))
+        
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="自动刷新", variable=self.auto_refresh_var,
+                        command=self.toggle_auto_refresh).grid(row=1, column=2, columnspan=2, padx=5, pady=(5, 0))
+        
+        self.profile_var = tk.BooleanVar(value=self.profiler.enabled)
+        ttk.Checkbutton(button_frame, text="性能分析", variable=self.profile_var,
+                        command=self.toggle_profiling).grid(row=2, column=0, columnspan=2, padx=5, pady=(5, 0))
+        ttk.Button(button_frame, text="保存追踪", command=self.save_trace).grid(row=2, column=2, columnspan=2, padx=5, pady=(5, 0))
         
         ttk.Label(control_frame, text="常用股票:").grid(row=11, column=0, sticky=tk.W, pady=(20, 5))
         
-        popular_stocks = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA", "META", "NVDA", "NFLX", "ADBE", "INTC"]
-        for i, stock in enumerate(popular_stocks):
+        for i, stock in enumerate(POPULAR_STOCKS):
             btn = ttk.Button(control_frame, text=stock, width=8,
                           command=lambda s=stock: self.quick_select_stock(s))
             btn.grid(row=12 + i//2, column=i%2, pady=2, padx=2)
@@ -106,15 +180,33 @@ class LeapsGUI:
         chart_frame.columnconfigure(0, weight=1)
         chart_frame.rowconfigure(0, weight=1)
         
+        self.chart_frame = chart_frame
+        self.chart_placeholder = ttk.Label(chart_frame, text="正在加载图表组件...")
+        self.chart_placeholder.grid(row=0, column=0)
+        
+    def init_chart_canvas(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        import chart_renderer
+        
+        self.renderer = chart_renderer
         self.figure = Figure(figsize=(10, 8), dpi=100)
-        self.ax = self.figure.add_subplot(211)
-        self.macd_ax = self.figure.add_subplot(212)
+        self.volume_ax = None
+        self.layout_axes(False)
         
-        self.canvas = FigureCanvasTkAgg(self.figure, chart_frame)
+        self.chart_placeholder.destroy()
+        self.canvas = FigureCanvasTkAgg(self.figure, self.chart_frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        toolbar = NavigationToolbar2Tk(self.canvas, self.chart_frame, pack_toolbar=False)
+        toolbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        toolbar.update()
+        
         self.canvas.draw()
         
+        if self.current_data is not None:
+            self.refresh_chart()
+        
     def create_info_panel(self, parent):
         info_frame = ttk.LabelFrame(parent, text="股票信息", padding="10")
         info_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
@@ -133,6 +225,129 @@ class LeapsGUI:
         self.symbol_entry.delete(0, tk.END)
         self.symbol_entry.insert(0, symbol)
         
+        entry = self.data_cache.get(symbol, self.period_var.get(), self.interval_var.get(), record=False)
+        if entry is not None:
+            self.show_cached_entry(entry)
+        
+    def open_watchlist(self):
+        from watchlist_view import WatchlistWindow
+        
+        if self.watchlist_window is not None and self.watchlist_window.is_open():
+            self.watchlist_window.focus()
+            return
+        
+        symbols = self.recent_symbols + [s for s in POPULAR_STOCKS if s not in self.recent_symbols]
+        self.watchlist_window = WatchlistWindow(self.root, self.scheduler, symbols)
+        
+    def start_prefetch(self):
+        period = self.period_var.get()
+        interval = self.interval_var.get()
+        signal_window = self.get_signal_window()
+        self.prefetcher.start(self.recent_symbols + POPULAR_STOCKS, period, interval, signal_window)
+        
+    def show_cached_entry(self, entry):
+        self.current_data = entry["data"]
+        self.current_symbol = entry["symbol"]
+        self.current_indicators = entry["indicators"]
+        self.current_period = entry["period"]
+        self.current_interval = entry["interval"]
+        self.record_recent_symbol(entry["symbol"])
+        
+        self.update_info_panel()
+        self.refresh_chart()
+        
+    def record_recent_symbol(self, symbol):
+        self.recent_symbols = remember_symbol(self.recent_symbols, symbol)
+        save_recent_symbols(self.recent_symbols)
+        
+    def toggle_auto_refresh(self):
+        if self.auto_refresh_var.get():
+            self.schedule_live_poll(0)
+        elif self._live_job is not None:
+            self.root.after_cancel(self._live_job)
+            self._live_job = None
+        
+    def schedule_live_poll(self, delay_seconds):
+        if self._live_job is not None:
+            self.root.after_cancel(self._live_job)
+        self._live_job = self.root.after(int(delay_seconds * 1000), self.live_poll)
+        
+    def live_poll(self):
+        self._live_job = None
+        if not self.auto_refresh_var.get():
+            return
+        
+        if self.current_data is None or self._live_polling:
+            self.schedule_live_poll(self.live_updater.next_delay())
+            return
+        
+        symbol = self.current_symbol
+        hist = self.current_data
+        indicators = self.current_indicators
+        period = self.current_period
+        interval = self.current_interval
+        signal_window = self.get_signal_window()
+        self._live_polling = True
+        
+        def poll_thread():
+            try:
+                data, new_indicators, changed = self.live_updater.poll(symbol, interval, hist, indicators, signal_window)
+                if changed:
+                    self.root.after(0, lambda: self.apply_live_update(symbol, hist, data, new_indicators, period, interval))
+            except Exception:
+                pass
+            finally:
+                self._live_polling = False
+                self.root.after(0, lambda: self.auto_refresh_var.get() and self.schedule_live_poll(self.live_updater.next_delay()))
+        
+        threading.Thread(target=poll_thread, daemon=True).start()
+        
+    def apply_live_update(self, symbol, base, data, indicators, period, interval):
+        if self.current_symbol != symbol or self.current_data is not base:
+            return
+        
+        self.current_data = data
+        self.current_indicators = indicators
+        self.data_cache.put(symbol, period, interval, data, indicators)
+        self.request_redraw()
+        
+    def request_redraw(self):
+        if self._redraw_job is not None:
+            return
+        
+        delay = max(0.0, 1.0 / self.LIVE_MAX_FPS - (time.time() - self._last_redraw))
+        self._redraw_job = self.root.after(int(delay * 1000), self.flush_redraw)
+        
+    def flush_redraw(self):
+        self._redraw_job = None
+        self._last_redraw = time.time()
+        self.update_info_panel()
+        self.refresh_chart()
+        
+    def get_signal_window(self):
+        from indicators import signal_window
+        return signal_window(self.signal_period_var.get())
+        
+    def get_indicators(self, hist):
+        from indicators import compute_indicators, detect_signals
+        
+        window = self.get_signal_window()
+        indicators = self.current_indicators
+        
+        if indicators is None:
+            with self.profiler.phase("indicators", bars=len(hist)):
+                indicators = compute_indicators(hist, window)
+        elif indicators["signal_window"] != window:
+            indicators = dict(indicators)
+            indicators["signal_window"] = window
+            with self.profiler.phase("indicators", bars=len(hist)):
+                indicators["signals"] = detect_signals(hist, window, indicators["macd"][0])
+        
+        if indicators is not self.current_indicators:
+            self.data_cache.set_indicators(self.current_symbol, self.current_period, self.current_interval, hist, indicators)
+        self.current_indicators = indicators
+        return indicators
+        
     def fetch_data(self):
         symbol = self.symbol_entry.get().strip().upper()
         
@@ -143,26 +358,24 @@ class LeapsGUI:
         period = self.period_var.get()
         interval = self.interval_var.get()
         
+        future = self.scheduler.request(symbol, period, interval, self.get_signal_window())
+        if future.done() and "error" not in future.result():
+            self.show_cached_entry(future.result())
+            return
+        
         self.root.config(cursor="watch")
         self.root.update()
         
         def fetch_thread():
             try:
-                data = self.fetcher.get_historical_data(symbol, period, interval)
-                
-                if isinstance(data, dict) and "error" in data:
-                    self.root.after(0, lambda: self.show_error(data["error"]))
-                    return
+                with self.profiler.phase("fetch", symbol=symbol, period=period, interval=interval):
+                    entry = future.result()
                 
-                if data is None or data.empty:
-                    self.root.after(0, lambda: self.show_error("未能获取到数据"))
+                if "error" in entry:
+                    self.root.after(0, lambda: self.show_error(entry["error"]))
                     return
                 
-                self.current_data = data
-                self.current_symbol = symbol
-                
-                self.root.after(0, self.update_info_panel)
-                self.root.after(0, self.refresh_chart)
+                self.root.after(0, lambda: self.show_cached_entry(entry))
                 
             except Exception as e:
                 self.root.after(0, lambda: self.show_error(f"获取数据时出错: {str(e)}"))
@@ -179,37 +392,46 @@ class LeapsGUI:
         if self.current_data is None:
             return
         
+        from indicators import compute_summary_stats
+        
         symbol = self.current_symbol
-        hist = self.current_data
+        stats = compute_summary_stats(self.current_data)
         
         info_text = f"股票代码: {symbol}\n"
-        info_text += f"数据时间范围: {hist.index[0].strftime('%Y-%m-%d')} 至 {hist.index[-1].strftime('%Y-%m-%d')}\n"
-        info_text += f"数据点数: {len(hist)}\n\n"
+        info_text += f"数据时间范围: {stats['start'].strftime('%Y-%m-%d')} 至 {stats['end'].strftime('%Y-%m-%d')}\n"
+        info_text += f"数据点数: {stats['bars']}\n\n"
         
         info_text += "价格统计:\n"
-        info_text += f"  当前价格: ${hist['Close'].iloc[-1]:.2f}\n"
-        info_text += f"  期间最高: ${hist['High'].max():.2f}\n"
-        info_text += f"  期间最低: ${hist['Low'].min():.2f}\n"
-        info_text += f"  期间涨幅: {((hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0] * 100):.2f}%\n\n"
+        info_text += f"  当前价格: ${stats['last_close']:.2f}\n"
+        info_text += f"  期间最高: ${stats['high']:.2f}\n"
+        info_text += f"  期间最低: ${stats['low']:.2f}\n"
+        info_text += f"  期间涨幅: {stats['change_pct']:.2f}%\n\n"
         
         info_text += "成交量统计:\n"
-        info_text += f"  平均成交量: {hist['Volume'].mean():,.0f}\n"
-        info_text += f"  最高成交量: {hist['Volume'].max():,.0f}\n\n"
+        info_text += f"  平均成交量: {stats['avg_volume']:,.0f}\n"
+        info_text += f"  最高成交量: {stats['max_volume']:,.0f}\n\n"
         
-        daily_returns = hist['Close'].pct_change()
         info_text += "波动率统计:\n"
-        info_text += f"  平均日涨跌幅: {(daily_returns.mean() * 100):.3f}%\n"
-        info_text += f"  最大单日涨幅: {(daily_returns.max() * 100):.2f}%\n"
-        info_text += f"  最大单日跌幅: {(daily_returns.min() * 100):.2f}%\n"
-        info_text += f"  年化波动率: {(daily_returns.std() * (252 ** 0.5) * 100):.2f}%\n"
+        info_text += f"  平均日涨跌幅: {stats['mean_return_pct']:.3f}%\n"
+        info_text += f"  最大单日涨幅: {stats['max_return_pct']:.2f}%\n"
+        info_text += f"  最大单日跌幅: {stats['min_return_pct']:.2f}%\n"
+        info_text += f"  年化波动率: {stats['annual_volatility_pct']:.2f}%\n\n"
+        
+        cache = self.data_cache.stats()
+        info_text += f"会话缓存: {cache['entries']} 项, {cache['used_bytes'] / 1024 / 1024:.0f}"
+        info_text += f" / {cache['max_bytes'] / 1024 / 1024:.0f} MB\n" if cache['max_bytes'] else " MB\n"
         
         self.info_text.delete(1.0, tk.END)
         self.info_text.insert(tk.END, info_text)
         
     def refresh_chart(self):
-        if self.current_data is None:
+        if self.current_data is None or self.figure is None:
             return
         
+        if self.profiler.enabled:
+            self.profiler.forget(name for name in self.OVERLAY_PHASES if name.startswith('plot_'))
+        
+        self.layout_axes(self.show_volume_var.get())
         self.ax.clear()
         self.macd_ax.clear()
         
@@ -232,168 +454,157 @@ class LeapsGUI:
         if self.show_signals_var.get():
             self.plot_buy_sell_signals(hist)
         
+        if self.volume_ax is not None:
+            self.volume_ax.clear()
+            self.plot_volume_panel(hist)
+        
         if self.show_macd_var.get():
             self.plot_macd(hist)
         
-        self.ax.set_title(f"{self.current_symbol} 股票价格曲线", fontsize=14, fontweight='bold')
-        self.ax.set_xlabel("日期", fontsize=10)
-        self.ax.set_ylabel("价格 ($)", fontsize=10)
-        self.ax.grid(True, alpha=0.3)
+        self.renderer.decorate_price_axes(self.ax, self.current_symbol)
         
-        self.figure.tight_layout()
-        self.canvas.draw()
+        with self.profiler.phase("tight_layout"):
+            self.figure.tight_layout()
+        with self.profiler.phase("canvas_draw"):
+            self.canvas.draw()
         
-    def plot_line_chart(self, hist):
-        self.ax.plot(hist.index, hist['Close'], label='收盘价', linewidth=1.5, color='blue')
-        self.ax.legend()
+        self.detail_line = None
+        self.ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
         
-    def plot_candlestick_chart(self, hist):
-        from matplotlib.patches import Rectangle
-        from matplotlib.lines import Line2D
+        if self.profiler.enabled:
+            self.root.after(0, self.update_profile_overlay)
         
-        width = 0.6
-        width2 = 0.1
+    def toggle_profiling(self):
+        self.profiler.enabled = self.profile_var.get()
         
-        up = hist[hist['Close'] >= hist['Open']]
-        down = hist[hist['Close'] < hist['Open']]
+        if self.profiler.enabled:
+            self.profiler.clear()
+            if self.current_data is not None:
+                self.update_info_panel()
+                self.refresh_chart()
+        elif self.profile_overlay is not None:
+            self.profile_overlay.destroy()
+            self.profile_overlay = None
         
-        for idx, row in up.iterrows():
-            self.ax.add_patch(Rectangle((idx, row['Open']), width, row['Close'] - row['Open'],
-                                       facecolor='green', edgecolor='green'))
-            self.ax.add_line(Line2D([idx, idx], [row['Low'], row['High']],
-                                   color='green', linewidth=0.5))
-        
-        for idx, row in down.iterrows():
-            self.ax.add_patch(Rectangle((idx, row['Close']), width, row['Open'] - row['Close'],
-                                       facecolor='red', edgecolor='red'))
-            self.ax.add_line(Line2D([idx, idx], [row['Low'], row['High']],
-                                   color='red', linewidth=0.5))
-        
-    def plot_volume_chart(self, hist):
-        colors = ['green' if close >= open_price else 'red' 
-                 for close, open_price in zip(hist['Close'], hist['Open'])]
-        self.ax.bar(hist.index, hist['Volume'], color=colors, alpha=0.7)
-        self.ax.set_ylabel("成交量", fontsize=10)
+    def update_profile_overlay(self):
+        timings = self.profiler.last_timings(self.OVERLAY_PHASES)
+        if not timings or not self.profiler.enabled:
+            return
         
-    def plot_moving_averages(self, hist):
-        ma20 = hist['Close'].rolling(window=20).mean()
-        ma50 = hist['Close'].rolling(window=50).mean()
-        ma200 = hist['Close'].rolling(window=200).mean()
+        if self.profile_overlay is None:
+            self.profile_overlay = tk.Label(self.chart_frame, justify=tk.LEFT, anchor=tk.NW,
+                                            font=("Courier", 9), bg="#ffffe0", relief=tk.SOLID, borderwidth=1)
+            self.profile_overlay.place(relx=1.0, rely=0.0, x=-10, y=10, anchor=tk.NE)
         
-        if len(ma20.dropna()) > 0:
-            self.ax.plot(ma20.index, ma20, label='MA20', linewidth=1, alpha=0.7, color='orange')
-        if len(ma50.dropna()) > 0:
-            self.ax.plot(ma50.index, ma50, label='MA50', linewidth=1, alpha=0.7, color='purple')
-        if len(ma200.dropna()) > 0:
-            self.ax.plot(ma200.index, ma200, label='MA200', linewidth=1, alpha=0.7, color='brown')
+        text = "\n".join(f"{name:<22}{ms:>8.1f} ms" for name, ms in timings.items())
+        self.profile_overlay.config(text=text)
+        self.profile_overlay.lift()
         
-        self.ax.legend()
+    def save_trace(self):
+        if not self.profiler.events:
+            messagebox.showwarning("警告", "没有性能记录，请先勾选\"性能分析\"并刷新图表")
+            return
         
-    def plot_bollinger_bands(self, hist):
-        window = 20
-        ma = hist['Close'].rolling(window=window).mean()
-        std = hist['Close'].rolling(window=window).std()
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Chrome Trace", "*.json"), ("All files", "*.*")],
+            initialfile="leaps_trace.json"
+        )
         
-        upper_band = ma + (std * 2)
-        lower_band = ma - (std * 2)
+        if filename:
+            try:
+                count = self.profiler.write_chrome_trace(filename)
+                messagebox.showinfo("成功", f"已保存 {count} 条记录到: {filename}\n可在 chrome://tracing 或 Perfetto 中打开")
+            except Exception as e:
+                messagebox.showerror("错误", f"保存追踪失败: {str(e)}")
         
-        self.ax.fill_between(ma.index, upper_band, lower_band, alpha=0.2, color='gray', label='布林带')
-        self.ax.legend()
+    def on_xlim_changed(self, ax):
+        if self._viewport_job is not None:
+            self.root.after_cancel(self._viewport_job)
+        self._viewport_job = self.root.after(self.VIEWPORT_DEBOUNCE_MS, self.load_viewport)
         
-    def plot_buy_sell_signals(self, hist):
-        signal_period = self.signal_period_var.get()
+    def load_viewport(self):
+        import matplotlib.dates as mdates
         
-        period_days = {
-            '1mo': 20,
-            '3mo': 60,
-            '6mo': 120,
-            '1y': 250
-        }
+        self._viewport_job = None
+        if self.current_data is None:
+            return
         
-        window = period_days.get(signal_period, 20)
+        low, high = self.ax.get_xlim()
+        start, end = mdates.num2date(low), mdates.num2date(high)
+        symbol = self.current_symbol
+        interval = self.current_interval
+        base = self.current_data
         
-        if len(hist) < window:
+        def viewport_thread():
+            try:
+                if self.viewport_loader.store is None:
+                    from bar_store import BarStore
+                    self.viewport_loader.store = BarStore()
+                result = self.viewport_loader.load(symbol, start, end, interval)
+            except Exception:
+                result = None
+            self.root.after(0, lambda: self.show_viewport_detail(symbol, base, result))
+        
+        threading.Thread(target=viewport_thread, daemon=True).start()
+        
+    def show_viewport_detail(self, symbol, base, result):
+        if self.current_symbol != symbol or self.current_data is not base:
             return
         
-        close_prices = hist['Close']
-        ema12 = close_prices.ewm(span=12, adjust=False).mean()
-        ema26 = close_prices.ewm(span=26, adjust=False).mean()
-        macd_line = ema12 - ema26
+        if self.detail_line is not None:
+            self.detail_line.remove()
+            self.detail_line = None
         
-        rolling_high = hist['High'].rolling(window=window).max()
-        rolling_low = hist['Low'].rolling(window=window).min()
+        if result is not None:
+            interval, detail = result
+            self.ax.set_autoscale_on(False)
+            self.detail_line, = self.ax.plot(detail.index, detail['Close'], linewidth=1, color='black',
+                                             label=f'明细 ({interval})')
         
-        buy_signals = []
-        sell_signals = []
+        self.canvas.draw_idle()
         
-        for i in range(window, len(hist)):
-            current_high = hist['High'].iloc[i]
-            current_low = hist['Low'].iloc[i]
-            current_macd = macd_line.iloc[i]
-            
-            prev_rolling_high = rolling_high.iloc[i-1]
-            prev_rolling_low = rolling_low.iloc[i-1]
-            
-            if current_high > prev_rolling_high and current_macd > 0:
-                buy_signals.append((hist.index[i], current_high))
-            
-            if current_low < prev_rolling_low and current_macd < 0:
-                sell_signals.append((hist.index[i], current_low))
-        
-        if buy_signals:
-            buy_dates, buy_prices = zip(*buy_signals)
-            self.ax.scatter(buy_dates, buy_prices, marker='^', color='green', 
-                          s=100, label='买入 (B)', zorder=5)
-            
-            for date, price in buy_signals:
-                self.ax.annotate('B', xy=(date, price), xytext=(0, 10),
-                              textcoords='offset points', fontsize=10, fontweight='bold',
-                              color='green', ha='center', va='bottom')
-        
-        if sell_signals:
-            sell_dates, sell_prices = zip(*sell_signals)
-            self.ax.scatter(sell_dates, sell_prices, marker='v', color='red',
-                          s=100, label='卖出 (S)', zorder=5)
-            
-            for date, price in sell_signals:
-                self.ax.annotate('S', xy=(date, price), xytext=(0, -15),
-                              textcoords='offset points', fontsize=10, fontweight='bold',
-                              color='red', ha='center', va='top')
+    def layout_axes(self, show_volume):
+        if hasattr(self, 'ax') and show_volume == (self.volume_ax is not None):
+            return
         
-        if buy_signals or sell_signals:
-            self.ax.legend()
+        self.figure.clear()
+        if show_volume:
+            grid = self.figure.add_gridspec(3, 1, height_ratios=[3, 1, 2])
+            self.ax = self.figure.add_subplot(grid[0])
+            self.volume_ax = self.figure.add_subplot(grid[1], sharex=self.ax)
+            self.macd_ax = self.figure.add_subplot(grid[2])
+        else:
+            self.ax = self.figure.add_subplot(211)
+            self.volume_ax = None
+            self.macd_ax = self.figure.add_subplot(212)
         
-    def plot_macd(self, hist):
-        close_prices = hist['Close']
+    def plot_volume_panel(self, hist):
+        self.renderer.plot_volume_panel(self.volume_ax, hist)
         
-        ema12 = close_prices.ewm(span=12, adjust=False).mean()
-        ema26 = close_prices.ewm(span=26, adjust=False).mean()
+    def plot_line_chart(self, hist):
+        self.renderer.plot_line_chart(self.ax, hist)
         
-        macd_line = ema12 - ema26
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
-        histogram = macd_line - signal_line
+    def plot_candlestick_chart(self, hist):
+        self.renderer.plot_candlestick_chart(self.ax, hist)
         
-        self.macd_ax.plot(macd_line.index, macd_line, label='MACD', 
-                        linewidth=1.5, color='blue')
-        self.macd_ax.plot(signal_line.index, signal_line, label='信号线', 
-                        linewidth=1.5, color='orange')
+    def plot_volume_chart(self, hist):
+        self.renderer.plot_volume_chart(self.ax, hist)
         
-        colors = ['green' if h > 0 else 'red' for h in histogram]
-        self.macd_ax.bar(histogram.index, histogram, color=colors, alpha=0.6, label='柱状图')
+    def plot_moving_averages(self, hist):
+        self.renderer.plot_moving_averages(self.ax, self.get_indicators(hist)["moving_averages"])
         
-        self.macd_ax.axhline(y=0, color='black', linestyle='--', linewidth=0.5, alpha=0.5)
+    def plot_bollinger_bands(self, hist):
+        self.renderer.plot_bollinger_bands(self.ax, self.get_indicators(hist)["bollinger"])
         
-        self.macd_ax.set_title('MACD指标', fontsize=12, fontweight='bold')
-        self.macd_ax.set_xlabel('日期', fontsize=9)
-        self.macd_ax.set_ylabel('MACD值', fontsize=9)
-        self.macd_ax.grid(True, alpha=0.3)
-        self.macd_ax.legend(loc='upper left', fontsize=8)
+    def plot_buy_sell_signals(self, hist):
+        self.renderer.plot_buy_sell_signals(self.ax, self.get_indicators(hist)["signals"])
         
-        self.macd_ax.tick_params(axis='x', labelsize=8)
-        self.macd_ax.tick_params(axis='y', labelsize=8)
+    def plot_macd(self, hist):
+        self.renderer.plot_macd(self.macd_ax, self.get_indicators(hist)["macd"])
         
     def save_chart(self):
-        if self.current_data is None:
+        if self.current_data is None or self.figure is None:
             messagebox.showwarning("警告", "请先获取数据")
             return
         
@@ -407,26 +618,69 @@ class LeapsGUI:
             messagebox.showinfo("成功", f"图表已保存至: {file_path}")
             
     def export_data(self):
+        from data_export import export_frames, ExportCancelled
+        
         if self.current_data is None:
             messagebox.showwarning("警告", "请先获取数据")
             return
         
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("Feather files", "*.feather"),
+                       ("Excel files", "*.xlsx"), ("All files", "*.*")]
         )
         
-        if file_path:
-            if file_path.endswith('.xlsx'):
-                self.current_data.to_excel(file_path)
-            else:
-                self.current_data.to_csv(file_path)
-            messagebox.showinfo("成功", f"数据已导出至: {file_path}")
+        if not file_path:
+            return
+        
+        data = self.current_data
+        cancel_event = threading.Event()
+        dialog, progress_bar = self.create_export_dialog(cancel_event)
+        
+        def on_progress(rows, total):
+            self.root.after(0, lambda: self.update_export_progress(progress_bar, rows, total))
+        
+        def export_thread():
+            try:
+                export_frames(data, file_path, progress=on_progress, cancel_event=cancel_event)
+                self.root.after(0, lambda: messagebox.showinfo("成功", f"数据已导出至: {file_path}"))
+            except ExportCancelled:
+                pass
+            except Exception as e:
+                message = f"导出数据时出错: {str(e)}"
+                self.root.after(0, lambda: self.show_error(message))
+            finally:
+                self.root.after(0, dialog.destroy)
+        
+        threading.Thread(target=export_thread, daemon=True).start()
+        
+    def create_export_dialog(self, cancel_event):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("导出数据")
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        
+        ttk.Label(dialog, text="正在导出数据...").pack(padx=20, pady=(15, 5))
+        progress_bar = ttk.Progressbar(dialog, length=300, mode='determinate', maximum=100)
+        progress_bar.pack(padx=20, pady=5)
+        ttk.Button(dialog, text="取消", command=cancel_event.set).pack(pady=(5, 15))
+        dialog.protocol("WM_DELETE_WINDOW", cancel_event.set)
+        
+        return dialog, progress_bar
+        
+    def update_export_progress(self, progress_bar, rows, total):
+        if not progress_bar.winfo_exists():
+            return
+        if total:
+            progress_bar['value'] = rows * 100 / total
+        else:
+            progress_bar.step(1)
 
 
 def main():
     root = tk.Tk()
-    app = LeapsGUI(root)
+    cache_mb = os.environ.get("LEAPS_CACHE_MB")
+    app = LeapsGUI(root, cache_bytes=int(float(cache_mb) * 1024 * 1024) if cache_mb else DEFAULT_MAX_BYTES)
     root.mainloop()
 
 
@@ -4,10 +4,10 @@ from tkinter import filedialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
 import threading
+from indicators import signal_window
+from market_data_generator import generate_ohlcv
+from trading_calendar import period_bars
 
 
 class LeapsGUITest:
@@ -168,50 +168,7 @@ class LeapsGUITest:
         threading.Thread(target=fetch_thread, daemon=True).start()
         
     def generate_sample_data(self, symbol, period):
-        period_days = {
-            '1mo': 30,
-            '3mo': 90,
-            '6mo': 180,
-            '1y': 365,
-            '2y': 730,
-            '5y': 1825,
-            '10y': 3650,
-            'ytd': 365,
-            'max': 1825
-        }
-        
-        days = period_days.get(period, 365)
-        start_date = datetime.now() - timedelta(days=days)
-        dates = pd.date_range(start=start_date, periods=int(days*0.7), freq='B')
-        
-        np.random.seed(hash(symbol) % 10000)
-        
-        base_prices = {
-            'AAPL': 180.0, 'GOOGL': 140.0, 'MSFT': 380.0, 'AMZN': 170.0,
-            'TSLA': 240.0, 'META': 480.0, 'NVDA': 880.0, 'NFLX': 550.0,
-            'ADBE': 550.0, 'INTC': 45.0
-        }
-        
-        initial_price = base_prices.get(symbol, 100.0)
-        returns = np.random.normal(0.0005, 0.02, len(dates))
-        
-        prices = [initial_price]
-        for ret in returns[1:]:
-            prices.append(prices[-1] * (1 + ret))
-        
-        hist = pd.DataFrame({
-            'Open': [p * (1 + np.random.uniform(-0.01, 0.01)) for p in prices],
-            'High': [p * (1 + np.random.uniform(0, 0.02)) for p in prices],
-            'Low': [p * (1 - np.random.uniform(0, 0.02)) for p in prices],
-            'Close': prices,
-            'Volume': [int(np.random.uniform(1000000, 5000000)) for _ in range(len(dates))]
-        }, index=dates)
-        
-        hist = hist[hist['High'] >= hist['Low']]
-        hist = hist[hist['High'] >= hist['Open']]
-        hist = hist[hist['High'] >= hist['Close']]
-        hist = hist[hist['Low'] <= hist['Open']]
-        hist = hist[hist['Low'] <= hist['Close']]
+        hist = generate_ohlcv(symbol, bars=period_bars(period), tz=None)
         
         return hist
         
@@ -347,14 +304,7 @@ class LeapsGUITest:
     def plot_buy_sell_signals(self, hist):
         signal_period = self.signal_period_var.get()
         
-        period_days = {
-            '1mo': 20,
-            '3mo': 60,
-            '6mo': 120,
-            '1y': 250
-        }
-        
-        window = period_days.get(signal_period, 20)
+        window = signal_window(signal_period)
         
         if len(hist) < window:
             return
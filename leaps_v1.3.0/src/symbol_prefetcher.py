@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from data_cache import estimate_bytes
+
+
+RECENT_SYMBOLS_PATH = os.path.join(os.path.expanduser("~"), ".leaps", "recent_symbols.json")
+
+
+def load_recent_symbols(path: str = RECENT_SYMBOLS_PATH, limit: int = 10) -> List[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            symbols = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    if not isinstance(symbols, list):
+        return []
+    return [str(s).upper() for s in symbols if s][:limit]
+
+
+def save_recent_symbols(symbols: List[str], path: str = RECENT_SYMBOLS_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(symbols, f)
+    except OSError:
+        pass
+
+
+def remember_symbol(recent: List[str], symbol: str, limit: int = 10) -> List[str]:
+    symbol = symbol.upper()
+    return ([symbol] + [s for s in recent if s != symbol])[:limit]
+
+
+class PrefetchBudget:
+    def __init__(self, max_requests: int = 20, max_bytes: int = 32 * 1024 * 1024,
+                 min_request_interval: float = 0.5):
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.min_request_interval = min_request_interval
+
+    def allows(self, requests_made: int, bytes_used: int) -> bool:
+        return requests_made < self.max_requests and bytes_used < self.max_bytes
+
+
+class SymbolPrefetcher:
+    def __init__(self, scheduler, budget: Optional[PrefetchBudget] = None,
+                 on_ready: Optional[Callable[[str], None]] = None):
+        self.scheduler = scheduler
+        self.cache = scheduler.cache
+        self.budget = budget or PrefetchBudget()
+        self.on_ready = on_ready
+        self.requests_made = 0
+        self.bytes_used = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, symbols: Iterable[str], period: str, interval: str, signal_window: int = 20):
+        self.stop()
+        self._stop.clear()
+
+        ordered = []
+        for symbol in symbols:
+            symbol = symbol.upper()
+            if symbol and symbol not in ordered:
+                ordered.append(symbol)
+
+        self._thread = threading.Thread(target=self._run, args=(ordered, period, interval, signal_window),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=0.1)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, symbols: List[str], period: str, interval: str, signal_window: int):
+        last_request = 0.0
+
+        for symbol in symbols:
+            if self._stop.is_set():
+                return
+            if self.cache.contains(symbol, period, interval):
+                continue
+            if not self.budget.allows(self.requests_made, self.bytes_used):
+                return
+
+            wait = self.budget.min_request_interval - (time.time() - last_request)
+            if wait > 0 and self._stop.wait(wait):
+                return
+
+            last_request = time.time()
+            self.requests_made += 1
+            entry = self.scheduler.request(symbol, period, interval, signal_window).result()
+
+            if "error" in entry:
+                continue
+
+            self.bytes_used += entry.get("bytes") or estimate_bytes((entry["data"], entry["indicators"]))
+
+            if self.on_ready is not None:
+                self.on_ready(symbol)
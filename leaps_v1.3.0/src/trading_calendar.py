@@ -0,0 +1,214 @@
+import math
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+MARKET_TZ = "America/New_York"
+
+SESSION_OPEN_MINUTE = 570
+
+SESSION_MINUTES = 390
+
+EARLY_CLOSE_MINUTES = 210
+
+INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+
+CALENDAR_FREQ = {"1wk": "W-MON", "1mo": "MS", "3mo": "QS"}
+
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10)
+}
+
+# 上游的 max 返回上市以来的全部数据；本地生成或估算时按20年处理
+MAX_PERIOD_YEARS = 20
+
+FIRST_YEAR = 1970
+
+LAST_YEAR = 2100
+
+SPECIAL_CLOSURES = (
+    "1985-09-27", "1994-04-27", "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",
+    "2004-06-11", "2007-01-02", "2012-10-29", "2012-10-30", "2018-12-05", "2025-01-09"
+)
+
+
+def easter(year: int) -> date:
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    m = (32 + 2 * e + 2 * i - h - k) % 7
+    n = (a + 11 * h + 22 * m) // 451
+    month, day = divmod(h + m - 7 * n + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def year_holidays(year: int) -> List[date]:
+    days = []
+    # 元旦是周六时，前一年的12月31日照常交易
+    if date(year, 1, 1).weekday() != 5:
+        days.append(_observed(date(year, 1, 1)))
+    if year >= 1998:
+        days.append(_nth_weekday(year, 1, 0, 3))
+    days.append(_nth_weekday(year, 2, 0, 3))
+    days.append(easter(year) - timedelta(days=2))
+    days.append(_last_weekday(year, 5, 0))
+    if year >= 2022:
+        days.append(_observed(date(year, 6, 19)))
+    days.append(_observed(date(year, 7, 4)))
+    days.append(_nth_weekday(year, 9, 0, 1))
+    days.append(_nth_weekday(year, 11, 3, 4))
+    days.append(_observed(date(year, 12, 25)))
+    days.extend(date.fromisoformat(day) for day in SPECIAL_CLOSURES if day.startswith(str(year)))
+    return sorted(days)
+
+
+def year_early_closes(year: int) -> List[date]:
+    days = []
+    # 7月3日和12月24日逢周一至周四提前收盘；逢周五时当天已是补休假日
+    if date(year, 7, 3).weekday() < 4:
+        days.append(date(year, 7, 3))
+    days.append(_nth_weekday(year, 11, 3, 4) + timedelta(days=1))
+    if date(year, 12, 24).weekday() < 4:
+        days.append(date(year, 12, 24))
+    return days
+
+
+@lru_cache(maxsize=None)
+def _calendar() -> Tuple[np.busdaycalendar, np.ndarray]:
+    holidays = [day for year in range(FIRST_YEAR, LAST_YEAR + 1) for day in year_holidays(year)]
+    early = [day for year in range(FIRST_YEAR, LAST_YEAR + 1) for day in year_early_closes(year)]
+    return np.busdaycalendar(holidays=np.array(holidays, dtype="datetime64[D]")), np.array(early, dtype="datetime64[D]")
+
+
+def _day(value) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def _market_time(value=None) -> pd.Timestamp:
+    stamp = pd.Timestamp.now(tz=MARKET_TZ) if value is None else pd.Timestamp(value)
+    return stamp.tz_localize(MARKET_TZ) if stamp.tzinfo is None else stamp.tz_convert(MARKET_TZ)
+
+
+def is_trading_day(day) -> bool:
+    return bool(np.is_busday(_day(day), busdaycal=_calendar()[0]))
+
+
+def is_early_close(day) -> bool:
+    return bool(np.isin(_day(day), _calendar()[1]))
+
+
+def session_close_minute(day) -> int:
+    return SESSION_OPEN_MINUTE + (EARLY_CLOSE_MINUTES if is_early_close(day) else SESSION_MINUTES)
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    now = _market_time(now)
+    minute = now.hour * 60 + now.minute
+    return is_trading_day(now) and SESSION_OPEN_MINUTE <= minute < session_close_minute(now)
+
+
+def trading_days(start, end) -> pd.DatetimeIndex:
+    days = np.arange(_day(start), _day(end) + 1)
+    days = days[np.is_busday(days, busdaycal=_calendar()[0])]
+    return pd.DatetimeIndex(days, name="Date").as_unit("ns").tz_localize(MARKET_TZ)
+
+
+def count_trading_days(start, end) -> int:
+    return int(np.busday_count(_day(start), _day(end) + 1, busdaycal=_calendar()[0]))
+
+
+def busday_count(begin: np.ndarray, end: np.ndarray) -> np.ndarray:
+    return np.busday_count(begin, end, busdaycal=_calendar()[0])
+
+
+def shift_trading_days(day, count: int) -> pd.Timestamp:
+    shifted = np.busday_offset(_day(day), count, roll="backward" if count <= 0 else "forward", busdaycal=_calendar()[0])
+    return pd.Timestamp(shifted).tz_localize(MARKET_TZ)
+
+
+def _intraday_times(days: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+    minutes = np.arange(0, SESSION_MINUTES, INTRADAY_MINUTES[interval])
+    early = np.isin(days.tz_localize(None).to_numpy().astype("datetime64[D]"), _calendar()[1])
+    session = np.repeat(np.where(early, EARLY_CLOSE_MINUTES, SESSION_MINUTES), len(minutes))
+    offsets = np.tile(minutes, len(days))
+
+    times = days.repeat(len(minutes)) + pd.to_timedelta(offsets + SESSION_OPEN_MINUTE, unit="min")
+    return times[offsets < session]
+
+
+def bar_times(start, end, interval: str = "1d") -> pd.DatetimeIndex:
+    start, end = _market_time(start), _market_time(end)
+    if interval in CALENDAR_FREQ:
+        times = pd.date_range(start.normalize(), end.normalize(), freq=CALENDAR_FREQ[interval], tz=MARKET_TZ)
+    elif interval in INTRADAY_MINUTES:
+        times = _intraday_times(trading_days(start, end), interval)
+    else:
+        times = trading_days(start, end)[::5 if interval == "5d" else 1]
+
+    return pd.DatetimeIndex(times[(times >= start) & (times <= end)], name="Date")
+
+
+def recent_bar_times(bars: int, interval: str = "1d", end=None) -> pd.DatetimeIndex:
+    end = _market_time(end)
+    bars = max(bars, 0)
+    if interval in CALENDAR_FREQ:
+        return pd.DatetimeIndex(pd.date_range(end=end.normalize(), periods=bars, freq=CALENDAR_FREQ[interval], tz=MARKET_TZ),
+                                name="Date")
+
+    per_day = math.ceil(SESSION_MINUTES / INTRADAY_MINUTES[interval]) if interval in INTRADAY_MINUTES else 1
+    step = 5 if interval == "5d" else 1
+    # 提前收盘的交易日K线较少，多取几天
+    days = math.ceil(bars * step / per_day * 1.01) + 2
+    times = bar_times(shift_trading_days(end, -days), end, interval)
+    return times[len(times) - bars:]
+
+
+def resolve_period(period: str, interval: str = "1d", end=None) -> Tuple[pd.Timestamp, pd.Timestamp, int]:
+    end = _market_time(end)
+    if period == "ytd":
+        start = end.normalize().replace(month=1, day=1)
+    elif period == "max":
+        start = end.normalize() - pd.DateOffset(years=MAX_PERIOD_YEARS)
+    elif period.endswith("d") and period[:-1].isdigit():
+        start = shift_trading_days(end, 1 - int(period[:-1]))
+    elif period in PERIOD_OFFSETS:
+        start = end - PERIOD_OFFSETS[period]
+    else:
+        raise ValueError(f"未知的时间周期: {period}")
+
+    return start, end, len(bar_times(start, end, interval))
+
+
+def period_bars(period: str, interval: str = "1d", end=None) -> int:
+    return resolve_period(period, interval, end)[2]
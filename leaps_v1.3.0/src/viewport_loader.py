@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+DETAIL_INTERVALS = [
+    (timedelta(days=2), "1m", timedelta(days=7)),
+    (timedelta(days=10), "5m", timedelta(days=59)),
+    (timedelta(days=45), "30m", timedelta(days=59)),
+    (timedelta(days=200), "1h", timedelta(days=729))
+]
+
+INTERVAL_RANK = ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "5d", "1wk", "1mo", "3mo"]
+
+
+def choose_interval(start: datetime, end: datetime, now: Optional[datetime] = None) -> Optional[str]:
+    now = now or datetime.now(timezone.utc)
+    span = end - start
+
+    for max_span, interval, lookback in DETAIL_INTERVALS:
+        if span <= max_span and now - start <= lookback:
+            return interval
+    return None
+
+
+def is_finer(interval: str, base_interval: str) -> bool:
+    if interval not in INTERVAL_RANK or base_interval not in INTERVAL_RANK:
+        return False
+    return INTERVAL_RANK.index(interval) < INTERVAL_RANK.index(base_interval)
+
+
+class ViewportLoader:
+    def __init__(self, fetcher, store=None, padding: float = 0.5):
+        self.fetcher = fetcher
+        self.store = store
+        self.padding = padding
+        self._detail: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def load(self, symbol: str, start: datetime, end: datetime, base_interval: str) -> Optional[Tuple[str, pd.DataFrame]]:
+        interval = choose_interval(start, end)
+        if interval is None or not is_finer(interval, base_interval):
+            self.release(symbol)
+            return None
+
+        pad = (end - start) * self.padding
+        window_start, window_end = start - pad, end + pad
+        key = (symbol.upper(), interval)
+
+        with self._lock:
+            for other in [k for k in self._detail if k[0] == key[0] and k != key]:
+                del self._detail[other]
+            detail = self._detail.get(key)
+
+        if detail is None or not self._covers(detail, start, end):
+            detail = self._load_range(symbol, interval, window_start, window_end)
+            if detail is None or detail.empty:
+                return None
+
+        range_start = max(detail.attrs["range_start"], window_start)
+        range_end = min(detail.attrs["range_end"], window_end)
+        detail = detail[(detail.index >= range_start) & (detail.index <= range_end)]
+        detail.attrs.update(range_start=range_start, range_end=range_end)
+
+        with self._lock:
+            self._detail[key] = detail
+
+        return interval, detail[(detail.index >= start) & (detail.index <= end)]
+
+    def release(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self._detail.clear()
+            else:
+                for key in [k for k in self._detail if k[0] == symbol.upper()]:
+                    del self._detail[key]
+
+    def _covers(self, detail: pd.DataFrame, start: datetime, end: datetime) -> bool:
+        return detail.attrs["range_start"] <= start and detail.attrs["range_end"] >= end
+
+    def _load_range(self, symbol: str, interval: str, start: datetime, end: datetime) -> Optional[pd.DataFrame]:
+        import pandas as pd
+
+        data = None
+        if self.store is not None:
+            data = self.store.load_range(self.fetcher, symbol, interval, start, end)
+
+        if data is None or data.empty:
+            data = self.fetcher.get_bars_range(symbol, start, end, interval)
+
+        if not isinstance(data, pd.DataFrame):
+            return None
+
+        data.attrs["range_start"] = start
+        data.attrs["range_end"] = end
+        return data
@@ -0,0 +1,228 @@
+import re
+import time
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+
+class WatchlistPanel:
+    def __init__(self, parent, symbol):
+        self.symbol = symbol
+        self.entry = None
+        self.dirty = False
+        self.last_request = 0.0
+
+        self.frame = ttk.Frame(parent, relief=tk.GROOVE, borderwidth=1, padding=2)
+        self.label = tk.Label(self.frame, text=symbol, font=('Arial', 9, 'bold'), anchor=tk.W)
+        self.label.pack(fill=tk.X)
+
+        self.figure = Figure(figsize=(2.4, 1.6), dpi=72)
+        self.price_ax = self.figure.add_axes([0.02, 0.38, 0.96, 0.6])
+        self.macd_ax = self.figure.add_axes([0.02, 0.02, 0.96, 0.32])
+        for ax in (self.price_ax, self.macd_ax):
+            ax.set_xticks([])
+            ax.set_yticks([])
+
+        self.price_line, = self.price_ax.plot([], [], linewidth=1, color='blue')
+        self.macd_line, = self.macd_ax.plot([], [], linewidth=0.8, color='blue')
+        self.signal_line, = self.macd_ax.plot([], [], linewidth=0.8, color='orange')
+        self.histogram = []
+
+        self.canvas = FigureCanvasTkAgg(self.figure, self.frame)
+        self.canvas.get_tk_widget().pack()
+
+    def set_entry(self, entry):
+        self.entry = entry
+        self.dirty = True
+
+    def draw(self):
+        self.dirty = False
+        entry = self.entry
+
+        if entry is None or "error" in entry:
+            self.label.config(text=f"{self.symbol}  获取失败", fg='gray')
+            return
+
+        close = entry["data"]['Close'].to_numpy()
+        macd_line, signal_line, histogram = entry["indicators"]["macd"]
+        histogram = histogram.to_numpy()
+        x = np.arange(len(close))
+
+        self.price_line.set_data(x, close)
+        self.macd_line.set_data(x, macd_line.to_numpy())
+        self.signal_line.set_data(x, signal_line.to_numpy())
+
+        for collection in self.histogram:
+            collection.remove()
+        self.histogram = [
+            self.macd_ax.fill_between(x, histogram, 0, where=histogram > 0, color='green', alpha=0.5, linewidth=0),
+            self.macd_ax.fill_between(x, histogram, 0, where=histogram <= 0, color='red', alpha=0.5, linewidth=0)
+        ]
+
+        for ax in (self.price_ax, self.macd_ax):
+            ax.relim()
+            ax.autoscale_view()
+
+        change = (close[-1] - close[0]) / close[0] * 100
+        self.label.config(text=f"{self.symbol}  ${close[-1]:.2f}  {change:+.2f}%",
+                          fg='green' if change >= 0 else 'red')
+        self.canvas.draw()
+
+    def destroy(self):
+        self.frame.destroy()
+
+
+class WatchlistWindow:
+    FRAME_MS = 33
+    MAX_DRAWS_PER_FRAME = 6
+    REFRESH_TICK_MS = 5000
+    OFFSCREEN_REFRESH_FACTOR = 5
+
+    def __init__(self, root, scheduler, symbols, period="5d", interval="15m", columns=5, refresh_seconds=60):
+        self.scheduler = scheduler
+        self.period = period
+        self.interval = interval
+        self.columns = columns
+        self.refresh_seconds = refresh_seconds
+        self.panels = OrderedDict()
+        self._frame_job = None
+        self._refresh_job = None
+        self._closed = False
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Leaps - 自选股")
+        self.window.geometry("1300x800")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.create_toolbar()
+        self.create_grid()
+
+        self.set_symbols(symbols)
+        self.refresh()
+
+    def create_toolbar(self):
+        toolbar = ttk.Frame(self.window, padding="5")
+        toolbar.pack(fill=tk.X)
+
+        ttk.Label(toolbar, text="股票代码:").pack(side=tk.LEFT)
+        self.symbols_entry = ttk.Entry(toolbar, width=80)
+        self.symbols_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        ttk.Button(toolbar, text="应用", command=self.apply_symbols).pack(side=tk.LEFT)
+
+    def create_grid(self):
+        container = ttk.Frame(self.window)
+        container.pack(fill=tk.BOTH, expand=True)
+
+        self.grid_canvas = tk.Canvas(container, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(container, orient=tk.VERTICAL, command=self.grid_canvas.yview)
+        self.grid_canvas.configure(yscrollcommand=lambda *args: self.on_scroll(scrollbar, *args))
+
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.grid_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.grid_frame = ttk.Frame(self.grid_canvas)
+        self.grid_canvas.create_window((0, 0), window=self.grid_frame, anchor=tk.NW)
+        self.grid_frame.bind("<Configure>", lambda e: self.grid_canvas.configure(scrollregion=self.grid_canvas.bbox("all")))
+
+        self.window.bind("<MouseWheel>", lambda e: self.grid_canvas.yview_scroll(int(-e.delta / 120), "units"))
+        self.window.bind("<Button-4>", lambda e: self.grid_canvas.yview_scroll(-1, "units"))
+        self.window.bind("<Button-5>", lambda e: self.grid_canvas.yview_scroll(1, "units"))
+
+    def on_scroll(self, scrollbar, *args):
+        scrollbar.set(*args)
+        self.request_frame()
+
+    def apply_symbols(self):
+        symbols = [s for s in re.split(r"[\s,;]+", self.symbols_entry.get().upper()) if s]
+        self.set_symbols(symbols)
+        self.refresh()
+
+    def set_symbols(self, symbols):
+        ordered = list(OrderedDict.fromkeys(s.upper() for s in symbols))
+
+        for symbol in list(self.panels):
+            if symbol not in ordered:
+                self.panels.pop(symbol).destroy()
+
+        panels = OrderedDict()
+        for i, symbol in enumerate(ordered):
+            panel = self.panels.get(symbol) or WatchlistPanel(self.grid_frame, symbol)
+            panel.frame.grid(row=i // self.columns, column=i % self.columns, padx=2, pady=2)
+            panels[symbol] = panel
+        self.panels = panels
+
+        self.symbols_entry.delete(0, tk.END)
+        self.symbols_entry.insert(0, ", ".join(ordered))
+
+    def visible_symbols(self):
+        top = self.grid_canvas.canvasy(0)
+        bottom = top + self.grid_canvas.winfo_height()
+
+        visible = set()
+        for symbol, panel in self.panels.items():
+            y = panel.frame.winfo_y()
+            if y + panel.frame.winfo_height() >= top and y <= bottom:
+                visible.add(symbol)
+        return visible
+
+    def refresh(self):
+        if self._closed:
+            return
+
+        now = time.time()
+        visible = self.visible_symbols()
+
+        for symbol, panel in self.panels.items():
+            max_age = self.refresh_seconds
+            if symbol not in visible:
+                max_age *= self.OFFSCREEN_REFRESH_FACTOR
+            if panel.entry is not None and now - panel.last_request < max_age:
+                continue
+
+            panel.last_request = now
+            future = self.scheduler.request(symbol, self.period, self.interval, force=panel.entry is not None)
+            future.add_done_callback(lambda f, s=symbol: self._closed or self.window.after(0, self.on_data, s, f.result()))
+
+        if self._refresh_job is not None:
+            self.window.after_cancel(self._refresh_job)
+        self._refresh_job = self.window.after(self.REFRESH_TICK_MS, self.refresh)
+
+    def on_data(self, symbol, entry):
+        panel = self.panels.get(symbol)
+        if self._closed or panel is None:
+            return
+
+        panel.set_entry(entry)
+        self.request_frame()
+
+    def request_frame(self):
+        if self._frame_job is None and not self._closed:
+            self._frame_job = self.window.after(self.FRAME_MS, self.flush_frame)
+
+    def flush_frame(self):
+        self._frame_job = None
+        visible = self.visible_symbols()
+
+        pending = [panel for symbol, panel in self.panels.items() if panel.dirty and symbol in visible]
+        for panel in pending[:self.MAX_DRAWS_PER_FRAME]:
+            panel.draw()
+
+        if len(pending) > self.MAX_DRAWS_PER_FRAME:
+            self.request_frame()
+
+    def is_open(self):
+        return not self._closed
+
+    def focus(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        self._closed = True
+        for job in (self._frame_job, self._refresh_job):
+            if job is not None:
+                self.window.after_cancel(job)
+        self.window.destroy()
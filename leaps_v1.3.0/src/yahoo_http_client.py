@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+_local = threading.local()
+
+
+def get_session():
+    import requests
+
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+        session.headers["User-Agent"] = "Mozilla/5.0"
+    return session
+
+
+def _timestamp(value) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp())
+
+
+class HttpTicker:
+    def __init__(self, symbol: str, base_url: str, timeout: float = 30):
+        self.symbol = symbol.upper()
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._info = None
+
+    def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        response = get_session().get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        if response.status_code == 429:
+            raise RuntimeError("Too Many Requests. Rate limited. Try after a while.")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+    def history(self, period: Optional[str] = None, interval: str = "1d", start=None, end=None,
+                auto_adjust: bool = True) -> pd.DataFrame:
+        import numpy as np
+        import pandas as pd
+
+        params = {"interval": interval}
+        if start is not None:
+            params["period1"] = _timestamp(start)
+            params["period2"] = _timestamp(end) if end is not None else int(datetime.now().timestamp())
+        else:
+            params["range"] = period or "1mo"
+
+        result = (self._get(f"/v8/finance/chart/{self.symbol}", params)["chart"]["result"] or [{}])[0]
+        timestamps = result.get("timestamp") or []
+        quote = (result.get("indicators", {}).get("quote") or [{}])[0]
+        timezone = result.get("meta", {}).get("exchangeTimezoneName", "America/New_York")
+
+        index = pd.to_datetime(np.asarray(timestamps, dtype="int64"), unit="s", utc=True).tz_convert(timezone)
+        frame = pd.DataFrame({
+            "Open": np.asarray(quote.get("open", []), dtype=float),
+            "High": np.asarray(quote.get("high", []), dtype=float),
+            "Low": np.asarray(quote.get("low", []), dtype=float),
+            "Close": np.asarray(quote.get("close", []), dtype=float),
+            "Volume": np.asarray(quote.get("volume", []), dtype="int64")
+        }, index=pd.DatetimeIndex(index, name="Date"))
+        frame["Dividends"] = 0.0
+        frame["Stock Splits"] = 0.0
+        return frame
+
+    @property
+    def info(self) -> Dict:
+        if self._info is None:
+            modules = "price,summaryProfile,summaryDetail"
+            result = (self._get(f"/v10/finance/quoteSummary/{self.symbol}", {"modules": modules})
+                      ["quoteSummary"]["result"] or [{}])[0]
+            price = result.get("price", {})
+            profile = result.get("summaryProfile", {})
+            detail = result.get("summaryDetail", {})
+
+            self._info = {
+                "symbol": price.get("symbol", self.symbol),
+                "longName": price.get("longName"),
+                "shortName": price.get("shortName"),
+                "currency": price.get("currency", "USD"),
+                "exchange": price.get("exchange"),
+                "currentPrice": price.get("regularMarketPrice"),
+                "marketCap": detail.get("marketCap", price.get("marketCap")),
+                "previousClose": detail.get("previousClose"),
+                "open": detail.get("open"),
+                "dayHigh": detail.get("dayHigh"),
+                "dayLow": detail.get("dayLow"),
+                "volume": detail.get("volume"),
+                "fiftyTwoWeekHigh": detail.get("fiftyTwoWeekHigh"),
+                "fiftyTwoWeekLow": detail.get("fiftyTwoWeekLow"),
+                "trailingPE": detail.get("trailingPE"),
+                "dividendYield": detail.get("dividendYield"),
+                "beta": detail.get("beta"),
+                "sector": profile.get("sector"),
+                "industry": profile.get("industry"),
+                "website": profile.get("website"),
+                "longBusinessSummary": profile.get("longBusinessSummary")
+            }
+        return self._info
+
+    @property
+    def actions(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame({"Dividends": [], "Stock Splits": []}, index=pd.DatetimeIndex([], name="Date"))
+
+    @property
+    def news(self):
+        return []
+
+    income_stmt = None
+    balance_sheet = None
+    cashflow = None
+
+
+def http_ticker_factory(base_url: str):
+    return lambda symbol: HttpTicker(symbol, base_url)
@@ -0,0 +1,286 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from csv_loader import read_bar_csv
+from market_data_generator import base_price, generate_frame, symbol_seed
+from trading_calendar import MARKET_TZ, bar_times, resolve_period
+
+
+class StubData:
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = data_dir
+        self._recorded: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def recorded(self, symbol: str) -> Optional[pd.DataFrame]:
+        if not self.data_dir:
+            return None
+
+        with self._lock:
+            if symbol not in self._recorded:
+                path = os.path.join(self.data_dir, f"{symbol}.csv")
+                frame = None
+                if os.path.exists(path):
+                    frame = read_bar_csv(path)
+                    if frame.index.tz is None:
+                        frame.index = frame.index.tz_localize(MARKET_TZ)
+                self._recorded[symbol] = frame
+            return self._recorded[symbol]
+
+    def bars(self, symbol: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        recorded = self.recorded(symbol)
+        if recorded is not None:
+            return recorded[(recorded.index >= start) & (recorded.index <= end)]
+        times = bar_times(start, end, interval)
+        return generate_frame(times, symbol_seed(symbol) + len(times), interval, start_price=base_price(symbol))
+
+    def last_price(self, symbol: str) -> float:
+        now = pd.Timestamp.now(tz=MARKET_TZ)
+        bars = self.bars(symbol, "1d", now - pd.Timedelta(days=10), now)
+        return float(bars["Close"].iloc[-1]) if not bars.empty else 100.0
+
+
+def chart_payload(symbol: str, interval: str, bars: pd.DataFrame) -> Dict:
+    price = float(bars["Close"].iloc[-1]) if not bars.empty else None
+    return {
+        "chart": {
+            "result": [{
+                "meta": {
+                    "currency": "USD",
+                    "symbol": symbol,
+                    "exchangeName": "NMS",
+                    "instrumentType": "EQUITY",
+                    "exchangeTimezoneName": MARKET_TZ,
+                    "regularMarketPrice": price,
+                    "dataGranularity": interval
+                },
+                "timestamp": bars.index.as_unit("s").asi8.tolist(),
+                "indicators": {
+                    "quote": [{
+                        "open": bars["Open"].round(4).tolist(),
+                        "high": bars["High"].round(4).tolist(),
+                        "low": bars["Low"].round(4).tolist(),
+                        "close": bars["Close"].round(4).tolist(),
+                        "volume": bars["Volume"].astype("int64").tolist()
+                    }]
+                }
+            }],
+            "error": None
+        }
+    }
+
+
+def quote_fields(symbol: str, price: float) -> Dict:
+    seed = symbol_seed(symbol)
+    return {
+        "symbol": symbol,
+        "shortName": f"{symbol} Stub Inc.",
+        "longName": f"{symbol} Stub Incorporated",
+        "currency": "USD",
+        "exchange": "NMS",
+        "quoteType": "EQUITY",
+        "regularMarketPrice": round(price, 2),
+        "regularMarketPreviousClose": round(price * 0.99, 2),
+        "regularMarketOpen": round(price * 0.995, 2),
+        "regularMarketDayHigh": round(price * 1.01, 2),
+        "regularMarketDayLow": round(price * 0.98, 2),
+        "regularMarketVolume": 1_000_000 + seed % 9_000_000,
+        "marketCap": int(price * (10**8 + seed % 10**9)),
+        "fiftyTwoWeekHigh": round(price * 1.3, 2),
+        "fiftyTwoWeekLow": round(price * 0.7, 2),
+        "trailingPE": round(10 + seed % 40, 2)
+    }
+
+
+class StubConfig:
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 rate_limit_rate: float = 0, max_rps: Optional[float] = None, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_rps = max_rps
+        self.random = random.Random(seed)
+        self._tokens = max_rps or 0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def take_token(self) -> bool:
+        if not self.max_rps:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rps, self._tokens + (now - self._last_refill) * self.max_rps)
+            self._last_refill = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def draw(self):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 500
+        return delay, 200
+
+
+def make_handler(config: StubConfig, data: StubData):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            delay, status = config.draw()
+            if delay:
+                time.sleep(delay)
+
+            if not config.take_token() or status == 429:
+                self.send_json(429, {"finance": {"error": {"code": "Too Many Requests", "description": "Rate limited"}}})
+                return
+            if status == 500:
+                self.send_json(500, {"finance": {"error": {"code": "Internal Server Error", "description": "Injected error"}}})
+                return
+
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            parts = [part for part in url.path.split("/") if part]
+
+            try:
+                if parts[:3] == ["v8", "finance", "chart"] and len(parts) == 4:
+                    self.send_json(200, self.chart(parts[3].upper(), query))
+                elif parts[:3] == ["v7", "finance", "quote"]:
+                    symbols = [s.strip().upper() for s in query.get("symbols", "").split(",") if s.strip()]
+                    self.send_json(200, {"quoteResponse": {"result": [quote_fields(s, data.last_price(s)) for s in symbols], "error": None}})
+                elif parts[:3] == ["v10", "finance", "quoteSummary"] and len(parts) == 4:
+                    self.send_json(200, self.quote_summary(parts[3].upper()))
+                elif parts[:3] == ["v1", "finance", "search"]:
+                    self.send_json(200, self.search(query.get("q", "")))
+                else:
+                    self.send_json(404, {"finance": {"error": {"code": "Not Found", "description": url.path}}})
+            except Exception as e:
+                self.send_json(500, {"finance": {"error": {"code": "Internal Server Error", "description": str(e)}}})
+
+        def chart(self, symbol: str, query: Dict) -> Dict:
+            interval = query.get("interval", "1d")
+            now = pd.Timestamp.now(tz=MARKET_TZ)
+
+            if "period1" in query:
+                start = pd.Timestamp(int(query["period1"]), unit="s", tz="UTC").tz_convert(MARKET_TZ)
+                end = pd.Timestamp(int(query.get("period2", now.timestamp())), unit="s", tz="UTC").tz_convert(MARKET_TZ)
+            else:
+                try:
+                    start, end, _ = resolve_period(query.get("range", "1mo"), interval, now)
+                except ValueError:
+                    start, end, _ = resolve_period("1mo", interval, now)
+
+            return chart_payload(symbol, interval, data.bars(symbol, interval, start, end))
+
+        def quote_summary(self, symbol: str) -> Dict:
+            fields = quote_fields(symbol, data.last_price(symbol))
+            return {
+                "quoteSummary": {
+                    "result": [{
+                        "price": fields,
+                        "summaryProfile": {
+                            "sector": "Technology",
+                            "industry": "Software",
+                            "website": f"https://www.{symbol.lower()}.example.com",
+                            "longBusinessSummary": f"{fields['longName']} is a synthetic company served by the stub server."
+                        },
+                        "summaryDetail": {
+                            "previousClose": fields["regularMarketPreviousClose"],
+                            "open": fields["regularMarketOpen"],
+                            "dayHigh": fields["regularMarketDayHigh"],
+                            "dayLow": fields["regularMarketDayLow"],
+                            "volume": fields["regularMarketVolume"],
+                            "fiftyTwoWeekHigh": fields["fiftyTwoWeekHigh"],
+                            "fiftyTwoWeekLow": fields["fiftyTwoWeekLow"],
+                            "trailingPE": fields["trailingPE"],
+                            "dividendYield": 0.01,
+                            "beta": 1.1,
+                            "marketCap": fields["marketCap"]
+                        }
+                    }],
+                    "error": None
+                }
+            }
+
+        def search(self, text: str) -> Dict:
+            symbol = text.strip().upper() or "STUB"
+            quotes = [symbol] + [f"{symbol}{suffix}" for suffix in ("A", "B")]
+            return {"quotes": [
+                {"symbol": s, "shortname": f"{s} Stub Inc.", "longname": f"{s} Stub Incorporated",
+                 "exchange": "NMS", "quoteType": "EQUITY"}
+                for s in quotes
+            ]}
+
+        def send_json(self, status: int, payload: Dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_stub_server(port: int = 0, host: str = "127.0.0.1", config: Optional[StubConfig] = None,
+                      data_dir: Optional[str] = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(config or StubConfig(), StubData(data_dir)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaps - 本地模拟 Yahoo Finance 行情服务 (用于压测)")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency-ms", type=float, default=0, help="每个请求的平均延迟 (毫秒)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="延迟随机抖动范围 (毫秒)")
+    parser.add_argument("--error-rate", type=float, default=0, help="返回500错误的概率 (0-1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="随机返回429的概率 (0-1)")
+    parser.add_argument("--max-rps", type=float, default=None, help="每秒最多处理的请求数，超出返回429")
+    parser.add_argument("--data-dir", help="录制数据目录，包含 <代码>.csv 文件；缺失时使用合成数据")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate, args.max_rps, args.seed)
+    server = start_stub_server(args.port, args.host, config, args.data_dir)
+    print(f"模拟行情服务已启动: {server_url(server)}")
+    print(f"使用方法: LEAPS_YAHOO_BASE_URL={server_url(server)} python stock_viewer_gui.py")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import numpy as np
+from bar_file import BarFile, varint_decode, varint_encode, write_bar_file, zigzag_decode, zigzag_encode
+from bar_store import frame_to_records
+from csv_loader import read_bar_csv
+from market_data_generator import generate_ohlcv
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "ADBE_5year_data_sample.csv")
+
+
+def test_varint_round_trip():
+    values = np.array([0, 1, -1, 63, -64, 127, 128, 300, 2**62, -2**63, 2**63 - 1], dtype=np.int64)
+    encoded = varint_encode(zigzag_encode(values))
+    assert len(encoded) < values.nbytes, "变长编码未压缩"
+    assert (zigzag_decode(varint_decode(encoded, len(values))) == values).all(), "变长整数编解码不一致"
+
+
+def test_csv_round_trip_and_size():
+    frame = read_bar_csv(SAMPLE_CSV)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "ADBE.lbar")
+        size = write_bar_file(path, frame, block_rows=128)
+        assert os.path.getsize(SAMPLE_CSV) / size >= 5, "文件压缩比低于5倍"
+
+        expected = frame_to_records(frame)
+        with BarFile(path) as bar_file:
+            records = bar_file.read()
+            assert (records["time"] == expected["time"]).all(), "时间戳不一致"
+            assert (records["volume"] == expected["volume"]).all(), "成交量不一致"
+            for field in ("open", "high", "low", "close"):
+                assert np.abs(records[field] - expected[field]).max() <= 5e-5, f"{field} 价格精度不足"
+
+
+def test_range_read():
+    frame = generate_ohlcv("AAPL", 50_000, "1m", end="2024-06-28 16:00", tz=None)
+    frame.iloc[100, 0] = np.nan
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.lbar")
+        write_bar_file(path, frame, block_rows=1000)
+
+        with BarFile(path) as bar_file:
+            assert np.isnan(bar_file.read()["open"][100]), "缺失值未保留"
+
+            start, end = frame.index[12_345], frame.index[23_456]
+            part = bar_file.read_frame(start, end)
+            assert len(part) == 23_456 - 12_345 + 1, "区间读取行数不正确"
+            assert part.index[0] == start.tz_localize("America/New_York"), "区间起点不正确"
+            assert len(bar_file.read(frame.index[-1] + (frame.index[1] - frame.index[0]))) == 0, "超出范围应返回空结果"
+
+
+if __name__ == "__main__":
+    test_varint_round_trip()
+    test_csv_round_trip_and_size()
+    test_range_read()
+    print("✓ 所有测试通过")
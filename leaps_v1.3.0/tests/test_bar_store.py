@@ -0,0 +1,31 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from bar_store import BarStore
+from market_data_generator import generate_ohlcv
+
+
+def test_append_and_query():
+    frame = generate_ohlcv("AAPL", 10_000, "1m", end="2024-06-28 16:00", tz="UTC")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        store.append("AAPL", "1m", frame.iloc[:6000])
+        store.append("AAPL", "1m", frame.iloc[5000:])
+        assert len(store.read("AAPL", "1m")) == len(frame), "合并追加的数据行数不正确"
+
+        start, end = frame.index[1234], frame.index[2345]
+        records = store.query("AAPL", "1m", start, end)
+        assert isinstance(records, np.memmap), "查询结果应为内存映射视图"
+        assert len(records) == 2345 - 1234 + 1, "区间查询行数不正确"
+        assert records["time"][0] == start.value and records["time"][-1] == end.value, "区间边界不正确"
+
+        part = store.query_frame("AAPL", "1m", start, end)
+        assert np.allclose(part["Close"].to_numpy(), frame["Close"].iloc[1234:2346].to_numpy()), "查询的收盘价不一致"
+        assert len(store.query("AAPL", "1m", frame.index[-1] + pd.Timedelta(minutes=1))) == 0, "超出范围应返回空结果"
+        assert store.query("MSFT", "1m") is None, "不存在的股票应返回 None"
+
+
+if __name__ == "__main__":
+    test_append_and_query()
+    print("✓ 所有测试通过")
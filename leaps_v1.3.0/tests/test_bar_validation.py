@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from bar_validation import FLAG_DUPLICATE, FLAG_HIGH_LOW, FLAG_JUMP, FLAG_NAN, FLAG_OUT_OF_ORDER, FLAG_ZERO_VOLUME, validate_frame
+from market_data_generator import generate_ohlcv
+
+
+def make_dirty():
+    hist = generate_ohlcv("AAPL", 100, end="2024-06-28")
+    hist.iloc[10, hist.columns.get_loc("High")] = hist["Low"].iloc[10] - 1
+    hist.iloc[20, hist.columns.get_loc("Open")] = np.nan
+    hist.iloc[30, hist.columns.get_loc("Volume")] = 0
+    hist.iloc[40, hist.columns.get_loc("Close")] *= 3
+    hist.iloc[50, hist.columns.get_loc("Close")] = np.nan
+    return pd.concat([hist.iloc[:60], hist.iloc[[5]], hist.iloc[70:], hist.iloc[60:70]])
+
+
+def test_flag_policy():
+    hist = make_dirty()
+    flagged, report = validate_frame(hist, policy="flag", symbol="AAPL")
+
+    flags = flagged["Flags"].to_numpy()
+    assert len(flagged) == len(hist), "只标记时不应删除K线"
+    assert flags[10] & FLAG_HIGH_LOW and flags[20] & FLAG_NAN and flags[30] & FLAG_ZERO_VOLUME, "价格检查不正确"
+    assert flags[40] & FLAG_JUMP and not flags[41] & FLAG_JUMP, "异常跳变检查不正确"
+    assert flags[5] & FLAG_DUPLICATE and not flags[60] & FLAG_DUPLICATE, "重复时间应保留最后一根"
+    assert flags[60] & FLAG_OUT_OF_ORDER and flags[91] & FLAG_OUT_OF_ORDER, "乱序检查不正确"
+    assert report["symbol"] == "AAPL" and report["bars"] == 101 and report["issues"]["duplicate"] == 1, "质量报告不正确"
+
+
+def test_repair_and_drop():
+    hist = make_dirty()
+
+    repaired, report = validate_frame(hist, policy="repair")
+    assert repaired.index.is_monotonic_increasing and repaired.index.is_unique, "修复后应按时间排序且无重复"
+    assert report["dropped"] == 2 and report["repaired"] == 3, f"修复统计不正确: {report}"
+    assert report["issues"]["jump"] == 1 and repaired["Close"].max() == hist["Close"].iloc[40], "修复时异常跳变只应记录不应删除"
+    assert (repaired["High"] >= repaired[["Open", "Low", "Close"]].max(axis=1)).all(), "最高价未修复"
+    assert (repaired["Low"] <= repaired[["Open", "High", "Close"]].min(axis=1)).all(), "最低价未修复"
+    assert not repaired[["Open", "High", "Low", "Close"]].isna().any().any(), "缺失值未修复"
+
+    dropped, report = validate_frame(hist, policy="drop")
+    assert len(dropped) == 96 and report["dropped"] == 5, f"删除统计不正确: {report}"
+    assert dropped["Volume"].eq(0).sum() == 1, "零成交量只应标记不应删除"
+
+
+def test_repair_keeps_real_moves():
+    closes = np.array([40.0, 76.0, 148.0, 193.0, 325.0, 194.0, 90.0, 92.0])
+    hist = pd.DataFrame({"Open": closes, "High": closes * 1.05, "Low": closes * 0.95, "Close": closes,
+                         "Volume": np.full(len(closes), 1_000_000)},
+                        index=pd.date_range("2021-01-22", periods=len(closes), freq="B"))
+
+    repaired, report = validate_frame(hist, policy="repair")
+    assert report["issues"].get("jump") == 1, f"应报告异常跳变: {report}"
+    assert len(repaired) == len(hist) and report["dropped"] == 0, "修复时不应删除真实的暴涨暴跌"
+
+    dropped, _ = validate_frame(hist, policy="drop")
+    assert 325.0 not in dropped["Close"].to_numpy(), "drop 策略应删除异常跳变"
+
+
+if __name__ == "__main__":
+    test_flag_policy()
+    test_repair_and_drop()
+    test_repair_keeps_real_moves()
+    print("✓ 所有测试通过")
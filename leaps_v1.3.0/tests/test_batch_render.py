@@ -0,0 +1,43 @@
+import os
+import tempfile
+from batch_render import render_charts, shared_cache_key
+from shared_bar_cache import SharedBarCache
+from yahoo_stub_server import StubConfig, server_url, start_stub_server
+
+
+def test_shared_cache_key():
+    assert shared_cache_key("1d", "1y", "2024-07-08 10:00") == shared_cache_key("1d", "1y", "2024-07-08 17:00"), "同一交易日应共用缓存"
+    assert shared_cache_key("1d", "1y", "2024-07-08 17:00") != shared_cache_key("1d", "1y", "2024-07-09 17:00"), "新交易日不应读到旧缓存"
+    assert shared_cache_key("5m", "5d", "2024-07-08 12:03") != shared_cache_key("5m", "5d", "2024-07-08 12:07"), "新K线出现后不应读到旧缓存"
+    assert shared_cache_key("5m", "5d", "2024-07-06 12:00") == shared_cache_key("5m", "5d", "2024-07-07 12:00"), "休市期间应共用缓存"
+
+
+def test_render_with_shared_cache():
+    stub = start_stub_server(config=StubConfig(seed=3))
+    environ = dict(os.environ)
+    os.environ.update(LEAPS_YAHOO_BASE_URL=server_url(stub), LEAPS_SERVICE_URL="")
+    cache = SharedBarCache(f"leaps_render_{os.getpid()}", capacity=8, max_bytes=10_000_000)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            symbols = ["AAPL", "MSFT", "NVDA"]
+            for name in ("first", "second"):
+                results = render_charts(symbols, os.path.join(tmp, name), workers=2, cache=cache)
+                assert all(error is None for _, _, error in results), f"渲染失败: {results}"
+
+            stats = cache.stats()
+            assert stats["entries"] == 3 and stats["hits"] == 3, f"第二次渲染应从共享缓存读取: {stats}"
+            for symbol in symbols:
+                with open(os.path.join(tmp, "first", f"{symbol}.png"), "rb") as a, \
+                        open(os.path.join(tmp, "second", f"{symbol}.png"), "rb") as b:
+                    assert a.read() == b.read(), "使用缓存数据生成的图表不一致"
+    finally:
+        cache.destroy()
+        os.environ.clear()
+        os.environ.update(environ)
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    test_shared_cache_key()
+    test_render_with_shared_cache()
+    print("✓ 所有测试通过")
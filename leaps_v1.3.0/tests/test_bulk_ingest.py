@@ -0,0 +1,52 @@
+import os
+import tempfile
+from bar_store import BarStore
+from bulk_ingest import Checkpoint, IngestJob, load_universe
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+from yahoo_stub_server import StubConfig, server_url, start_stub_server
+
+
+def test_ingest_resume_and_tail():
+    stub = start_stub_server(config=StubConfig(rate_limit_rate=0.2, seed=7))
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fetcher = NasdaqStockFetcher(base_url=server_url(stub), service_url="")
+            store = BarStore(tmp_dir)
+            checkpoint_path = os.path.join(tmp_dir, "checkpoint.json")
+            symbols = ["AAPL", "MSFT", "NVDA", "AMZN"]
+
+            job = IngestJob(fetcher, store, Checkpoint(checkpoint_path, "run1"), workers=2,
+                            max_rps=200, burst=20, backoff=0.01)
+            summary = job.run(symbols)
+            assert summary["done"] == 4 and summary["failed"] == 0, f"导入失败: {summary['failures']}"
+            assert store.symbols("1d") == sorted(symbols), "存储中的股票不一致"
+
+            rows = len(store.read("AAPL", "1d"))
+            resumed = IngestJob(fetcher, store, Checkpoint(checkpoint_path, "run1"), max_rps=200).run(symbols)
+            assert resumed["resumed_skipped"] == 4, "断点续传未跳过已完成的股票"
+
+            checkpoint = Checkpoint(checkpoint_path, "run2")
+            IngestJob(fetcher, store, checkpoint, max_rps=200, backoff=0.01).run(symbols[:1])
+            assert checkpoint.entries["AAPL:1d"]["mode"] == "tail", "已有数据时应只获取最新部分"
+            assert len(store.read("AAPL", "1d")) == rows, "增量导入产生了重复数据"
+    finally:
+        stub.shutdown()
+
+
+def test_load_universe():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "nasdaqtraded.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Nasdaq Traded|Symbol|Security Name|Listing Exchange|Market Category|ETF|Round Lot Size\n")
+            f.write("Y|AAPL|Apple Inc.|Q|Q|N|100\n")
+            f.write("Y|QQQ|Invesco QQQ|Q|G|Y|100\n")
+            f.write("Y|msft|Microsoft|Q|Q|N|100\n")
+            f.write("File Creation Time: 0101202500:00|||||||\n")
+
+        assert load_universe(path) == ["AAPL", "MSFT"], "解析股票列表失败"
+
+
+if __name__ == "__main__":
+    test_ingest_resume_and_tail()
+    test_load_universe()
+    print("✓ 所有测试通过")
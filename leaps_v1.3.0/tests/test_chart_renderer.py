@@ -0,0 +1,35 @@
+import numpy as np
+from chart_renderer import bucket_extremes, bucket_size, downsample_minmax
+
+
+def test_downsample_minmax():
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.standard_normal(10_003))
+    y[-3:] = [y.min() - 1, np.nan, y.max() + 1]
+    x = np.arange(len(y))
+
+    size = bucket_size(len(y), 1000)
+    dx, dy = downsample_minmax(x, y, size)
+    assert len(dx) <= 2 * -(-len(y) // size) and len(dx) < len(y), "降采样后的点数不正确"
+    assert (np.diff(dx) > 0).all(), "降采样后的索引应递增且不重复"
+    assert (dx < len(y)).all() and not np.isnan(dy).any(), "最后一个不完整分桶的填充值不应被选中"
+    assert np.nanmin(y) in dy and np.nanmax(y) in dy, "全局最高/最低点应保留"
+    assert np.array_equal(dy, y[dx]), "降采样后的值与索引不对应"
+
+    short_x, short_y = downsample_minmax(x[:5], y[:5], size)
+    assert np.array_equal(short_y, y[:5]), "点数少于分桶大小时不应降采样"
+
+
+def test_bucket_extremes():
+    values = np.array([1.0, -3.0, 2.0, 0.5, 4.0, -1.0, -0.5, -2.0])
+    x = np.arange(len(values), dtype=float)
+
+    centers, picked = bucket_extremes(x, values, 3)
+    assert np.array_equal(picked, [-3.0, 4.0, -2.0]), f"应保留每个分桶中绝对值最大的值: {picked}"
+    assert np.array_equal(centers, [1.0, 4.0, 6.5]), f"分桶中心不正确: {centers}"
+
+
+if __name__ == "__main__":
+    test_downsample_minmax()
+    test_bucket_extremes()
+    print("✓ 所有测试通过")
@@ -0,0 +1,117 @@
+import tempfile
+import numpy as np
+from bar_store import BarStore
+from market_data_generator import generate_ohlcv
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+
+
+SPLIT_AT = 200
+DIVIDENDS = {100: 0.5, 250: 0.3}
+
+
+def make_raw():
+    raw = generate_ohlcv("AAPL", 300, end="2024-06-28")
+    raw.loc[raw.index[SPLIT_AT:], ["Open", "High", "Low", "Close"]] /= 2
+    raw["Volume"] = raw["Volume"] * 2
+    return raw
+
+
+def yahoo_view(raw, asof):
+    # 模拟 Yahoo 在第 asof 天返回的未复权数据: 价格和股息按之后的拆股调整
+    frame = raw.iloc[:asof].copy()
+    factor = np.where((np.arange(asof) < SPLIT_AT) & (asof > SPLIT_AT), 2.0, 1.0)
+    for column in ("Open", "High", "Low", "Close"):
+        frame[column] = frame[column] / factor
+    frame["Volume"] = frame["Volume"] * factor.astype(int)
+    frame["Dividends"] = 0.0
+    frame["Stock Splits"] = 0.0
+    for i, amount in DIVIDENDS.items():
+        if i < asof:
+            frame.iloc[i, frame.columns.get_loc("Dividends")] = amount / factor[i]
+    if asof > SPLIT_AT:
+        frame.iloc[SPLIT_AT, frame.columns.get_loc("Stock Splits")] = 2.0
+    return frame
+
+
+class ActionFetcher:
+    def __init__(self, hist):
+        self.hist = hist
+        self.adjusted = []
+
+    def get_corporate_actions(self, symbol):
+        return self.hist.loc[(self.hist["Dividends"] != 0) | (self.hist["Stock Splits"] != 0), ["Dividends", "Stock Splits"]]
+
+    def get_bars_range(self, symbol, start, end, interval="1d", auto_adjust=True):
+        self.adjusted.append(auto_adjust)
+        return self.hist[(self.hist.index >= start) & (self.hist.index < end)]
+
+
+def test_incremental_raw_bars():
+    raw = make_raw()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        store.append_raw("AAPL", "1d", yahoo_view(raw, 150))
+        store.append_raw("AAPL", "1d", yahoo_view(raw, 300).iloc[140:])
+
+        records = store.read("AAPL", "1d")
+        assert np.allclose(records["close"], raw["Close"].to_numpy()), "未复权价格不正确"
+        assert (records["volume"] == raw["Volume"].to_numpy()).all(), "未复权成交量不正确"
+
+        actions = store.actions("AAPL")
+        assert np.allclose(actions["dividend"][actions["dividend"] > 0], [0.5, 0.3]), "股息未换算为除息日金额"
+        assert actions["split"].max() == 2.0, "拆股记录丢失"
+
+        split = store.query_adjusted("AAPL", "1d", mode="split")
+        assert np.allclose(split["close"], yahoo_view(raw, 300)["Close"].to_numpy()), "拆股复权价格不正确"
+
+        adjusted = store.query_adjusted("AAPL", "1d")
+        close = raw["Close"].to_numpy()
+        expected = close[0] / 2 * (1 - 0.5 / close[99]) * (1 - 0.3 / close[249])
+        assert np.isclose(adjusted["close"][0], expected), "分红复权价格不正确"
+        assert np.isclose(adjusted["close"][-1], close[-1]), "最新价格不应被调整"
+        assert np.allclose(store.query_adjusted("AAPL", "1d", mode="none")["close"], close), "不复权时应返回原始价格"
+
+
+def test_backfill_stores_raw():
+    raw = make_raw()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        fetcher = ActionFetcher(yahoo_view(raw, 300))
+
+        frame = store.load_range(fetcher, "AAPL", "1d", raw.index[50], raw.index[280], adjust="split")
+        assert fetcher.adjusted and not any(fetcher.adjusted), "日线应请求未复权数据"
+        assert np.allclose(store.query("AAPL", "1d")["close"], raw["Close"].to_numpy()[50:281]), "存储的不是未复权价格"
+        assert np.allclose(frame["Close"].to_numpy(), fetcher.hist["Close"].to_numpy()[50:281]), "读取时复权不正确"
+
+
+class NoActionsTicker:
+    actions = None
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def history(self, start=None, end=None, interval="1d", auto_adjust=True, **kwargs):
+        return self.hist[(self.hist.index >= start) & (self.hist.index < end)]
+
+
+def test_backfill_without_actions():
+    raw = make_raw()
+    fetcher = NasdaqStockFetcher(ticker_factory=lambda symbol: NoActionsTicker(raw))
+
+    actions = fetcher.get_corporate_actions("AAPL")
+    assert not isinstance(actions, dict) and actions.empty, f"没有分红拆股时应返回空表: {actions}"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        frame = store.load_range(fetcher, "AAPL", "1d", raw.index[0], raw.index[-1])
+        assert frame is not None and len(frame) == len(raw), "没有分红拆股时也应获取K线"
+        assert np.allclose(frame["Close"].to_numpy(), raw["Close"].to_numpy()), "没有分红拆股时不应调整价格"
+
+
+if __name__ == "__main__":
+    test_incremental_raw_bars()
+    test_backfill_stores_raw()
+    test_backfill_without_actions()
+    print("✓ 所有测试通过")
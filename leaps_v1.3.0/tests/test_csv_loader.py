@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from bar_store import BarStore
+from csv_loader import arrow_csv_available, import_csv_files, read_bar_csv, sniff_time_format
+from market_data_generator import generate_ohlcv
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "ADBE_5year_data_sample.csv")
+
+
+def test_read_sample_csv():
+    assert sniff_time_format("2021-02-17 08:52:47.134263") == "%Y-%m-%d %H:%M:%S.%f", "时间格式识别错误"
+
+    expected = pd.read_csv(SAMPLE_CSV, index_col=0, parse_dates=True)
+    engines = ["c", "pyarrow"] if arrow_csv_available() else ["c"]
+    for engine in engines:
+        frame = read_bar_csv(SAMPLE_CSV, engine)
+        assert frame["Volume"].dtype == np.int64, f"{engine}: 成交量类型不正确"
+        assert (frame.index == expected.index).all(), f"{engine}: 时间戳解析不一致"
+        assert np.allclose(frame["Close"].to_numpy(), expected["Close"].to_numpy()), f"{engine}: 收盘价不一致"
+
+
+def test_import_directory():
+    frame = generate_ohlcv("MSFT", 300, end="2024-06-28")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_dir = os.path.join(tmp_dir, "csv")
+        os.makedirs(csv_dir)
+        frame.to_csv(os.path.join(csv_dir, "MSFT_daily.csv"))
+        shutil.copy(SAMPLE_CSV, csv_dir)
+
+        store_dir = os.path.join(tmp_dir, "store")
+        refused = import_csv_files([csv_dir], store_dir, workers=1)
+        assert all(error is not None for _, _, _, error in refused), "未标明是否复权的日线CSV应拒绝导入"
+
+        results = import_csv_files([csv_dir], store_dir, workers=2, raw_prices=True)
+        assert all(error is None for _, _, _, error in results), f"导入失败: {results}"
+
+        store = BarStore(store_dir)
+        assert store.symbols("1d") == ["ADBE", "MSFT"], "导入的股票代码不正确"
+        assert (store.load_frame("MSFT", "1d").index == frame.index).all(), "带时区的时间戳导入后不一致"
+
+
+class ViewFetcher:
+    def __init__(self, hist):
+        self.hist = hist
+
+    def get_corporate_actions(self, symbol):
+        return self.hist.loc[(self.hist["Dividends"] != 0) | (self.hist["Stock Splits"] != 0), ["Dividends", "Stock Splits"]]
+
+    def get_bars_range(self, symbol, start, end, interval="1d", auto_adjust=True):
+        return self.hist[(self.hist.index >= start) & (self.hist.index < end)]
+
+
+def test_import_adjusted_daily():
+    # 未复权视图: 第200天1拆2，拆股前的价格和股息按拆股调整
+    view = generate_ohlcv("AAPL", 300, end="2024-06-28")
+    view["Adj Close"] = view["Close"]
+    view["Dividends"] = 0.0
+    view["Stock Splits"] = 0.0
+    view.iloc[100, view.columns.get_loc("Dividends")] = 0.4
+    view.iloc[250, view.columns.get_loc("Dividends")] = 0.3
+    view.iloc[200, view.columns.get_loc("Stock Splits")] = 2.0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        reference = BarStore(os.path.join(tmp_dir, "reference"))
+        reference.append_raw("AAPL", "1d", view)
+        expected = reference.query_adjusted_frame("AAPL", "1d")
+
+        exported = expected.iloc[:280].copy()
+        exported[["Dividends", "Stock Splits"]] = view[["Dividends", "Stock Splits"]].iloc[:280]
+        csv_path = os.path.join(tmp_dir, "AAPL.csv")
+        exported.to_csv(csv_path)
+
+        store = BarStore(os.path.join(tmp_dir, "store"))
+        results = import_csv_files([csv_path], store.root, workers=1)
+        assert results[0][3] is None, f"导入失败: {results}"
+        assert np.allclose(store.query_adjusted_frame("AAPL", "1d")["Close"], exported["Close"]), "导入后复权价格不正确"
+
+        frame = store.load_range(ViewFetcher(view), "AAPL", "1d", view.index[280], view.index[-1])
+        assert frame is not None and len(frame) == 20, "补齐数据失败"
+        adjusted = store.query_adjusted_frame("AAPL", "1d")
+        assert np.allclose(adjusted["Close"], expected["Close"]), "补齐后复权价格不正确 (重复复权)"
+        assert (adjusted["Volume"] == expected["Volume"]).all(), "补齐后成交量不正确"
+
+
+if __name__ == "__main__":
+    test_read_sample_csv()
+    test_import_directory()
+    test_import_adjusted_daily()
+    print("✓ 所有测试通过")
@@ -0,0 +1,41 @@
+from data_cache import BarCache, estimate_bytes
+from indicators import compute_indicators
+from market_data_generator import generate_ohlcv
+
+
+def test_estimate_bytes():
+    hist = generate_ohlcv("AAPL", 10_000, "1m")
+    indicators = compute_indicators(hist)
+
+    data_bytes = estimate_bytes(hist)
+    assert data_bytes >= 10_000 * 6 * 8, "K线大小估算偏小"
+    total = estimate_bytes((hist, indicators))
+    assert data_bytes * 2 < total < data_bytes * 8, f"指标大小估算不合理: {total}"
+
+
+def test_byte_budget_evicts_lru():
+    hist = generate_ohlcv("AAPL", 10_000, "1m")
+    size = estimate_bytes((hist, None))
+    cache = BarCache(max_bytes=int(size * 2.5))
+
+    for symbol in ("AAPL", "MSFT", "NVDA"):
+        cache.put(symbol, "1y", "1m", hist.copy())
+        if symbol == "MSFT":
+            assert cache.get("AAPL", "1y", "1m") is not None, "预算内不应淘汰"
+
+    assert cache.contains("AAPL", "1y", "1m") and not cache.contains("MSFT", "1y", "1m"), "应淘汰最近最少使用的项"
+    assert cache.stats()["evictions"] == 1 and cache.used_bytes <= cache.max_bytes, f"缓存统计不正确: {cache.stats()}"
+
+    data = cache.get("NVDA", "1y", "1m")["data"]
+    assert cache.set_indicators("NVDA", "1y", "1m", data, compute_indicators(data)), "指标未写入缓存"
+    assert len(cache) == 1 and cache.contains("NVDA", "1y", "1m"), "加入指标后超出预算应淘汰旧项，保留当前项"
+
+    cache.resize(None)
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "used_bytes": 0, "max_bytes": None, "evictions": 2}, "清空后统计不正确"
+
+
+if __name__ == "__main__":
+    test_estimate_bytes()
+    test_byte_budget_evicts_lru()
+    print("✓ 所有测试通过")
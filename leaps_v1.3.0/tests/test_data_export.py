@@ -0,0 +1,66 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from data_export import export_frames
+
+
+def make_bars(rows=1000):
+    index = pd.date_range("2024-01-02", periods=rows, freq="B", name="Date")
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, rows))
+    return pd.DataFrame({
+        "Open": close,
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": np.arange(rows, dtype=np.int64)
+    }, index=index)
+
+
+def test_chunked_csv_export():
+    hist = make_bars()
+    progress = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bars.csv")
+        rows = export_frames(hist, path, chunk_rows=300, progress=lambda done, total: progress.append((done, total)))
+        loaded = pd.read_csv(path, index_col=0, parse_dates=True)
+
+    assert rows == len(hist), "导出行数不匹配"
+    assert progress == [(300, 1000), (600, 1000), (900, 1000), (1000, 1000)], "进度回调不正确"
+    assert np.allclose(loaded.to_numpy(), hist.to_numpy()), "CSV 数据不一致"
+
+
+def test_multi_symbol_export():
+    hist = make_bars(100)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bars.csv")
+        rows = export_frames(((symbol, hist) for symbol in ["AAPL", "MSFT"]), path, chunk_rows=30)
+        loaded = pd.read_csv(path, index_col=0)
+
+    assert rows == 200, "导出行数不匹配"
+    assert loaded["Symbol"].value_counts().to_dict() == {"AAPL": 100, "MSFT": 100}, "股票代码列不正确"
+
+
+def test_parquet_export():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("未安装 pyarrow，跳过 Parquet 测试")
+        return
+
+    hist = make_bars()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bars.parquet")
+        export_frames(hist, path, chunk_rows=250)
+        loaded = pq.read_table(path).to_pandas()
+
+    assert loaded.equals(hist), "Parquet 数据不一致"
+
+
+if __name__ == "__main__":
+    test_chunked_csv_export()
+    test_multi_symbol_export()
+    test_parquet_export()
+    print("所有导出测试通过！")
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from data_cache import BarCache
+from fetch_scheduler import FetchScheduler
+from fetcher_metrics import FetcherMetrics
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+
+
+class StubTicker:
+    def __init__(self, symbol):
+        if symbol == "LIMIT":
+            raise RuntimeError("Too Many Requests. Rate limited. Try after a while.")
+        self.info = {"symbol": symbol}
+
+    def history(self, period=None, interval=None, start=None, end=None, auto_adjust=True):
+        index = pd.date_range("2024-01-02", periods=10, freq="B")
+        return pd.DataFrame({"Close": np.arange(1.0, 11.0)}, index=index)
+
+
+def test_fetcher_metrics():
+    metrics = FetcherMetrics()
+    fetcher = NasdaqStockFetcher(ticker_factory=StubTicker, metrics=metrics)
+
+    assert isinstance(fetcher.get_historical_data("AAPL"), pd.DataFrame), "获取历史数据失败"
+    assert "error" in fetcher.get_historical_data("LIMIT"), "限流错误未返回"
+
+    stats = fetcher.get_stats()
+    method = stats["methods"]["get_historical_data"]
+    assert stats["upstream_calls"] == 2, "上游调用次数不正确"
+    assert method["calls"] == 2 and method["errors"] == 1 and method["rate_limited"] == 1, "错误计数不正确"
+    assert method["bytes"] > 0, "未记录数据量"
+
+    text = metrics.to_prometheus()
+    assert 'leaps_fetch_duration_seconds_count{method="get_historical_data"} 2' in text, "Prometheus 输出不正确"
+    assert 'leaps_fetch_rate_limited_total{method="get_historical_data"} 1' in text, "Prometheus 限流计数不正确"
+
+
+def test_nested_calls_counted_once():
+    metrics = FetcherMetrics()
+    fetcher = NasdaqStockFetcher(ticker_factory=StubTicker, metrics=metrics)
+    fetcher.get_stock_summary("AAPL")
+
+    stats = metrics.get_stats()
+    assert stats["upstream_calls"] == 3 and stats["calls"] == 1, f"嵌套调用不应重复计入总数: {stats['calls']}"
+    assert stats["methods"]["get_stock_summary"]["calls"] == 1 and stats["methods"]["get_historical_data"]["calls"] == 1, \
+        "各方法仍应单独统计"
+
+
+def test_cache_hit_ratio():
+    metrics = FetcherMetrics()
+    cache = BarCache(metrics=metrics)
+
+    cache.get("AAPL", "1y", "1d")
+    cache.put("AAPL", "1y", "1d", pd.DataFrame())
+    cache.get("AAPL", "1y", "1d")
+    cache.get("aapl", "1y", "1d")
+
+    stats = metrics.get_stats()
+    assert (stats["cache_hits"], stats["cache_misses"]) == (2, 1), "缓存命中计数不正确"
+    assert stats["cache_hit_ratio"] == round(2 / 3, 4), "缓存命中率不正确"
+
+    scheduler = FetchScheduler(None, cache)
+    try:
+        if cache.contains("AAPL", "1y", "1d"):
+            scheduler.request("AAPL", "1y", "1d").result()
+    finally:
+        scheduler.shutdown()
+    stats = metrics.get_stats()
+    assert (stats["cache_hits"], stats["cache_misses"]) == (3, 1), "一次查询只应计数一次"
+
+
+if __name__ == "__main__":
+    test_fetcher_metrics()
+    test_nested_calls_counted_once()
+    test_cache_hit_ratio()
+    print("✓ 所有测试通过")
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from live_updater import LiveUpdater, append_bars
+
+
+def make_bars(start, periods, close=100.0):
+    index = pd.date_range(start, periods=periods, freq="5min", tz="America/New_York", name="Datetime")
+    closes = close + np.arange(periods, dtype=float)
+    return pd.DataFrame({"Open": closes, "High": closes + 1, "Low": closes - 1, "Close": closes,
+                         "Volume": np.full(periods, 1000)}, index=index)
+
+
+def test_append_bars():
+    hist = make_bars("2024-07-08 09:30", 6)
+
+    partial = make_bars(hist.index[-1], 1, close=200.0)
+    merged, start_pos = append_bars(hist, partial)
+    assert start_pos == 5 and len(merged) == 6, "未完成的最后一根K线应被替换"
+    assert merged["Close"].iloc[-1] == 200.0 and merged["Close"].iloc[-2] == hist["Close"].iloc[-2], "替换后数据不正确"
+
+    # 返回的数据从较早的K线开始，且最新一根重复出现
+    latest = hist.index[-1] + pd.Timedelta(minutes=5)
+    overlap = pd.concat([make_bars(hist.index[3], 4, close=300.0), make_bars(latest, 1, close=400.0)])
+    merged, start_pos = append_bars(hist, overlap)
+    assert start_pos == 5 and len(merged) == 7, "重叠的K线应只保留新部分"
+    assert merged.index.is_unique and merged.index.is_monotonic_increasing, "合并后应无重复时间"
+    assert merged.loc[latest, "Close"] == 400.0 and merged.loc[hist.index[-1], "Close"] == 302.0, "同一时间的K线应保留最后一根"
+
+    for new_bars, message in ((hist.iloc[-1:].copy(), "最后一根K线没有变化时不应更新"),
+                              (hist.iloc[:3], "只有旧K线时不应更新"), (hist.iloc[:0], "没有新数据时不应更新")):
+        merged, start_pos = append_bars(hist, new_bars)
+        assert merged is hist and start_pos is None, message
+
+
+def test_next_delay_backoff():
+    updater = LiveUpdater(fetcher=None, refresh_seconds=60, closed_backoff_max=300)
+
+    assert updater.next_delay(datetime(2024, 7, 5, 15, 59)) == 60, "开盘时应按刷新间隔轮询"
+    closed = [updater.next_delay(datetime(2024, 7, 5, 16, minute)) for minute in range(4)]
+    assert closed == [120, 240, 300, 300], f"收盘后应加倍退避且不超过上限: {closed}"
+
+    assert updater.next_delay(datetime(2024, 7, 8, 9, 30)) == 60, "开盘后应恢复刷新间隔"
+    assert updater.next_delay(datetime(2024, 7, 4, 10, 0)) == 120, "假日休市时应重新开始退避"
+
+
+class StubFetcher:
+    def __init__(self, result):
+        self.result = result
+
+    def get_bars_since(self, symbol, start, interval="1d"):
+        return self.result
+
+
+def test_poll():
+    hist = make_bars("2024-07-08 09:30", 40)
+
+    updater = LiveUpdater(StubFetcher({"error": "获取最新数据时出错"}))
+    merged, indicators, changed = updater.poll("AAPL", "5m", hist, None)
+    assert merged is hist and indicators is None and not changed, "获取失败时不应更新"
+
+    updater = LiveUpdater(StubFetcher(make_bars(hist.index[-1], 2, close=500.0)))
+    merged, indicators, changed = updater.poll("AAPL", "5m", hist, None)
+    assert changed and len(merged) == 41 and merged["Close"].iloc[-1] == 501.0, "轮询到的新K线未合并"
+
+
+if __name__ == "__main__":
+    test_append_bars()
+    test_next_delay_backoff()
+    test_poll()
+    print("✓ 所有测试通过")
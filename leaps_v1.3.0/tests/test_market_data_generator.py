@@ -0,0 +1,34 @@
+import numpy as np
+from bar_validation import validate_frame
+from market_data_generator import MARKET_REGIMES, generate_ohlcv, generate_universe
+
+
+def test_reproducible_and_consistent():
+    first = generate_ohlcv("AAPL", 500, end="2024-06-28")
+    again = generate_universe(["MSFT", "AAPL"], 500, end="2024-06-28")["AAPL"]
+    assert first.equals(again), "同一股票的数据应与批次无关且可复现"
+    assert not first["Close"].equals(generate_ohlcv("MSFT", 500, end="2024-06-28")["Close"]), "不同股票的数据不应相同"
+
+    _, report = validate_frame(first, policy="flag")
+    assert report["clean"] == len(first), f"生成的K线应满足OHLC约束: {report}"
+    assert first.index[-1].strftime("%Y-%m-%d") == "2024-06-28" and first.index.dayofweek.max() < 5, "日期不正确"
+    assert generate_ohlcv("AAPL", 0, end="2024-06-28").empty, "0根K线时应返回空表"
+
+    returns = np.diff(np.log(generate_ohlcv("TEST", 5000, volatility=0.4)["Close"].to_numpy()))
+    assert abs(returns.std() * np.sqrt(252) - 0.4) < 0.03, "年化波动率不正确"
+
+
+def test_intraday_and_regimes():
+    bars = generate_ohlcv("AAPL", 1000, "5m", end="2024-06-28 16:00")
+    minutes = bars.index.hour * 60 + bars.index.minute
+    assert len(bars) == 1000 and minutes.min() >= 570 and minutes.max() < 960, "分钟线应在交易时段内"
+
+    calm = generate_ohlcv("AAPL", 2000, regimes=[(0.0, 0.1)])
+    mixed = generate_ohlcv("AAPL", 2000, regimes=MARKET_REGIMES, regime_length=50)
+    assert np.log(mixed["Close"]).diff().std() > np.log(calm["Close"]).diff().std(), "高波动状态应增大波动"
+
+
+if __name__ == "__main__":
+    test_reproducible_and_consistent()
+    test_intraday_and_regimes()
+    print("✓ 所有测试通过")
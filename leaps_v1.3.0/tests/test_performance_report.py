@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from bar_store import BarStore
+from market_data_generator import generate_universe
+from performance_report import build_report, summarize_frames, write_report
+from shared_bar_cache import SharedBarCache
+
+
+def test_matches_yearly_groupby():
+    frames = generate_universe(["AAPL", "MSFT"], 600, end="2024-06-28")
+    report = summarize_frames(frames, period="max", recent=30)
+
+    hist = frames["MSFT"].copy()
+    hist["Year"] = hist.index.year
+    yearly = hist.groupby("Year").agg({"Close": ["first", "last", "max", "min"], "Volume": "sum"})
+    msft = report.loc["MSFT"]
+
+    assert list(msft.index) == ["max", "30d", "2022", "2023", "2024"], f"周期顺序不正确: {list(msft.index)}"
+    assert np.allclose(msft.loc[["2022", "2023", "2024"], ["First", "Last", "High", "Low", "Volume"]].to_numpy(float),
+                       yearly.to_numpy(float)), "年度汇总与逐只 groupby 结果不一致"
+
+    returns = frames["AAPL"]["Close"].pct_change()
+    assert abs(report.loc[("AAPL", "max"), "VolatilityPct"] - returns.std() * np.sqrt(252) * 100) < 1e-9, "波动率不正确"
+    assert report.loc[("AAPL", "30d"), "Bars"] == 30 and report.loc[("MSFT", "max"), "Bars"] == 600, "K线数量不正确"
+
+
+def test_build_and_write_report():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BarStore(os.path.join(tmp, "bars"))
+        for symbol, frame in generate_universe(["AAPL", "MSFT", "NVDA"], 300, end="2024-06-28").items():
+            store.append(symbol, "1d", frame)
+
+        report, errors = build_report(["NVDA", "MISSING", "AAPL", "MSFT"], store.root, period="max", workers=2)
+        assert errors == {"MISSING": "没有本地数据"}, f"缺失数据未报告: {errors}"
+        assert list(report.index.get_level_values("Symbol").unique()) == ["NVDA", "AAPL", "MSFT"], "应保持输入顺序"
+
+        for name in ("report.csv", "report.html", "report.parquet"):
+            assert write_report(report, os.path.join(tmp, name)) == len(report), f"{name} 写入行数不正确"
+
+        loaded = pd.read_parquet(os.path.join(tmp, "report.parquet"))
+        assert np.allclose(loaded["ChangePct"], report["ChangePct"]), "Parquet 报告内容不正确"
+        with open(os.path.join(tmp, "report.html"), encoding="utf-8") as f:
+            assert "股票表现报告" in f.read(), "HTML 报告缺少标题"
+
+
+def test_report_with_shared_cache():
+    cache = SharedBarCache(f"leaps_report_{os.getpid()}", capacity=8, max_bytes=10_000_000)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = BarStore(tmp)
+            frames = generate_universe(["AAPL", "MSFT", "NVDA"], 600)
+            for symbol, frame in frames.items():
+                store.append(symbol, "1d", frame.iloc[:500])
+
+            expected, _ = build_report(list(frames), tmp, period="2y", workers=2)
+            report, errors = build_report(list(frames), tmp, period="2y", workers=2, cache=cache)
+            assert not errors and report.equals(expected), "使用共享缓存的报告与直接读取不一致"
+            assert cache.stats()["entries"] == 3, "工作进程未把K线写入共享缓存"
+
+            hits = cache.stats()["hits"]
+            report, _ = build_report(list(frames), tmp, period="max", workers=2, cache=cache)
+            assert cache.stats()["hits"] == hits + 3 and report.loc[("AAPL", "max"), "Bars"] == 500, "再次运行应从共享缓存读取"
+
+            store.append("AAPL", "1d", frames["AAPL"].iloc[500:])
+            report, _ = build_report(["AAPL"], tmp, period="max", workers=1, cache=cache)
+            assert report.loc[("AAPL", "max"), "Bars"] == 600, "本地数据更新后共享缓存未刷新"
+
+            index = frames["AAPL"].index
+            store.update_actions("AAPL", pd.DataFrame({"Dividends": [1.0], "Stock Splits": [2.0]}, index=index[[300]]))
+            report, _ = build_report(["AAPL"], tmp, period="max", workers=1, cache=cache)
+            expected, _ = build_report(["AAPL"], tmp, period="max", workers=1)
+            assert report.equals(expected) and report.loc[("AAPL", "max"), "First"] < frames["AAPL"]["Close"].iloc[0] / 1.9, \
+                "新增分红拆股后共享缓存未刷新"
+    finally:
+        cache.destroy()
+
+
+if __name__ == "__main__":
+    test_matches_yearly_groupby()
+    test_build_and_write_report()
+    test_report_with_shared_cache()
+    print("✓ 所有测试通过")
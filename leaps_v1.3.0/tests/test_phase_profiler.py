@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from phase_profiler import PhaseProfiler
+
+
+class Chart:
+    def draw(self, bars):
+        time.sleep(0.002)
+        return bars * 2
+
+
+def test_nested_phases_and_trace():
+    profiler = PhaseProfiler(enabled=True)
+    chart = profiler.instrument(Chart(), ["draw"])
+    compute = profiler.wrap("compute", lambda value: value + 1)
+
+    with profiler.phase("update", symbol="AAPL"):
+        for _ in range(2):
+            with profiler.phase("indicators"):
+                time.sleep(0.001)
+        assert chart.draw(10) == 20 and compute(1) == 2, "包装后的函数返回值不正确"
+
+    def fetch():
+        with profiler.phase("fetch"):
+            pass
+
+    thread = threading.Thread(target=fetch, name="leaps-fetch")
+    thread.start()
+    thread.join()
+    fetch()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "trace.json")
+        assert profiler.write_chrome_trace(path) == 7, "写入的事件数量不正确"
+        with open(path, encoding="utf-8") as f:
+            trace = json.load(f)
+
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    metadata = [event for event in trace["traceEvents"] if event["ph"] == "M"]
+    assert trace["displayTimeUnit"] == "ms" and len(events) == 7, "Chrome trace 格式不正确"
+    assert all(isinstance(event["ts"], float) and event["dur"] >= 0 and event["pid"] == os.getpid() for event in events), "事件字段不正确"
+    assert len({event["tid"] for event in events if event["name"] == "fetch"}) == 2, "不同线程的事件应记录各自的线程"
+    assert {"name": "MainThread"} in [event["args"] for event in metadata], "缺少线程名称"
+
+    update = next(event for event in events if event["name"] == "update")
+    assert update["args"] == {"symbol": "AAPL"}, "阶段参数未记录"
+    for event in events:
+        if event["name"] in ("indicators", "draw", "compute"):
+            # ts 和 dur 各自四舍五入到 0.1 微秒，允许 1 微秒的误差
+            assert update["ts"] - 1 <= event["ts"] and event["ts"] + event["dur"] <= update["ts"] + update["dur"] + 1, \
+                f"{event['name']} 应嵌套在 update 阶段内"
+
+    summary = {stats["name"]: stats for stats in profiler.summary()}
+    indicators = [event["dur"] / 1000 for event in events if event["name"] == "indicators"]
+    assert summary["indicators"]["count"] == 2 and summary["fetch"]["count"] == 2, "阶段计数不正确"
+    assert abs(summary["indicators"]["total_ms"] - sum(indicators)) < 1e-9, "阶段总耗时不正确"
+    assert summary["indicators"]["max_ms"] == max(indicators), "阶段最大耗时不正确"
+    assert abs(summary["indicators"]["mean_ms"] - sum(indicators) / 2) < 1e-9, "阶段平均耗时不正确"
+    assert profiler.summary()[0]["name"] == "update", "汇总应按总耗时降序排列"
+    assert summary["draw"]["total_ms"] >= 2, "包装的方法耗时不正确"
+
+    assert set(profiler.last_timings(["draw", "missing"])) == {"draw"}, "最近耗时不正确"
+    profiler.forget(["draw"])
+    assert "draw" not in profiler.last_timings(), "忘记的阶段仍然存在"
+
+
+def test_disabled_profiler():
+    profiler = PhaseProfiler()
+    chart = profiler.instrument(Chart(), ["draw"])
+    with profiler.phase("update"):
+        assert chart.draw(1) == 2, "未启用时包装的方法应正常返回"
+    assert not profiler.events and profiler.summary() == [], "未启用时不应记录事件"
+
+
+if __name__ == "__main__":
+    test_nested_phases_and_trace()
+    test_disabled_profiler()
+    print("✓ 所有测试通过")
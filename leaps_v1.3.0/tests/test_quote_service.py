@@ -0,0 +1,40 @@
+import threading
+import pandas as pd
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+from quote_service import QuoteService, start_service_thread
+from yahoo_stub_server import StubConfig, server_url, start_stub_server
+
+
+def test_service_client_mode():
+    stub = start_stub_server(config=StubConfig(latency_ms=100))
+    try:
+        service = QuoteService(NasdaqStockFetcher(base_url=server_url(stub), service_url=""), max_rps=100)
+        url = start_service_thread(service)
+
+        direct = NasdaqStockFetcher(base_url=server_url(stub), service_url="").get_historical_data("AAPL", "1mo", "1d")
+        client = NasdaqStockFetcher(service_url=url)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get_historical_data("AAPL", "1mo", "1d")))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(result, pd.DataFrame) for result in results), "客户端获取历史数据失败"
+        assert all(result.index.equals(direct.index) for result in results), "时间索引不一致"
+        assert all((result["Close"] - direct["Close"]).abs().max() < 1e-9 for result in results), "收盘价不一致"
+
+        stats = service.stats()
+        assert stats["fetcher"]["upstream_calls"] == 1, "相同请求未合并或未命中缓存"
+
+        assert client.search_stocks("MS")[0]["symbol"] == "MS", "搜索失败"
+        assert client.get_stock_info("MSFT")["symbol"] == "MSFT", "获取股票信息失败"
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    test_service_client_mode()
+    print("✓ 所有测试通过")
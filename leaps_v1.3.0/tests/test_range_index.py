@@ -0,0 +1,57 @@
+import tempfile
+import pandas as pd
+from bar_store import BarStore
+from range_index import RangeSet, merge_gaps
+from market_data_generator import generate_ohlcv
+
+
+class RangeFetcher:
+    def __init__(self, hist):
+        self.hist = hist
+        self.calls = []
+
+    def get_bars_range(self, symbol, start, end, interval="1d"):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return self.hist[(self.hist.index >= start) & (self.hist.index < end)]
+
+
+def test_range_set():
+    ranges = RangeSet([(10, 20), (30, 40)])
+    ranges.add(20, 25)
+    ranges.add(50, 60)
+    assert list(ranges) == [(10, 25), (30, 40), (50, 60)], "区间合并不正确"
+    assert ranges.covers(12, 24) and not ranges.covers(20, 35), "覆盖判断不正确"
+    assert ranges.missing(0, 70) == [(0, 10), (25, 30), (40, 50), (60, 70)], "缺失区间计算不正确"
+    assert merge_gaps(ranges.missing(0, 70), 10) == [(0, 10), (25, 70)], "相邻缺口未合并"
+
+    ranges.add(5, 55)
+    assert list(ranges) == [(5, 60)], "覆盖多个区间时合并不正确"
+    assert RangeSet.from_list(ranges.to_list()) == ranges, "序列化不一致"
+
+
+def test_backfill_only_missing():
+    hist = generate_ohlcv("AAPL", 400, end="2024-06-28")
+    day = pd.Timedelta(days=1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BarStore(tmp_dir)
+        fetcher = RangeFetcher(hist)
+
+        store.load_range(fetcher, "AAPL", "1d", hist.index[100], hist.index[150])
+        store.load_range(fetcher, "AAPL", "1d", hist.index[250], hist.index[300])
+        fetcher.calls.clear()
+
+        frame = store.load_range(fetcher, "AAPL", "1d", hist.index[50], hist.index[350])
+        assert len(fetcher.calls) == 3, f"应只请求3个缺失区间: {fetcher.calls}"
+        assert fetcher.calls[1][0] >= hist.index[150] - day and fetcher.calls[1][1] <= hist.index[250] + day, "请求了已有的数据"
+        assert (frame.index == hist.index[50:351]).all(), "拼接后的数据不完整"
+
+        fetcher.calls.clear()
+        store.load_range(fetcher, "AAPL", "1d", hist.index[60], hist.index[340])
+        assert fetcher.calls == [], "已覆盖的区间不应再次请求"
+
+
+if __name__ == "__main__":
+    test_range_set()
+    test_backfill_only_missing()
+    print("✓ 所有测试通过")
@@ -0,0 +1,41 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from market_data_generator import generate_ohlcv
+from shared_bar_cache import SharedBarCache
+
+
+def _read_close_sum(args):
+    cache, symbol = args
+    records = cache.get(symbol, "1d")
+    return None if records is None else float(records["close"].sum())
+
+
+def test_shared_cache_across_processes():
+    cache = SharedBarCache(f"leaps_test_{os.getpid()}", capacity=4, max_bytes=10_000_000)
+    try:
+        frames = {f"S{i}": generate_ohlcv(f"S{i}", 20_000, "1m", end="2024-06-28 16:00") for i in range(5)}
+        for symbol, frame in frames.items():
+            cache.put(symbol, "1d", frame)
+
+        stats = cache.stats()
+        assert stats["entries"] == 4 and stats["evictions"] == 1, "超出容量时未淘汰最久未使用的条目"
+        assert cache.get("S0", "1d") is None, "被淘汰的条目仍可读取"
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            sums = list(executor.map(_read_close_sum, [(cache, symbol) for symbol in list(frames)[1:]]))
+        expected = [float(frame["Close"].sum()) for frame in list(frames.values())[1:]]
+        assert all(abs(a - b) < 1e-6 for a, b in zip(sums, expected)), "子进程读取的数据不一致"
+
+        old = cache.get("S1", "1d")
+        cache.put("S1", "1d", generate_ohlcv("S1", 10, seed=99))
+        assert len(old) == 20_000 and abs(float(old["close"].sum()) - expected[0]) < 1e-6, "替换条目后旧视图失效"
+        assert len(cache.get("S1", "1d")) == 10, "替换条目失败"
+    finally:
+        cache.destroy()
+    assert not os.path.exists(os.path.join(tempfile.gettempdir(), f"leaps_test_{os.getpid()}.lock")), "销毁缓存后锁文件未删除"
+
+
+if __name__ == "__main__":
+    test_shared_cache_across_processes()
+    print("✓ 所有测试通过")
@@ -0,0 +1,41 @@
+from datetime import date
+
+from trading_calendar import bar_times, is_early_close, is_market_open, period_bars, recent_bar_times, resolve_period, trading_days, year_holidays
+
+
+def test_holidays_and_sessions():
+    holidays = year_holidays(2024)
+    assert date(2024, 3, 29) in holidays and date(2024, 6, 19) in holidays and date(2024, 11, 28) in holidays, "节假日不正确"
+    assert len(trading_days("2024-01-01", "2024-12-31")) == 252, "2024年交易日数量不正确"
+    assert date(2021, 12, 31) not in year_holidays(2022), "元旦逢周六时不应补休前一年"
+
+    assert is_early_close("2024-11-29") and not is_early_close("2024-11-27"), "提前收盘日不正确"
+    assert is_market_open("2024-11-29 12:59") and not is_market_open("2024-11-29 13:00"), "提前收盘时段不正确"
+    assert not is_market_open("2024-07-04 10:00") and is_market_open("2024-07-05 15:59"), "假日休市不正确"
+
+
+def test_bar_times_and_periods():
+    bars = bar_times("2024-07-01", "2024-07-05 23:59", "5m")
+    assert len(bars) == 78 * 3 + 42, "提前收盘日的分钟线数量不正确"
+    assert bars[-1].strftime("%Y-%m-%d %H:%M") == "2024-07-05 15:55", "最后一根分钟线不正确"
+
+    recent = recent_bar_times(1000, "1m", "2024-12-31 16:00")
+    assert len(recent) == 1000 and recent.is_unique and recent[-1].strftime("%H:%M") == "15:59", "最近K线时间不正确"
+    assert len(recent_bar_times(0, "1d", "2024-12-31")) == 0 and len(recent_bar_times(0, "1wk", "2024-12-31")) == 0, "0根K线时应返回空序列"
+    assert period_bars("ytd", "1d", "2024-01-01") == 0, "年初首个交易日前 ytd 应为0根K线"
+
+    start, end, count = resolve_period("1mo", "1d", "2024-06-28")
+    assert start.strftime("%Y-%m-%d") == "2024-05-28" and count == 23, "1mo 周期解析不正确"
+    assert period_bars("ytd", "1d", "2024-06-28") == 124 and period_bars("5d", "1d", "2024-07-08") == 5, "周期K线数量不正确"
+
+    try:
+        resolve_period("7w")
+        assert False, "未知周期应报错"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_holidays_and_sessions()
+    test_bar_times_and_periods()
+    print("✓ 所有测试通过")
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from viewport_loader import ViewportLoader, choose_interval, is_finer
+
+
+FREQ = {"1m": "1min", "5m": "5min", "30m": "30min", "1h": "1h"}
+
+
+def test_choose_interval():
+    now = datetime(2024, 7, 8, 16, tzinfo=timezone.utc)
+    day = timedelta(days=1)
+
+    spans = {day: "1m", 2 * day: "1m", 5 * day: "5m", 30 * day: "30m", 100 * day: "1h", 300 * day: None}
+    for span, expected in spans.items():
+        assert choose_interval(now - span, now, now) == expected, f"{span} 的K线间隔不正确"
+
+    assert choose_interval(now - 10 * day, now - 9 * day, now) == "5m", "超出1分钟线可回溯范围时应使用5分钟线"
+    assert choose_interval(now - 100 * day, now - 99 * day, now) == "1h", "超出分钟线可回溯范围时应使用小时线"
+    assert choose_interval(now - 800 * day, now - 799 * day, now) is None, "超出所有明细数据的回溯范围时不应加载"
+
+    assert is_finer("5m", "1d") and not is_finer("1d", "1d") and not is_finer("1h", "30m"), "间隔粗细比较不正确"
+    assert not is_finer("7m", "1d"), "未知间隔不应视为更细"
+
+
+class StubFetcher:
+    def __init__(self):
+        self.calls = []
+
+    def get_bars_range(self, symbol, start, end, interval="1d"):
+        self.calls.append((symbol, interval, start, end))
+        index = pd.date_range(start, end, freq=FREQ[interval], name="Datetime")
+        return pd.DataFrame({"Close": np.arange(len(index), dtype=float)}, index=index)
+
+
+class StubStore:
+    def __init__(self, data=None):
+        self.data = data
+        self.calls = 0
+
+    def load_range(self, fetcher, symbol, interval, start, end):
+        self.calls += 1
+        return self.data
+
+
+def test_viewport_loader():
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    start, end = now - timedelta(days=3), now - timedelta(days=2)
+    fetcher, store = StubFetcher(), StubStore()
+    loader = ViewportLoader(fetcher, store)
+
+    interval, detail = loader.load("aapl", start, end, "1d")
+    assert interval == "1m" and detail.index[0] == start and detail.index[-1] == end, "应加载可见区间的1分钟线"
+    assert store.calls == 1 and len(fetcher.calls) == 1, "本地没有数据时应从获取器加载"
+    assert fetcher.calls[0][2] == start - timedelta(hours=12) and fetcher.calls[0][3] == end + timedelta(hours=12), "应预留两侧的缓冲区"
+
+    pan = timedelta(hours=6)
+    interval, detail = loader.load("AAPL", start + pan, end + pan, "1d")
+    assert len(fetcher.calls) == 1 and detail.index[-1] == end + pan, "在缓冲区内平移时不应重新加载"
+
+    loader.load("AAPL", start - timedelta(days=1), end - timedelta(days=1), "1d")
+    assert len(fetcher.calls) == 2, "移出缓冲区后应重新加载"
+
+    interval, _ = loader.load("AAPL", now - timedelta(days=6), now - timedelta(days=1), "1d")
+    assert interval == "5m" and list(loader._detail) == [("AAPL", "5m")], "切换间隔后应释放旧的明细数据"
+
+    assert loader.load("AAPL", start, end, "1m") is None, "明细数据不比当前间隔更细时不应加载"
+    assert not loader._detail, "不加载明细数据时应释放缓存"
+
+    store.data = fetcher.get_bars_range("MSFT", start, end, "1m")
+    calls = len(fetcher.calls)
+    interval, detail = ViewportLoader(fetcher, store).load("MSFT", start, end, "1d")
+    assert interval == "1m" and len(fetcher.calls) == calls and len(detail) == len(store.data), "本地存储有数据时不应请求获取器"
+
+
+if __name__ == "__main__":
+    test_choose_interval()
+    test_viewport_loader()
+    print("✓ 所有测试通过")
@@ -0,0 +1,38 @@
+import pandas as pd
+from nasdaq_stock_fetcher import NasdaqStockFetcher
+from yahoo_stub_server import StubConfig, server_url, start_stub_server
+
+
+def test_fetch_from_stub_server():
+    server = start_stub_server()
+    try:
+        fetcher = NasdaqStockFetcher(base_url=server_url(server))
+
+        hist = fetcher.get_historical_data("AAPL", period="1mo", interval="1d")
+        assert isinstance(hist, pd.DataFrame) and not hist.empty, "获取历史数据失败"
+        assert list(hist.columns[:5]) == ["Open", "High", "Low", "Close", "Volume"], "列名不匹配"
+        assert hist.index.is_monotonic_increasing, "时间索引未排序"
+        assert (hist["High"] >= hist["Low"]).all(), "最高价低于最低价"
+
+        info = fetcher.get_stock_info("AAPL")
+        assert info["symbol"] == "AAPL" and info["current_price"] is not None, "获取股票信息失败"
+
+        results = fetcher.search_stocks("MS")
+        assert results and results[0]["symbol"] == "MS", "搜索失败"
+    finally:
+        server.shutdown()
+
+
+def test_stub_rate_limit():
+    server = start_stub_server(config=StubConfig(rate_limit_rate=1.0))
+    try:
+        result = NasdaqStockFetcher(base_url=server_url(server)).get_historical_data("AAPL")
+        assert "error" in result and "Too Many Requests" in result["error"], "未返回限流错误"
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_fetch_from_stub_server()
+    test_stub_rate_limit()
+    print("✓ 所有测试通过")